@@ -4,27 +4,107 @@ Flask Web Application for News Crawler Data
 Displays MySQL database data in a web interface
 """
 
-from flask import Flask, render_template, request, jsonify, redirect, url_for
+from flask import Flask, render_template, request, jsonify, redirect, url_for, Response, g, has_request_context
 import mysql.connector
+import mysql.connector.pooling
 from datetime import datetime, timedelta
+import csv
+import io
 import json
-from mysql_config import MYSQL_CONFIG, TABLE_NAMES
+import os
+import zlib
+from mysql_config import MYSQL_CONFIG, MYSQL_READ_CONFIG, TABLE_NAMES
+from db_routing import ReplicaLagMonitor
+from web_cache import cached_page, conditional_api
+from data_version import get_data_version
+from crawl_scheduler import read_status as read_scheduler_status
+from article_archive import read_archived_html
+from daily_stats import query_daily_stats
+from trending_keywords import query_trending
 
 app = Flask(__name__)
 
+# Per-process connection pools, created after fork by the production server
+db_pool = None
+read_pool = None
+
+def init_db_pool(pool_size: int = 4):
+    """Create this process's MySQL connection pools (primary, and replica if configured)"""
+    global db_pool, read_pool
+    try:
+        db_pool = mysql.connector.pooling.MySQLConnectionPool(
+            pool_name=f"web_{os.getpid()}",
+            pool_size=max(1, min(pool_size, 32)),  # mysql-connector caps pools at 32
+            **MYSQL_CONFIG
+        )
+    except mysql.connector.Error as e:
+        print(f"MySQL pool creation error: {e}")
+        db_pool = None
+    
+    if MYSQL_READ_CONFIG:
+        try:
+            read_pool = mysql.connector.pooling.MySQLConnectionPool(
+                pool_name=f"web_read_{os.getpid()}",
+                pool_size=max(1, min(pool_size, 32)),
+                **MYSQL_READ_CONFIG
+            )
+        except mysql.connector.Error as e:
+            print(f"MySQL replica pool creation error: {e}")
+            read_pool = None
+
 def get_mysql_connection():
-    """Get MySQL database connection"""
+    """Get MySQL database connection (primary)"""
     try:
+        if db_pool is not None:
+            # close() on a pooled connection hands it back to the pool
+            return db_pool.get_connection()
         conn = mysql.connector.connect(**MYSQL_CONFIG)
         return conn
     except mysql.connector.Error as e:
         print(f"MySQL connection error: {e}")
         return None
 
+def get_replica_connection():
+    """Get a connection to the read endpoint"""
+    try:
+        if read_pool is not None:
+            return read_pool.get_connection()
+        return mysql.connector.connect(**MYSQL_READ_CONFIG)
+    except mysql.connector.Error as e:
+        print(f"MySQL replica connection error: {e}")
+        return None
+
+replica_monitor = ReplicaLagMonitor(get_replica_connection) if MYSQL_READ_CONFIG else None
+
+def get_read_connection():
+    """Connection for read-only routes: the replica while it is fresh, else the primary"""
+    if (replica_monitor is not None and replica_monitor.replica_usable()
+            and replica_monitor.has_caught_up(get_data_version())):
+        conn = get_replica_connection()
+        if conn:
+            _note_db_route('replica')
+            return conn
+        replica_monitor.mark_failed()
+    _note_db_route('primary')
+    return get_mysql_connection()
+
+def _note_db_route(route: str):
+    if has_request_context():
+        g.db_route = route
+
+@app.after_request
+def add_db_route_header(response):
+    """Which endpoint served the request's reads (cached pages carry no header)"""
+    route = g.get('db_route')
+    if route:
+        response.headers['X-DB-Route'] = route
+    return response
+
 @app.route('/')
+@cached_page
 def index():
     """Main page showing statistics and recent articles"""
-    conn = get_mysql_connection()
+    conn = get_read_connection()
     if not conn:
         return "Database connection failed", 500
     
@@ -76,13 +156,14 @@ def index():
         conn.close()
 
 @app.route('/dunya')
+@cached_page
 def dunya_articles():
     """Display Dunya articles"""
     page = request.args.get('page', 1, type=int)
     per_page = 20
     offset = (page - 1) * per_page
     
-    conn = get_mysql_connection()
+    conn = get_read_connection()
     if not conn:
         return "Database connection failed", 500
     
@@ -119,13 +200,14 @@ def dunya_articles():
         conn.close()
 
 @app.route('/ekonomist')
+@cached_page
 def ekonomist_articles():
     """Display Ekonomist articles"""
     page = request.args.get('page', 1, type=int)
     per_page = 20
     offset = (page - 1) * per_page
     
-    conn = get_mysql_connection()
+    conn = get_read_connection()
     if not conn:
         return "Database connection failed", 500
     
@@ -162,9 +244,10 @@ def ekonomist_articles():
         conn.close()
 
 @app.route('/article/<int:article_id>/<source>')
+@cached_page
 def view_article(article_id, source):
     """View individual article"""
-    conn = get_mysql_connection()
+    conn = get_read_connection()
     if not conn:
         return "Database connection failed", 500
     
@@ -173,9 +256,10 @@ def view_article(article_id, source):
     try:
         table_name = TABLE_NAMES['dunya_articles'] if source == 'dunya' else TABLE_NAMES['ekonomist_articles']
         
+        # raw_html is served separately by view_article_raw - keep this query small
         cursor.execute(f"""
             SELECT news_visible_title_subtitle, news_visible_body, news_url, 
-                   news_visible_datetime, crawl_datetime, page_number, raw_html
+                   news_visible_datetime, crawl_datetime, page_number, html_status
             FROM {table_name} 
             WHERE id = %s
         """, (article_id,))
@@ -194,10 +278,102 @@ def view_article(article_id, source):
     finally:
         conn.close()
 
+# Characters per SUBSTRING read of raw_html (up to 4 bytes each in utf8mb4)
+RAW_HTML_CHUNK_CHARS = 64 * 1024
+
+def _gzip_chunks(slices):
+    """Gzip-encode text slices as they arrive so the compressed body is never held whole"""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits=31 -> gzip container
+    for text in slices:
+        data = compressor.compress(text.encode('utf-8'))
+        if data:
+            yield data
+    yield compressor.flush()
+
+def _plain_chunks(slices):
+    """Encode text slices as they arrive"""
+    for text in slices:
+        yield text.encode('utf-8')
+
+def _text_slices(text: str, chunk_size: int = RAW_HTML_CHUNK_CHARS):
+    """Slice text already in memory (archived HTML)"""
+    for start in range(0, len(text), chunk_size):
+        yield text[start:start + chunk_size]
+
+def _raw_html_slices(table_name: str, article_id: int, chunk_size: int = RAW_HTML_CHUNK_CHARS):
+    """Read raw_html from the database slice by slice, so the whole column is never fetched at once"""
+    conn = get_read_connection()
+    if not conn:
+        raise mysql.connector.Error("Database connection failed")
+    
+    cursor = conn.cursor()
+    
+    try:
+        position = 1  # SUBSTRING is 1-based and counts characters, not bytes
+        while True:
+            cursor.execute(f"SELECT SUBSTRING(raw_html, %s, %s) FROM {table_name} WHERE id = %s",
+                           (position, chunk_size, article_id))
+            row = cursor.fetchone()
+            if not row or not row[0]:
+                break
+            yield row[0]
+            if len(row[0]) < chunk_size:
+                break
+            position += chunk_size
+    finally:
+        conn.close()
+
+@app.route('/article/<int:article_id>/<source>/raw')
+def view_article_raw(article_id, source):
+    """Stream the stored raw HTML of an article (loaded on demand by the detail page)"""
+    conn = get_read_connection()
+    if not conn:
+        return "Database connection failed", 500
+    
+    cursor = conn.cursor()
+    
+    try:
+        table_name = TABLE_NAMES['dunya_articles'] if source == 'dunya' else TABLE_NAMES['ekonomist_articles']
+        
+        # Validate the ETag before touching the LONGTEXT column
+        cursor.execute(f"SELECT html_fetch_datetime, html_status FROM {table_name} WHERE id = %s", (article_id,))
+        row = cursor.fetchone()
+        if not row:
+            return "Article not found", 404
+        
+        fetched_at = row[0].strftime('%Y%m%d%H%M%S') if row[0] else '0'
+        etag = f"{source}-{article_id}-{fetched_at}"
+        if request.if_none_match.contains(etag):
+            response = Response(status=304)
+            response.set_etag(etag)
+            return response
+        
+        if row[1] == 'archived':
+            # Old HTML lives in the monthly zip archive, see article_archive.py
+            slices = _text_slices(read_archived_html(cursor, source, article_id) or '')
+        else:
+            slices = _raw_html_slices(table_name, article_id)
+    except mysql.connector.Error as e:
+        return f"Database error: {e}", 500
+    finally:
+        conn.close()
+    
+    if 'gzip' in request.headers.get('Accept-Encoding', ''):
+        response = Response(_gzip_chunks(slices), mimetype='text/plain')
+        response.headers['Content-Encoding'] = 'gzip'
+    else:
+        response = Response(_plain_chunks(slices), mimetype='text/plain')
+    
+    response.set_etag(etag)
+    response.headers['Vary'] = 'Accept-Encoding'
+    response.headers['Cache-Control'] = 'public, max-age=3600'
+    return response
+
 @app.route('/api/stats')
+@conditional_api
 def api_stats():
     """API endpoint for statistics"""
-    conn = get_mysql_connection()
+    conn = get_read_connection()
     if not conn:
         return jsonify({"error": "Database connection failed"}), 500
     
@@ -232,11 +408,12 @@ def api_stats():
         conn.close()
 
 @app.route('/api/recent')
+@conditional_api
 def api_recent():
     """API endpoint for recent articles"""
     limit = request.args.get('limit', 10, type=int)
     
-    conn = get_mysql_connection()
+    conn = get_read_connection()
     if not conn:
         return jsonify({"error": "Database connection failed"}), 500
     
@@ -291,5 +468,204 @@ def api_recent():
     finally:
         conn.close()
 
+@app.route('/api/daily')
+@conditional_api
+def api_daily():
+    """Articles per source per day from the rollup table (?days=60, ?start=&end=, ?source=)"""
+    source = request.args.get('source')
+    if source and source not in ('dunya', 'ekonomist'):
+        return jsonify({"error": "source must be dunya or ekonomist"}), 400
+    
+    try:
+        end = datetime.strptime(request.args['end'], '%Y-%m-%d').date() if request.args.get('end') else datetime.now().date()
+        if request.args.get('start'):
+            start = datetime.strptime(request.args['start'], '%Y-%m-%d').date()
+        else:
+            start = end - timedelta(days=min(request.args.get('days', 60, type=int), 3660) - 1)
+    except ValueError:
+        return jsonify({"error": "dates must be YYYY-MM-DD"}), 400
+    
+    conn = get_read_connection()
+    if not conn:
+        return jsonify({"error": "Database connection failed"}), 500
+    
+    cursor = conn.cursor()
+    
+    try:
+        return jsonify({
+            'start': start.isoformat(),
+            'end': end.isoformat(),
+            'days': query_daily_stats(cursor, start, end, source)
+        })
+    except mysql.connector.Error as e:
+        return jsonify({"error": f"Database error: {e}"}), 500
+    finally:
+        conn.close()
+
+@app.route('/api/trending')
+@conditional_api
+def api_trending():
+    """Top trending terms per source for a day (?day=YYYY-MM-DD, default latest; ?source=, ?limit=)"""
+    source = request.args.get('source')
+    if source and source not in ('dunya', 'ekonomist'):
+        return jsonify({"error": "source must be dunya or ekonomist"}), 400
+    limit = max(1, min(request.args.get('limit', 20, type=int), 100))
+    
+    try:
+        day = datetime.strptime(request.args['day'], '%Y-%m-%d').date() if request.args.get('day') else None
+    except ValueError:
+        return jsonify({"error": "day must be YYYY-MM-DD"}), 400
+    
+    conn = get_read_connection()
+    if not conn:
+        return jsonify({"error": "Database connection failed"}), 500
+    
+    cursor = conn.cursor()
+    
+    try:
+        return jsonify({name: query_trending(cursor, name, day, limit)
+                        for name in ((source,) if source else ('dunya', 'ekonomist'))})
+    except mysql.connector.Error as e:
+        return jsonify({"error": f"Database error: {e}"}), 500
+    finally:
+        conn.close()
+
+@app.route('/api/scheduler')
+def api_scheduler():
+    """API endpoint for crawl scheduler status (last/next run per source)"""
+    status = read_scheduler_status()
+    if not status:
+        return jsonify({"error": "Scheduler has not reported any status"}), 404
+    return jsonify(status)
+
+# Columns streamed by /api/export (raw_html is appended only on request)
+EXPORT_COLUMNS = [
+    'id', 'news_url', 'news_visible_datetime', 'crawl_datetime',
+    'news_visible_title_subtitle', 'news_visible_body', 'page_number', 'html_status'
+]
+EXPORT_SOURCES = {
+    'dunya': 'dunya_articles',
+    'ekonomist': 'ekonomist_articles'
+}
+
+def _export_value(value):
+    """Convert a MySQL value into something JSON/CSV friendly"""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+def _export_rows(sources, start_date, end_date, include_html, chunk_size):
+    """Yield (source, column_names, row) tuples through an unbuffered cursor"""
+    columns = EXPORT_COLUMNS + (['raw_html'] if include_html else [])
+    
+    for source in sources:
+        conn = get_read_connection()
+        if not conn:
+            raise mysql.connector.Error("Database connection failed")
+        
+        # Unbuffered cursor: rows are pulled from the server chunk by chunk
+        cursor = conn.cursor(buffered=False)
+        
+        try:
+            where = []
+            params = []
+            if start_date:
+                where.append("news_visible_datetime >= %s")
+                params.append(start_date)
+            if end_date:
+                where.append("news_visible_datetime < %s")
+                params.append(end_date + timedelta(days=1))
+            
+            cursor.execute(f"""
+                SELECT {', '.join(columns)}
+                FROM {TABLE_NAMES[EXPORT_SOURCES[source]]}
+                {'WHERE ' + ' AND '.join(where) if where else ''}
+                ORDER BY id
+            """, tuple(params))
+            
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                for row in rows:
+                    yield source, columns, row
+        finally:
+            _release_stream_connection(conn, cursor)
+
+def _release_stream_connection(conn, cursor):
+    """Close an unbuffered cursor and hand its connection back, even mid-result"""
+    try:
+        cursor.close()
+    except mysql.connector.Error:
+        # Client went away or the stream failed with rows still unread: drop the
+        # session instead of reading the rest; the pool reconnects it on next checkout
+        try:
+            conn.disconnect()
+        except mysql.connector.Error:
+            pass
+    try:
+        conn.close()
+    except mysql.connector.Error:
+        pass
+
+@app.route('/api/export')
+def api_export():
+    """Stream articles as NDJSON or CSV for a date range and source"""
+    export_format = request.args.get('format', 'ndjson').lower()
+    source = request.args.get('source', 'all').lower()
+    include_html = request.args.get('include_html', '0').lower() in ('1', 'true', 'yes')
+    
+    if export_format not in ('ndjson', 'csv'):
+        return jsonify({"error": "format must be 'ndjson' or 'csv'"}), 400
+    
+    if source == 'all':
+        sources = list(EXPORT_SOURCES)
+    elif source in EXPORT_SOURCES:
+        sources = [source]
+    else:
+        return jsonify({"error": "source must be 'dunya', 'ekonomist' or 'all'"}), 400
+    
+    try:
+        start_date = request.args.get('start')
+        end_date = request.args.get('end')
+        start_date = datetime.strptime(start_date, '%Y-%m-%d') if start_date else None
+        end_date = datetime.strptime(end_date, '%Y-%m-%d') if end_date else None
+    except ValueError:
+        return jsonify({"error": "Invalid date format. Use YYYY-MM-DD"}), 400
+    
+    # Raw HTML rows are large - keep fewer of them in memory at once
+    chunk_size = 50 if include_html else 1000
+    rows = _export_rows(sources, start_date, end_date, include_html, chunk_size)
+    
+    def generate_ndjson():
+        for source_name, columns, row in rows:
+            record = {'source': source_name}
+            record.update(zip(columns, (_export_value(v) for v in row)))
+            yield json.dumps(record, ensure_ascii=False) + '\n'
+    
+    def generate_csv():
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        header_written = False
+        for source_name, columns, row in rows:
+            if not header_written:
+                writer.writerow(['source'] + columns)
+                header_written = True
+            writer.writerow([source_name] + [_export_value(v) for v in row])
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate(0)
+    
+    if export_format == 'csv':
+        body, mimetype, extension = generate_csv(), 'text/csv', 'csv'
+    else:
+        body, mimetype, extension = generate_ndjson(), 'application/x-ndjson', 'ndjson'
+    
+    response = Response(body, mimetype=mimetype)
+    response.headers['Content-Disposition'] = f'attachment; filename=articles_{source}.{extension}'
+    # Tell nginx not to buffer the stream
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
 if __name__ == '__main__':
     app.run(host='0.0.0.0', port=5000, debug=True)
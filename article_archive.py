@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+"""
+Monthly cold-archive tiering for the article tables
+
+raw_html is most of each article table's size. Articles older than
+ARCHIVE_CONFIG['keep_months'] have their HTML moved, one calendar month at a
+time, into compressed per-month zip files (archive/<source>/<YYYY-MM>.zip, one
+deflated entry per article, so a single page can be read back without
+unpacking the month). The metadata row stays in the hot table with
+html_status = 'archived' and an empty raw_html. Titles, bodies, dates and URLs
+stay queryable, and news_url stays UNIQUE, so re-crawls still deduplicate.
+article_archive_index records where each article's HTML went.
+
+Months are taken from news_visible_datetime, falling back to crawl_datetime.
+Native MySQL partitioning is not used: it requires every unique key to
+include the partitioning column, which would break the UNIQUE(news_url)
+guard the crawlers rely on.
+
+Usage:
+    python3 article_archive.py status
+    python3 article_archive.py archive --months 6 [--source dunya] [--dry-run] [--optimize]
+    python3 article_archive.py restore dunya 2025-01
+    python3 article_archive.py show dunya 12345
+"""
+
+import os
+import zipfile
+import argparse
+import mysql.connector
+from datetime import date, datetime
+from mysql_config import MYSQL_CONFIG, TABLE_NAMES, ARCHIVE_CONFIG
+from data_version import BASE_DIR, bump_data_version
+
+SOURCES = ('dunya', 'ekonomist')
+
+# Month bucket of an article row (for grouping only - filters use the ranges below)
+MONTH_EXPR = ("CONCAT(YEAR(COALESCE(news_visible_datetime, crawl_datetime)), '-', "
+              "LPAD(MONTH(COALESCE(news_visible_datetime, crawl_datetime)), 2, '0'))")
+
+# Same bucketing as plain column ranges, so an index on either date column can be used
+IN_MONTH = ("((news_visible_datetime >= %s AND news_visible_datetime < %s) OR "
+            "(news_visible_datetime IS NULL AND crawl_datetime >= %s AND crawl_datetime < %s))")
+BEFORE_MONTH = "(news_visible_datetime < %s OR (news_visible_datetime IS NULL AND crawl_datetime < %s))"
+
+
+def get_archive_dir():
+    path = ARCHIVE_CONFIG['archive_dir']
+    if not os.path.isabs(path):
+        path = os.path.join(BASE_DIR, path)
+    return path
+
+
+def archive_path(source: str, month: str):
+    return os.path.join(get_archive_dir(), source, f"{month}.zip")
+
+
+def month_bounds(month: str):
+    """First day of a YYYY-MM month and of the month after it"""
+    year, month_no = (int(part) for part in month.split('-'))
+    start = date(year, month_no, 1)
+    end = date(year + month_no // 12, month_no % 12 + 1, 1)
+    return start, end
+
+
+def cutoff_month(keep_months: int, today: date = None):
+    """First month (YYYY-MM) that stays hot"""
+    today = today or date.today()
+    index = today.year * 12 + (today.month - 1) - keep_months
+    return f"{index // 12:04d}-{index % 12 + 1:02d}"
+
+
+def setup_archive_table(cursor):
+    """Where each archived article's HTML lives"""
+    cursor.execute(f'''
+        CREATE TABLE IF NOT EXISTS {TABLE_NAMES['archive_index']} (
+            source VARCHAR(20) NOT NULL,
+            article_id INT NOT NULL,
+            archive_month CHAR(7) NOT NULL,
+            archive_file VARCHAR(255) NOT NULL,
+            html_bytes INT,
+            original_html_status VARCHAR(50),
+            archived_datetime DATETIME,
+            PRIMARY KEY (source, article_id),
+            KEY idx_month (source, archive_month)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    ''')
+
+
+def read_archived_html(cursor, source: str, article_id: int):
+    """HTML of an archived article, or None if it is not in the archive"""
+    cursor.execute(f'''
+        SELECT archive_file FROM {TABLE_NAMES['archive_index']}
+        WHERE source = %s AND article_id = %s
+    ''', (source, article_id))
+    row = cursor.fetchone()
+    if not row:
+        return None
+    try:
+        with zipfile.ZipFile(os.path.join(get_archive_dir(), row[0])) as archive:
+            return archive.read(f"{article_id}.html").decode('utf-8')
+    except (OSError, KeyError, zipfile.BadZipFile):
+        return None
+
+
+class ArticleArchiver:
+    """Moves old raw_html out of the hot article tables"""
+
+    def __init__(self, batch_size: int = None, dry_run: bool = False, log=print):
+        self.batch_size = batch_size or ARCHIVE_CONFIG['batch_size']
+        self.dry_run = dry_run
+        self.log = log
+
+    def get_mysql_connection(self):
+        """Get MySQL database connection"""
+        try:
+            return mysql.connector.connect(**MYSQL_CONFIG)
+        except mysql.connector.Error as e:
+            self.log(f"MySQL connection error: {e}")
+            return None
+
+    def months_to_archive(self, cursor, source: str, before_month: str):
+        cutoff, _ = month_bounds(before_month)
+        cursor.execute(f'''
+            SELECT {MONTH_EXPR} AS month, COUNT(*)
+            FROM {TABLE_NAMES[f'{source}_articles']}
+            WHERE {BEFORE_MONTH} AND raw_html IS NOT NULL AND raw_html <> ''
+            GROUP BY month ORDER BY month
+        ''', (cutoff,) * 2)
+        return cursor.fetchall()
+
+    def archive_month(self, conn, source: str, month: str):
+        """Archive one month of one source, batch by batch; returns articles moved"""
+        table = TABLE_NAMES[f'{source}_articles']
+        path = archive_path(source, month)
+        relative_path = os.path.relpath(path, get_archive_dir())
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        moved = 0
+        last_id = 0
+        month_start, month_end = month_bounds(month)
+
+        while True:
+            cursor = conn.cursor()
+            cursor.execute(f'''
+                SELECT id, raw_html, html_status FROM {table}
+                WHERE id > %s AND {IN_MONTH} AND raw_html IS NOT NULL AND raw_html <> ''
+                ORDER BY id LIMIT %s
+            ''', (last_id, month_start, month_end, month_start, month_end, self.batch_size))
+            rows = cursor.fetchall()
+            if not rows:
+                break
+            last_id = rows[-1][0]
+
+            # HTML goes to disk first; the DB rows only change once the zip is closed
+            with zipfile.ZipFile(path, 'a', compression=zipfile.ZIP_DEFLATED,
+                                 compresslevel=ARCHIVE_CONFIG['compress_level']) as archive:
+                present = set(archive.namelist())  # Entries left by an interrupted run
+                for article_id, raw_html, _ in rows:
+                    name = f"{article_id}.html"
+                    if name not in present:
+                        archive.writestr(name, raw_html.encode('utf-8'))
+
+            now = datetime.now().isoformat()
+            cursor.executemany(f'''
+                INSERT IGNORE INTO {TABLE_NAMES['archive_index']}
+                (source, article_id, archive_month, archive_file, html_bytes, original_html_status, archived_datetime)
+                VALUES (%s, %s, %s, %s, %s, %s, %s)
+            ''', [(source, article_id, month, relative_path, len(raw_html), html_status, now)
+                  for article_id, raw_html, html_status in rows])
+            cursor.executemany(f'''
+                UPDATE {table} SET raw_html = '', html_status = 'archived' WHERE id = %s
+            ''', [(row[0],) for row in rows])
+            conn.commit()
+            cursor.close()
+
+            moved += len(rows)
+            del rows
+
+        return moved
+
+    def restore_month(self, conn, source: str, month: str):
+        """Put a month's HTML back into the hot table; articles missing from the zip stay archived"""
+        table = TABLE_NAMES[f'{source}_articles']
+        cursor = conn.cursor()
+        cursor.execute(f'''
+            SELECT article_id, archive_file, original_html_status FROM {TABLE_NAMES['archive_index']}
+            WHERE source = %s AND archive_month = %s
+        ''', (source, month))
+        entries = cursor.fetchall()
+        if not entries:
+            return 0
+
+        restored = 0
+        missing = []
+        with zipfile.ZipFile(os.path.join(get_archive_dir(), entries[0][1])) as archive:
+            for start in range(0, len(entries), self.batch_size):
+                updates = []
+                for article_id, _, status in entries[start:start + self.batch_size]:
+                    try:
+                        raw_html = archive.read(f"{article_id}.html").decode('utf-8')
+                    except KeyError:
+                        missing.append(article_id)
+                        continue
+                    updates.append((raw_html, status or 'success', article_id))
+                if not updates:
+                    continue
+
+                cursor.executemany(f'''
+                    UPDATE {table} SET raw_html = %s, html_status = %s WHERE id = %s
+                ''', updates)
+                cursor.executemany(f'''
+                    DELETE FROM {TABLE_NAMES['archive_index']} WHERE source = %s AND article_id = %s
+                ''', [(source, article_id) for _, _, article_id in updates])
+                conn.commit()
+                restored += len(updates)
+
+        if missing:
+            self.log(f"{source} {month}: {len(missing)} article(s) not in {entries[0][1]}, left archived: "
+                     f"{', '.join(str(article_id) for article_id in missing[:20])}"
+                     f"{' ...' if len(missing) > 20 else ''}")
+        return restored
+
+    def archive(self, keep_months: int = None, sources=SOURCES, optimize: bool = False):
+        keep_months = ARCHIVE_CONFIG['keep_months'] if keep_months is None else keep_months
+        before_month = cutoff_month(keep_months)
+        conn = self.get_mysql_connection()
+        if not conn:
+            return None
+
+        totals = {}
+        try:
+            cursor = conn.cursor()
+            setup_archive_table(cursor)
+            for source in sources:
+                months = self.months_to_archive(cursor, source, before_month)
+                self.log(f"{source}: {len(months)} month(s) before {before_month} with HTML to archive")
+                totals[source] = 0
+                for month, count in months:
+                    if self.dry_run:
+                        self.log(f"{source} {month}: would archive {count} articles")
+                        continue
+                    moved = self.archive_month(conn, source, month)
+                    totals[source] += moved
+                    self.log(f"{source} {month}: {moved} articles archived to {archive_path(source, month)}")
+
+                if optimize and totals[source]:
+                    # Rebuild the table so the freed pages are actually returned
+                    self.log(f"{source}: optimizing table")
+                    cursor.execute(f"OPTIMIZE TABLE {TABLE_NAMES[f'{source}_articles']}")
+                    cursor.fetchall()
+        except mysql.connector.Error as e:
+            self.log(f"Archive error (rerun to continue): {e}")
+        finally:
+            conn.close()
+
+        if any(totals.values()):
+            bump_data_version()
+        return totals
+
+    def status(self):
+        conn = self.get_mysql_connection()
+        if not conn:
+            return {}
+        cursor = conn.cursor()
+        try:
+            setup_archive_table(cursor)
+            status = {}
+            for source in SOURCES:
+                table = TABLE_NAMES[f'{source}_articles']
+                cursor.execute('''
+                    SELECT data_length + index_length FROM information_schema.tables
+                    WHERE table_schema = DATABASE() AND table_name = %s
+                ''', (table,))
+                size = cursor.fetchone()
+                cursor.execute(f'''
+                    SELECT COUNT(*), COUNT(DISTINCT archive_month), COALESCE(SUM(html_bytes), 0)
+                    FROM {TABLE_NAMES['archive_index']} WHERE source = %s
+                ''', (source,))
+                archived, months, html_bytes = cursor.fetchone()
+                status[source] = {
+                    'hot_table_mb': round((size[0] or 0) / 1024 / 1024, 1) if size else None,
+                    'archived_articles': archived,
+                    'archived_months': months,
+                    'archived_html_mb': round(html_bytes / 1024 / 1024, 1)
+                }
+            return status
+        finally:
+            conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Archive old article HTML by month")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    archive = sub.add_parser('archive', help='move HTML older than N months into zip files')
+    archive.add_argument('--months', type=int, help='months to keep hot')
+    archive.add_argument('--source', choices=SOURCES)
+    archive.add_argument('--dry-run', action='store_true')
+    archive.add_argument('--optimize', action='store_true', help='OPTIMIZE TABLE afterwards')
+
+    restore = sub.add_parser('restore', help='move a month back into the hot table')
+    restore.add_argument('source', choices=SOURCES)
+    restore.add_argument('month', help='YYYY-MM')
+
+    show = sub.add_parser('show', help='print the archived HTML of one article')
+    show.add_argument('source', choices=SOURCES)
+    show.add_argument('article_id', type=int)
+
+    sub.add_parser('status', help='hot table sizes and archive totals')
+    args = parser.parse_args()
+
+    if args.command == 'archive':
+        archiver = ArticleArchiver(dry_run=args.dry_run)
+        sources = (args.source,) if args.source else SOURCES
+        print(archiver.archive(args.months, sources, args.optimize))
+
+    elif args.command == 'restore':
+        archiver = ArticleArchiver()
+        conn = archiver.get_mysql_connection()
+        if conn:
+            try:
+                print(f"Restored {archiver.restore_month(conn, args.source, args.month)} articles")
+                bump_data_version()
+            finally:
+                conn.close()
+
+    elif args.command == 'show':
+        conn = mysql.connector.connect(**MYSQL_CONFIG)
+        try:
+            html = read_archived_html(conn.cursor(), args.source, args.article_id)
+            print(html if html is not None else "Not in the archive")
+        finally:
+            conn.close()
+
+    else:
+        for source, values in ArticleArchiver().status().items():
+            print(f"{source:10} " + "  ".join(f"{key}={value}" for key, value in values.items()))
+
+
+if __name__ == "__main__":
+    main()
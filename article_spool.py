@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+Local write-ahead spool for articles (SQLite in WAL mode)
+
+When MySQL is unreachable or errors out, crawlers append the prepared article
+row to a local SQLite file instead of dropping the download. In 'always' mode
+every article goes to the spool first, so a slow database never stalls the
+crawl loop. A background replayer moves spooled rows into MySQL in bulk
+batches; replay is idempotent because news_url is UNIQUE and rows are inserted
+with INSERT IGNORE, and a row leaves the spool only after MySQL committed it.
+
+Replay manually:
+    python3 article_spool.py            # flush everything, then exit
+    python3 article_spool.py --status
+"""
+
+import os
+import sys
+import json
+import time
+import sqlite3
+import threading
+import mysql.connector
+from datetime import datetime
+from mysql_config import MYSQL_CONFIG, TABLE_NAMES, SPOOL_CONFIG, DEDUP_CONFIG
+from data_version import BASE_DIR, bump_data_version
+from daily_stats import record_daily_stats
+from near_duplicates import compute_fingerprint, find_near_duplicate, register_fingerprint
+
+# Returned by save_article when the row went to the spool (truthy: it will be saved)
+SPOOLED = -1
+
+ARTICLE_COLUMNS = [
+    'crawl_datetime', 'news_visible_datetime', 'news_visible_title_subtitle',
+    'news_visible_body', 'news_url', 'news_sub_sitemap_link', 'page_number',
+    'raw_html', 'html_fetch_datetime', 'html_status'
+]
+
+
+def get_spool_path():
+    path = SPOOL_CONFIG['path']
+    if not os.path.isabs(path):
+        path = os.path.join(BASE_DIR, path)
+    return path
+
+
+class ArticleSpool:
+    """Append-only local queue of article rows waiting for MySQL"""
+
+    def __init__(self, path: str = None, log=print):
+        self.path = path or get_spool_path()
+        self.log = log
+        self.lock = threading.Lock()
+        self.replayer = None
+        self.stop_event = threading.Event()
+
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self.db = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        self.db.execute('PRAGMA journal_mode=WAL')
+        self.db.execute('PRAGMA synchronous=NORMAL')  # Durable across process crashes in WAL mode
+        self.db.execute('''
+            CREATE TABLE IF NOT EXISTS spooled_articles (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                source TEXT NOT NULL,
+                news_url TEXT NOT NULL,
+                row_json TEXT NOT NULL,
+                spooled_at TEXT NOT NULL,
+                UNIQUE (source, news_url)
+            )
+        ''')
+        self.db.commit()
+
+    def append(self, source: str, row: dict):
+        """Store a prepared article row; the latest copy of a URL wins"""
+        with self.lock:
+            self.db.execute('''
+                INSERT OR REPLACE INTO spooled_articles (source, news_url, row_json, spooled_at)
+                VALUES (?, ?, ?, ?)
+            ''', (source, row['news_url'], json.dumps(row, ensure_ascii=False), datetime.now().isoformat()))
+            self.db.commit()
+        return SPOOLED
+
+    def pending_count(self):
+        with self.lock:
+            return self.db.execute('SELECT COUNT(*) FROM spooled_articles').fetchone()[0]
+
+    def _read_batch(self, batch_size: int):
+        with self.lock:
+            return self.db.execute('''
+                SELECT id, source, row_json FROM spooled_articles ORDER BY id LIMIT ?
+            ''', (batch_size,)).fetchall()
+
+    def _delete(self, ids: list):
+        with self.lock:
+            self.db.executemany('DELETE FROM spooled_articles WHERE id = ?', [(i,) for i in ids])
+            self.db.commit()
+
+    def _replay_source(self, cursor, source: str, rows: list):
+        """Bulk-insert one source's rows, link their fingerprints and count them in the daily rollup"""
+        table = TABLE_NAMES[f'{source}_articles']
+
+        fingerprints = {}
+        for row in rows:
+            fingerprint = compute_fingerprint(row['news_visible_body']) if DEDUP_CONFIG['enabled'] else None
+            if not fingerprint:
+                continue
+            canonical = find_near_duplicate(cursor, fingerprint, row['news_url'])
+            if canonical and DEDUP_CONFIG['skip_duplicate_html']:
+                row['raw_html'] = ''
+                row['html_status'] = 'duplicate'
+            fingerprints[row['news_url']] = (fingerprint, canonical)
+
+        urls = [row['news_url'] for row in rows]
+        placeholders = ', '.join(['%s'] * len(urls))
+        cursor.execute(f"SELECT news_url FROM {table} WHERE news_url IN ({placeholders})", urls)
+        existing = {url for (url,) in cursor.fetchall()}
+
+        cursor.executemany(f'''
+            INSERT IGNORE INTO {table} ({', '.join(ARTICLE_COLUMNS)})
+            VALUES ({', '.join(['%s'] * len(ARTICLE_COLUMNS))})
+        ''', [tuple(row[column] for column in ARTICLE_COLUMNS) for row in rows])
+        inserted = cursor.rowcount
+
+        cursor.execute(f"SELECT id, news_url FROM {table} WHERE news_url IN ({placeholders})", urls)
+        new_ids = []
+        for article_id, url in cursor.fetchall():
+            if url in existing:
+                continue
+            new_ids.append(article_id)
+            if url in fingerprints:
+                fingerprint, canonical = fingerprints[url]
+                register_fingerprint(cursor, source, article_id, url, fingerprint, canonical)
+        record_daily_stats(cursor, source, new_ids)
+
+        return inserted
+
+    def replay(self, get_connection, batch_size: int = None):
+        """Move spooled rows into MySQL batch by batch; stops at the first DB failure"""
+        batch_size = batch_size or SPOOL_CONFIG['batch_size']
+        replayed = 0
+
+        while not self.stop_event.is_set():
+            batch = self._read_batch(batch_size)
+            if not batch:
+                break
+
+            conn = get_connection()
+            if not conn:
+                break
+
+            by_source = {}
+            for spool_id, source, row_json in batch:
+                by_source.setdefault(source, []).append(json.loads(row_json))
+
+            try:
+                # All-or-nothing per batch: a partial write would leave rows that the retry
+                # counts as existing, so their fingerprints and rollup would never be written
+                conn.start_transaction()
+                cursor = conn.cursor()
+                inserted = 0
+                for source, rows in by_source.items():
+                    inserted += self._replay_source(cursor, source, rows)
+                conn.commit()
+            except mysql.connector.Error as e:
+                self.log(f"Spool replay failed, will retry: {e}")
+                try:
+                    conn.rollback()
+                except mysql.connector.Error:
+                    pass
+                break
+            finally:
+                conn.close()
+
+            # Only now is it safe to forget the rows
+            self._delete([spool_id for spool_id, _, _ in batch])
+            replayed += len(batch)
+            self.log(f"Spool replay: {len(batch)} rows flushed ({inserted} new)")
+
+        if replayed:
+            bump_data_version()
+        return replayed
+
+    def start_replayer(self, get_connection):
+        """Flush the spool in the background every replay_interval_seconds"""
+        if self.replayer is not None:
+            return
+
+        def loop():
+            while not self.stop_event.wait(SPOOL_CONFIG['replay_interval_seconds']):
+                try:
+                    if self.pending_count():
+                        self.replay(get_connection)
+                except Exception as e:
+                    self.log(f"Spool replayer error: {e}")
+
+        self.replayer = threading.Thread(target=loop, name='spool-replayer', daemon=True)
+        self.replayer.start()
+
+    def close(self, flush_with=None):
+        """Stop the replayer, optionally flushing what is left first"""
+        self.stop_event.set()
+        if self.replayer is not None:
+            self.replayer.join(timeout=5)
+        if flush_with is not None:
+            self.stop_event.clear()
+            self.replay(flush_with)
+            self.stop_event.set()
+        with self.lock:
+            self.db.close()
+
+        global _shared_spool
+        with _shared_spool_lock:
+            if _shared_spool is self:
+                _shared_spool = None
+
+
+_shared_spool = None
+_shared_spool_lock = threading.Lock()
+
+
+def get_shared_spool(get_connection, log=print):
+    """The process-wide spool: every crawler in the process appends to it and one replayer drains it
+
+    The first caller's connection getter and log are the ones the replayer uses.
+    """
+    global _shared_spool
+    with _shared_spool_lock:
+        if _shared_spool is None:
+            _shared_spool = ArticleSpool(log=log)
+            _shared_spool.start_replayer(get_connection)
+        return _shared_spool
+
+
+def main():
+    spool = ArticleSpool()
+    if '--status' in sys.argv:
+        print(f"{spool.pending_count()} articles waiting in {spool.path}")
+        return
+
+    def connect():
+        try:
+            return mysql.connector.connect(**MYSQL_CONFIG)
+        except mysql.connector.Error as e:
+            print(f"MySQL connection error: {e}")
+            return None
+
+    started = time.monotonic()
+    replayed = spool.replay(connect)
+    print(f"Replayed {replayed} articles in {time.monotonic() - started:.1f}s, "
+          f"{spool.pending_count()} still spooled")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Non-blocking logging for the crawlers
+
+Crawler threads only put records on an in-memory queue (QueueHandler); a
+single QueueListener thread formats them and does the file and console I/O,
+so a slow disk or terminal never stalls a request loop. The file gets one
+JSON object per line and rotates by size instead of starting a new file per
+run. High-volume per-article lines go through LogSampler so a long crawl logs
+the first few occurrences of each kind and then every Nth one.
+"""
+
+import os
+import json
+import queue
+import atexit
+import logging
+import threading
+import logging.handlers
+from datetime import datetime
+from mysql_config import LOGGING_CONFIG
+from data_version import BASE_DIR
+
+# Record attributes set by logging itself; anything else came in through extra=
+_STANDARD_ATTRS = set(vars(logging.makeLogRecord({}))) | {'message', 'asctime'}
+
+_listeners = {}
+_listeners_lock = threading.Lock()
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record, including any extra= fields"""
+
+    def format(self, record):
+        entry = {
+            'ts': datetime.fromtimestamp(record.created).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'thread': record.threadName,
+            'msg': record.getMessage()
+        }
+        for key, value in vars(record).items():
+            if key not in _STANDARD_ATTRS and not key.startswith('_'):
+                entry[key] = value
+        if record.exc_info:
+            entry['exc'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+def get_log_dir():
+    path = LOGGING_CONFIG['dir']
+    if not os.path.isabs(path):
+        path = os.path.join(BASE_DIR, path)
+    return path
+
+
+def setup_crawler_logging(name: str, file_name: str):
+    """Logger whose records are written by a background listener (idempotent per name)"""
+    logger = logging.getLogger(name)
+
+    with _listeners_lock:
+        if name in _listeners:
+            return logger
+
+        log_dir = get_log_dir()
+        os.makedirs(log_dir, exist_ok=True)
+
+        file_handler = logging.handlers.RotatingFileHandler(
+            os.path.join(log_dir, file_name),
+            maxBytes=LOGGING_CONFIG['max_bytes'],
+            backupCount=LOGGING_CONFIG['backup_count'],
+            encoding='utf-8'
+        )
+        if LOGGING_CONFIG['json_file']:
+            file_handler.setFormatter(JsonFormatter())
+        else:
+            file_handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+        handlers = [file_handler]
+
+        if LOGGING_CONFIG['console']:
+            console = logging.StreamHandler()
+            console.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+            handlers.append(console)
+
+        # Unbounded queue: QueueHandler uses put_nowait and must never block a crawler thread
+        record_queue = queue.SimpleQueue()
+        listener = logging.handlers.QueueListener(record_queue, *handlers, respect_handler_level=True)
+        listener.start()
+        atexit.register(listener.stop)  # Drain what is still queued on exit
+        _listeners[name] = listener
+
+        logger.handlers = [logging.handlers.QueueHandler(record_queue)]
+        logger.setLevel(LOGGING_CONFIG['level'])
+        logger.propagate = False
+
+    return logger
+
+
+class LogSampler:
+    """Lets the first N records of a kind through, then every Nth"""
+
+    def __init__(self, first: int = None, every: int = None):
+        self.first = LOGGING_CONFIG['sample_first'] if first is None else first
+        self.every = LOGGING_CONFIG['sample_every'] if every is None else every
+        self.lock = threading.Lock()
+        self.counts = {}
+
+    def should_log(self, kind: str):
+        """Occurrence number of this record if it should be logged, else 0"""
+        with self.lock:
+            count = self.counts.get(kind, 0) + 1
+            self.counts[kind] = count
+        if count <= self.first or (self.every > 0 and count % self.every == 0):
+            return count
+        return 0
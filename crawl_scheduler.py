@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+Long-running crawl scheduler
+
+Keeps one warm crawler per source (HTTP session, MySQL pool, tables already
+created) and runs each source on its own cadence from SCHEDULER_CONFIG, with
+random jitter. A source never overlaps itself: runs are serialised in its own
+thread and guarded by a MySQL named lock, so a manual run or a second
+scheduler cannot crawl the same source at the same time.
+
+Status (last run, next run, result) is written to SCHEDULER_CONFIG['status_file']
+and served by the web app at /api/scheduler.
+
+Usage:
+    python3 crawl_scheduler.py
+    systemctl start news-crawler-scheduler.service
+"""
+
+import os
+import json
+import random
+import signal
+import threading
+import mysql.connector
+from datetime import datetime, timedelta
+from mysql_config import MYSQL_CONFIG, SCHEDULER_CONFIG
+from data_version import BASE_DIR
+
+
+def get_status_file():
+    """Absolute path of the scheduler status file"""
+    path = SCHEDULER_CONFIG['status_file']
+    if not os.path.isabs(path):
+        path = os.path.join(BASE_DIR, path)
+    return path
+
+
+def read_status():
+    """Scheduler status as written by the daemon ({} if it never ran)"""
+    try:
+        with open(get_status_file(), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+class SourceJob:
+    """One source on its own schedule"""
+
+    def __init__(self, name: str, settings: dict, scheduler):
+        self.name = name
+        self.settings = settings
+        self.scheduler = scheduler
+        self.crawler = None
+        self.status = {
+            'interval_minutes': settings['interval_minutes'],
+            'running': False,
+            'last_start': None,
+            'last_finish': None,
+            'last_result': None,
+            'last_error': None,
+            'next_run': None,
+            'runs': 0
+        }
+
+    def create_crawler(self):
+        """Build the crawler once and keep it warm between runs"""
+        if self.name == 'dunya':
+            from dunya_crawler_mysql import DunyaCrawlerMySQL
+            crawler = DunyaCrawlerMySQL()
+        else:
+            from ekonomist_crawler_mysql import EkonomistCrawlerMySQL
+            crawler = EkonomistCrawlerMySQL()
+        crawler.enable_connection_pool(SCHEDULER_CONFIG['pool_size'])
+        return crawler
+
+    def schedule_next(self, delay_seconds: float = None):
+        if delay_seconds is None:
+            delay_seconds = self.settings['interval_minutes'] * 60
+        delay_seconds += random.uniform(0, self.settings.get('jitter_seconds', 0))
+        self.status['next_run'] = (datetime.now() + timedelta(seconds=delay_seconds)).isoformat(timespec='seconds')
+        return delay_seconds
+
+    def acquire_lock(self):
+        """MySQL named lock so no other process crawls this source concurrently
+
+        Returns the lock's connection, or None if another run holds the lock;
+        raises mysql.connector.Error when MySQL cannot be asked.
+        """
+        conn = mysql.connector.connect(**MYSQL_CONFIG)
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SELECT GET_LOCK(%s, 0)", (f"news_crawler_{self.name}",))
+            if cursor.fetchone()[0] == 1:
+                return conn
+        except mysql.connector.Error:
+            conn.close()
+            raise
+        conn.close()
+        return None
+
+    def run_once(self):
+        """Run one crawl of this source"""
+        if self.crawler is None:
+            self.crawler = self.create_crawler()
+        crawler = self.crawler
+
+        # Fresh per-run counters, same warm session and pool
+        crawler.stats['start_time'] = datetime.now()
+
+        if self.name == 'dunya':
+            today = datetime.now().date()
+            start = today - timedelta(days=self.settings.get('lookback_days', 1))
+            method = self.settings.get('discovery_mode', 'pages')
+            if method == 'sitemap':
+                return crawler.run_sitemap_crawler(start.isoformat(), today.isoformat())
+            return crawler.run_smart_crawler(start.isoformat(), today.isoformat())
+
+        if self.settings.get('categories'):
+            return crawler.crawl_categories(max_pages=self.settings.get('max_pages', 5))
+        return crawler.crawl_pages(start_page=self.settings.get('start_page', 1),
+                                   max_pages=self.settings.get('max_pages', 5))
+
+    def loop(self):
+        stop = self.scheduler.stop_event
+        delay = self.schedule_next(self.settings.get('initial_delay_seconds', 0))
+        self.scheduler.write_status()
+
+        while not stop.wait(delay):
+            try:
+                lock_conn = self.acquire_lock()
+            except mysql.connector.Error as e:
+                self.status['last_error'] = f"lock unavailable: {e}"
+                self.scheduler.log(f"[{self.name}] MySQL unavailable for the run lock ({e}) - retrying later")
+                delay = self.schedule_next(SCHEDULER_CONFIG['lock_retry_seconds'])
+                self.scheduler.write_status()
+                continue
+            if lock_conn is None:
+                self.scheduler.log(f"[{self.name}] another run holds the lock - skipping this slot")
+                delay = self.schedule_next(SCHEDULER_CONFIG['lock_retry_seconds'])
+                self.scheduler.write_status()
+                continue
+
+            self.status.update(running=True, last_start=datetime.now().isoformat(timespec='seconds'))
+            self.scheduler.write_status()
+            self.scheduler.log(f"[{self.name}] run started")
+
+            try:
+                result = self.run_once()
+                self.status.update(last_result=result, last_error=None)
+            except Exception as e:
+                self.status.update(last_result=None, last_error=f"{type(e).__name__}: {e}")
+                self.scheduler.log(f"[{self.name}] run failed: {e}")
+            finally:
+                lock_conn.close()  # Closing the session releases the named lock
+
+            self.status['runs'] += 1
+            self.status.update(running=False, last_finish=datetime.now().isoformat(timespec='seconds'))
+            delay = self.schedule_next()
+            self.scheduler.log(f"[{self.name}] run finished ({self.status['last_result']}) - next run {self.status['next_run']}")
+            self.scheduler.write_status()
+
+
+class CrawlScheduler:
+    """Resident process running every enabled source on its cadence"""
+
+    def __init__(self):
+        self.stop_event = threading.Event()
+        self.status_lock = threading.Lock()
+        self.started = datetime.now().isoformat(timespec='seconds')
+        self.jobs = [SourceJob(name, settings, self)
+                     for name, settings in SCHEDULER_CONFIG['sources'].items()
+                     if settings.get('enabled', True)]
+
+    def log(self, message: str):
+        print(f"{datetime.now().strftime('%Y-%m-%d %H:%M:%S')} - scheduler - {message}", flush=True)
+
+    def write_status(self):
+        """Publish per-source status for /api/scheduler"""
+        path = get_status_file()
+        with self.status_lock:
+            status = {
+                'pid': os.getpid(),
+                'started': self.started,
+                'updated': datetime.now().isoformat(timespec='seconds'),
+                'sources': {job.name: job.status for job in self.jobs}
+            }
+            try:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                tmp_path = f"{path}.tmp"
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(status, f, indent=2, default=str)
+                os.replace(tmp_path, path)
+            except OSError as e:
+                self.log(f"Could not write status file: {e}")
+
+    def stop(self, *_):
+        self.log("Stop requested - finishing current runs")
+        self.stop_event.set()
+
+    def run(self):
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+
+        threads = []
+        for job in self.jobs:
+            thread = threading.Thread(target=job.loop, name=f"scheduler-{job.name}", daemon=True)
+            thread.start()
+            threads.append(thread)
+            self.log(f"[{job.name}] scheduled every {job.settings['interval_minutes']} min")
+
+        while not self.stop_event.is_set():
+            self.stop_event.wait(1)
+
+        for thread in threads:
+            thread.join(timeout=SCHEDULER_CONFIG['shutdown_timeout_seconds'])
+        self.write_status()
+        self.log("Scheduler stopped")
+
+
+def main():
+    CrawlScheduler().run()
+
+
+if __name__ == "__main__":
+    main()
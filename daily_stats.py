@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Per-day article rollup (source x publication day)
+
+The crawler write path (save_article and the spool replay) calls
+record_daily_stats() in an explicit transaction with the article insert and
+its fingerprint rows (the pool runs with autocommit on), so article_daily_stats
+always matches the article tables without rescanning them. Coverage questions ("which days are thin or missing
+for Dunya?") are answered from a few hundred rollup rows. The day is
+DATE(news_visible_datetime), falling back to the crawl date. HTML-status
+counts reflect the status at insert time. Offline rewrites of stored rows
+(reextract.py) call remove_daily_stats() before and record_daily_stats()
+after the update.
+
+Rebuild from the article tables (first deployment, or after manual edits):
+    python3 daily_stats.py rebuild
+    python3 daily_stats.py show dunya 30
+"""
+
+import sys
+import mysql.connector
+from datetime import date, timedelta
+from mysql_config import MYSQL_CONFIG, TABLE_NAMES
+
+SOURCES = ('dunya', 'ekonomist')
+
+# Rollup columns computed from a set of article rows
+_ROLLUP_SELECT = '''
+    SELECT %s AS source, DATE(COALESCE(news_visible_datetime, crawl_datetime)) AS day,
+           COUNT(*) AS articles,
+           COALESCE(SUM(CHAR_LENGTH(news_visible_body)), 0) AS body_chars,
+           -- <=> is NULL-safe: a NULL html_status counts 0, so the sums are never NULL
+           SUM(html_status <=> 'success') AS html_success,
+           SUM(html_status <=> 'missing') AS html_missing,
+           SUM(html_status <=> 'duplicate') AS html_duplicate,
+           SUM(html_status NOT IN ('success', 'missing', 'duplicate') OR html_status IS NULL) AS html_other,
+           NOW() AS updated_datetime
+    FROM {table}
+'''
+
+_ROLLUP_UPSERT = '''
+    INSERT INTO {daily} (source, day, articles, body_chars, html_success, html_missing,
+                         html_duplicate, html_other, updated_datetime)
+    {select}
+    ON DUPLICATE KEY UPDATE
+        articles = articles + VALUES(articles),
+        body_chars = body_chars + VALUES(body_chars),
+        html_success = html_success + VALUES(html_success),
+        html_missing = html_missing + VALUES(html_missing),
+        html_duplicate = html_duplicate + VALUES(html_duplicate),
+        html_other = html_other + VALUES(html_other),
+        updated_datetime = VALUES(updated_datetime)
+'''
+
+_ROLLUP_SUBTRACT = '''
+    UPDATE {daily} d
+    JOIN ({select}) r ON d.source = r.source AND d.day = r.day
+    SET d.articles = d.articles - r.articles,
+        d.body_chars = d.body_chars - r.body_chars,
+        d.html_success = d.html_success - r.html_success,
+        d.html_missing = d.html_missing - r.html_missing,
+        d.html_duplicate = d.html_duplicate - r.html_duplicate,
+        d.html_other = d.html_other - r.html_other,
+        d.updated_datetime = r.updated_datetime
+'''
+
+
+def setup_daily_stats_table(cursor):
+    """Create the rollup table"""
+    cursor.execute(f'''
+        CREATE TABLE IF NOT EXISTS {TABLE_NAMES['daily_stats']} (
+            source VARCHAR(20) NOT NULL,
+            day DATE NOT NULL,
+            articles INT NOT NULL DEFAULT 0,
+            body_chars BIGINT NOT NULL DEFAULT 0,
+            html_success INT NOT NULL DEFAULT 0,
+            html_missing INT NOT NULL DEFAULT 0,
+            html_duplicate INT NOT NULL DEFAULT 0,
+            html_other INT NOT NULL DEFAULT 0,
+            updated_datetime DATETIME,
+            PRIMARY KEY (source, day)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    ''')
+
+
+def record_daily_stats(cursor, source: str, article_ids: list):
+    """Add newly inserted articles to the rollup (call before the insert's commit)"""
+    if not article_ids:
+        return
+    table = TABLE_NAMES[f'{source}_articles']
+    select = _ROLLUP_SELECT.format(table=table) + f'''
+        WHERE id IN ({', '.join(['%s'] * len(article_ids))})
+        GROUP BY day
+    '''
+    cursor.execute(_ROLLUP_UPSERT.format(daily=TABLE_NAMES['daily_stats'], select=select),
+                   (source, *article_ids))
+
+
+def remove_daily_stats(cursor, source: str, article_ids: list):
+    """Take articles out of the rollup before their rows are rewritten (record them again after)"""
+    if not article_ids:
+        return
+    table = TABLE_NAMES[f'{source}_articles']
+    select = _ROLLUP_SELECT.format(table=table) + f'''
+        WHERE id IN ({', '.join(['%s'] * len(article_ids))})
+        GROUP BY day
+    '''
+    cursor.execute(_ROLLUP_SUBTRACT.format(daily=TABLE_NAMES['daily_stats'], select=select),
+                   (source, *article_ids))
+
+
+def rebuild_daily_stats(conn, sources=SOURCES):
+    """Recompute the rollup from the article tables (one full scan per source)"""
+    cursor = conn.cursor()
+    setup_daily_stats_table(cursor)
+    for source in sources:
+        table = TABLE_NAMES[f'{source}_articles']
+        cursor.execute(f"DELETE FROM {TABLE_NAMES['daily_stats']} WHERE source = %s", (source,))
+        select = _ROLLUP_SELECT.format(table=table) + ' GROUP BY day'
+        cursor.execute(_ROLLUP_UPSERT.format(daily=TABLE_NAMES['daily_stats'], select=select), (source,))
+        conn.commit()
+
+
+def query_daily_stats(cursor, start: date, end: date, source: str = None):
+    """Rollup rows between two days (inclusive), oldest first"""
+    query = f'''
+        SELECT source, day, articles, body_chars, html_success, html_missing, html_duplicate, html_other
+        FROM {TABLE_NAMES['daily_stats']}
+        WHERE day BETWEEN %s AND %s
+    '''
+    params = [start, end]
+    if source:
+        query += ' AND source = %s'
+        params.append(source)
+    cursor.execute(query + ' ORDER BY day, source', params)
+    return [{
+        'source': row[0],
+        'day': row[1].isoformat(),
+        'articles': row[2],
+        'avg_body_chars': round(row[3] / row[2]) if row[2] else 0,
+        'html_status': {
+            'success': int(row[4]),
+            'missing': int(row[5]),
+            'duplicate': int(row[6]),
+            'other': int(row[7])
+        }
+    } for row in cursor.fetchall()]
+
+
+def main():
+    command = sys.argv[1] if len(sys.argv) > 1 else ''
+    if command not in ('rebuild', 'show'):
+        print("Usage: python3 daily_stats.py rebuild | show [source] [days]")
+        sys.exit(2)
+
+    conn = mysql.connector.connect(**MYSQL_CONFIG)
+    try:
+        if command == 'rebuild':
+            rebuild_daily_stats(conn)
+            print("Daily stats rebuilt")
+            return
+
+        source = sys.argv[2] if len(sys.argv) > 2 else None
+        days = int(sys.argv[3]) if len(sys.argv) > 3 else 30
+        today = date.today()
+        for row in query_daily_stats(conn.cursor(), today - timedelta(days=days), today, source):
+            print(f"{row['day']}  {row['source']:10} {row['articles']:6}  "
+                  f"avg {row['avg_body_chars']:6} chars  {row['html_status']}")
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
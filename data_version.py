@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Data version stamp shared by the crawlers and the web application.
+
+The crawlers bump the stamp after each batch of inserts; the web app uses it
+to invalidate cached pages and to build HTTP validators.
+
+The stamp lives in a one-row MySQL table by default, so a crawler or
+work-queue worker on any host invalidates the caches of every web node.
+CACHE_CONFIG['version_store'] = 'file' keeps it in a local file instead,
+which only works when the crawlers and the web app share a host.
+"""
+
+import os
+import time
+import tempfile
+import threading
+from mysql_config import MYSQL_CONFIG, TABLE_NAMES, CACHE_CONFIG
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+_lock = threading.Lock()
+_cached_version = None
+_cached_at = 0.0
+_table_ready = False
+
+
+def get_version_file():
+    """Absolute path of the version stamp file"""
+    path = CACHE_CONFIG['version_file']
+    if not os.path.isabs(path):
+        path = os.path.join(BASE_DIR, path)
+    return path
+
+
+def _uses_mysql():
+    return CACHE_CONFIG.get('version_store', 'mysql') == 'mysql'
+
+
+def _read_file_version():
+    try:
+        with open(get_version_file(), 'r') as f:
+            return int(f.read().strip() or 0)
+    except (OSError, ValueError):
+        return 0
+
+
+def _read_mysql_version():
+    import mysql.connector
+    try:
+        conn = mysql.connector.connect(**MYSQL_CONFIG)
+    except mysql.connector.Error:
+        return None
+    try:
+        cursor = conn.cursor()
+        cursor.execute(f"SELECT version FROM {TABLE_NAMES['data_version']} WHERE name = 'articles'")
+        row = cursor.fetchone()
+        return int(row[0]) if row else 0
+    except mysql.connector.Error as e:
+        # 1146: table not created yet - nothing was bumped
+        return 0 if getattr(e, 'errno', None) == 1146 else None
+    finally:
+        conn.close()
+
+
+def read_data_version():
+    """Read the current stamp from its store (0 if nothing was written yet, None if MySQL is unreachable)"""
+    return _read_mysql_version() if _uses_mysql() else _read_file_version()
+
+
+def get_data_version():
+    """Current data version, re-read at most every version_check_interval seconds"""
+    global _cached_version, _cached_at
+
+    now = time.monotonic()
+    with _lock:
+        if _cached_version is None or now - _cached_at >= CACHE_CONFIG['version_check_interval']:
+            version = read_data_version()
+            # Keep the last known stamp while MySQL is unreachable rather than dropping every cache
+            if version is not None or _cached_version is None:
+                _cached_version = version or 0
+            _cached_at = now
+        return _cached_version
+
+
+def _bump_file_version(version: int):
+    path = get_version_file()
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    version = max(version, _read_file_version() + 1)
+    try:
+        # Unique temp name per call: threads of one process bump concurrently
+        with tempfile.NamedTemporaryFile('w', dir=os.path.dirname(path), prefix='data_version.',
+                                         suffix='.tmp', delete=False) as f:
+            f.write(str(version))
+        os.replace(f.name, path)  # Atomic swap so readers never see a partial file
+    except OSError:
+        return None
+    return version
+
+
+def _bump_mysql_version(version: int):
+    global _table_ready
+    import mysql.connector
+    try:
+        conn = mysql.connector.connect(**MYSQL_CONFIG)
+    except mysql.connector.Error:
+        return None
+    try:
+        cursor = conn.cursor()
+        if not _table_ready:
+            cursor.execute(f'''
+                CREATE TABLE IF NOT EXISTS {TABLE_NAMES['data_version']} (
+                    name VARCHAR(32) PRIMARY KEY,
+                    version BIGINT UNSIGNED NOT NULL,
+                    updated_datetime DATETIME
+                ) ENGINE=InnoDB
+            ''')
+            _table_ready = True
+        # GREATEST keeps the stamp increasing even if this host's clock is behind
+        cursor.execute(f'''
+            INSERT INTO {TABLE_NAMES['data_version']} (name, version, updated_datetime)
+            VALUES ('articles', %s, NOW())
+            ON DUPLICATE KEY UPDATE version = GREATEST(version + 1, VALUES(version)),
+                                    updated_datetime = VALUES(updated_datetime)
+        ''', (version,))
+        cursor.execute(f"SELECT version FROM {TABLE_NAMES['data_version']} WHERE name = 'articles'")
+        return int(cursor.fetchone()[0])
+    except mysql.connector.Error:
+        return None
+    finally:
+        conn.close()
+
+
+def bump_data_version():
+    """Record that new data was written - called by the crawlers after each batch"""
+    global _cached_version, _cached_at
+
+    # Nanosecond timestamp doubles as a monotonic version and a Last-Modified source
+    version = time.time_ns()
+    version = _bump_mysql_version(version) if _uses_mysql() else _bump_file_version(version)
+    if version is None:
+        return None
+
+    with _lock:
+        _cached_version = version
+        _cached_at = time.monotonic()
+    return version
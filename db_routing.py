@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Read-replica routing for the web application
+
+When MYSQL_READ_CONFIG is set, the app sends its read-only queries to that
+endpoint and keeps the primary for the crawlers' insert stream. A
+ReplicaLagMonitor checks the replica's lag at most every
+REPLICA_CONFIG['lag_check_interval'] seconds. While the lag is above
+max_lag_seconds, replication is stopped, or the replica is unreachable,
+reads fall back to the primary. Right after a crawler write (a data version
+bump) reads also stay on the primary until the replica's lag says it has
+that write, so cached pages and ETags never pair a new version with old rows.
+
+Local testing:
+    # second instance (or the same server under another port/user) as the read endpoint
+    MYSQL_READ_HOST=127.0.0.1 MYSQL_READ_PORT=3307 python3 db_routing.py check
+    # a stand-in that is not a real replica: skip the lag check
+    REPLICA_LAG_CHECK=none MYSQL_READ_HOST=127.0.0.1 MYSQL_READ_PORT=3307 python3 run_web.py --dev
+Every response carries X-DB-Route: replica|primary.
+"""
+
+import sys
+import time
+import threading
+import mysql.connector
+from mysql_config import MYSQL_CONFIG, MYSQL_READ_CONFIG, REPLICA_CONFIG
+
+
+def query_replica_lag(conn):
+    """Seconds behind the source, or None if the server is not a running replica"""
+    cursor = conn.cursor(dictionary=True)
+    try:
+        try:
+            cursor.execute("SHOW REPLICA STATUS")   # MySQL 8.0.22+
+        except mysql.connector.Error:
+            cursor.execute("SHOW SLAVE STATUS")
+        status = cursor.fetchone()
+        cursor.fetchall()
+    finally:
+        cursor.close()
+
+    if not status:
+        return None
+    lag = status.get('Seconds_Behind_Source', status.get('Seconds_Behind_Master'))
+    return None if lag is None else float(lag)
+
+
+class ReplicaLagMonitor:
+    """Cached answer to 'may reads go to the replica right now?'"""
+
+    def __init__(self, get_replica_connection, log=print):
+        self.get_replica_connection = get_replica_connection
+        self.log = log
+        self.lock = threading.Lock()
+        self.checked_at = 0.0
+        self.usable = False
+        self.lag = None
+        self.blocked_until = 0.0
+
+    def check(self):
+        """Measure the lag now; returns whether the replica is fresh enough"""
+        if REPLICA_CONFIG['lag_check'] == 'none':
+            self.lag, self.usable = 0.0, True
+            return True
+
+        conn = self.get_replica_connection()
+        if not conn:
+            self.lag, self.usable = None, False
+            return False
+        try:
+            self.lag = query_replica_lag(conn)
+        except mysql.connector.Error as e:
+            self.log(f"Replica lag check failed: {e}")
+            self.lag = None
+        finally:
+            conn.close()
+
+        was_usable = self.usable
+        self.usable = self.lag is not None and self.lag <= REPLICA_CONFIG['max_lag_seconds']
+        if was_usable and not self.usable:
+            self.log(f"Replica lag {self.lag}s over {REPLICA_CONFIG['max_lag_seconds']}s - reading from primary")
+        elif self.usable and not was_usable:
+            self.log(f"Replica lag {self.lag}s - reading from replica")
+        return self.usable
+
+    def replica_usable(self):
+        now = time.monotonic()
+        if now < self.blocked_until:
+            return False
+        # Only one request thread re-checks; the others use the cached answer
+        if now - self.checked_at >= REPLICA_CONFIG['lag_check_interval'] and self.lock.acquire(blocking=False):
+            try:
+                self.checked_at = now
+                self.check()
+            finally:
+                self.lock.release()
+        return self.usable
+
+    def has_caught_up(self, version: int):
+        """Whether the replica has applied the writes behind a data version stamp
+
+        The stamp is the bump time in nanoseconds, taken after the primary
+        committed. A replica lagging L seconds has every commit older than L,
+        plus one check interval because the lag may have grown since it was measured.
+        Reading a page for a fresh stamp from a replica that has not caught up would
+        cache (or 304) the pre-write page under the new version.
+        """
+        if not version:
+            return True
+        lag = self.lag if self.lag is not None else REPLICA_CONFIG['max_lag_seconds']
+        return time.time() - version / 1e9 > lag + REPLICA_CONFIG['lag_check_interval']
+
+    def mark_failed(self):
+        """Replica connection failed - stay on the primary for a while"""
+        self.usable = False
+        self.blocked_until = time.monotonic() + REPLICA_CONFIG['retry_after_failure_seconds']
+
+
+def main():
+    if len(sys.argv) < 2 or sys.argv[1] != 'check':
+        print("Usage: python3 db_routing.py check")
+        sys.exit(2)
+    if not MYSQL_READ_CONFIG:
+        print("No read endpoint configured (MYSQL_READ_CONFIG / MYSQL_READ_HOST) - all reads use the primary")
+        return
+
+    def connect():
+        try:
+            return mysql.connector.connect(**MYSQL_READ_CONFIG)
+        except mysql.connector.Error as e:
+            print(f"Replica connection error: {e}")
+            return None
+
+    monitor = ReplicaLagMonitor(connect)
+    usable = monitor.check()
+    print(f"Primary:  {MYSQL_CONFIG['host']}:{MYSQL_CONFIG.get('port', 3306)}")
+    print(f"Replica:  {MYSQL_READ_CONFIG['host']}:{MYSQL_READ_CONFIG.get('port', 3306)}")
+    print(f"Lag:      {monitor.lag if monitor.lag is not None else 'unknown (not a running replica?)'}")
+    print(f"Reads go to the {'replica' if usable else 'primary'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -22,17 +22,21 @@ nginx -t
 # Install and configure systemd service
 echo "⚙️ Configuring systemd service..."
 cp news-crawler.service /etc/systemd/system/
+cp news-crawler-scheduler.service /etc/systemd/system/
 systemctl daemon-reload
 systemctl enable news-crawler.service
+systemctl enable news-crawler-scheduler.service
 
 # Start services
 echo "🔄 Starting services..."
 systemctl start news-crawler.service
+systemctl start news-crawler-scheduler.service
 systemctl restart nginx
 
 # Check status
 echo "📊 Checking service status..."
 systemctl status news-crawler.service --no-pager
+systemctl status news-crawler-scheduler.service --no-pager
 systemctl status nginx --no-pager
 
 echo "✅ Deployment complete!"
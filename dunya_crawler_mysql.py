@@ -7,13 +7,28 @@ Console version without Rich - shows all essential logs
 import requests
 import random
 import time
+import io
 import os
+import re
+import gzip
 import logging
 import mysql.connector
+import mysql.connector.pooling
+import xml.etree.ElementTree as ET
 from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from bs4 import BeautifulSoup
-from urllib.parse import urljoin
-from mysql_config import MYSQL_CONFIG, TABLE_NAMES
+from crawl_logging import setup_crawler_logging, LogSampler
+from mysql_config import (MYSQL_CONFIG, TABLE_NAMES, DEDUP_CONFIG, RENDER_CONFIG, SPOOL_CONFIG, PREFILTER_CONFIG,
+                          FETCH_CONFIG)
+from data_version import bump_data_version
+from article_spool import ARTICLE_COLUMNS, get_shared_spool
+from listing_links import extract_listing_links, extract_listing_cards
+from fetch_utils import HostBreakers, LatencyTracker, RequestHedger, SharedUrlSet, fetch_with_retry
+from render_pool import BrowserRenderPool
+from daily_stats import setup_daily_stats_table, record_daily_stats
+from near_duplicates import (compute_fingerprint, find_near_duplicate,
+                             register_fingerprint, setup_fingerprint_tables)
 
 # User agents
 USER_AGENTS = [
@@ -21,11 +36,29 @@ USER_AGENTS = [
     "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36",
 ]
 
+# Sitemap index used by the sitemap discovery mode
+SITEMAP_INDEX_URL = 'https://www.dunya.com/sitemap.xml'
+
+# Dates embedded in sub-sitemap URLs, e.g. sitemap-2025-09-01.xml or /2025/09/
+SITEMAP_DAY_RE = re.compile(r'(\d{4})[-/_](\d{2})[-/_](\d{2})')
+SITEMAP_MONTH_RE = re.compile(r'(\d{4})[-/_](\d{2})(?!\d)')
+
 class DunyaCrawlerMySQL:
     def __init__(self):
         self.session = requests.Session()
+        self.db_pool = None  # Optional, see enable_connection_pool()
         self.setup_logging()
+        self.breakers = HostBreakers(log=self.log)  # Per-host circuit breakers
+        self.latency = LatencyTracker()  # Per-host latencies for adaptive timeouts
+        self.hedger = RequestHedger()  # Hedged probes run on the hedger's own sessions
+        self.renderer = None  # Headless browser pool, started on first use
+        self.log_prefix = ''
+        self.save_range = None  # (start, end) dates for saving when it differs from the page walk range
+        self.claimed_urls = None  # SharedUrlSet when partitions crawl in parallel
+        self.page_dates = {}  # page number -> date of its first (newest) article
         self.setup_database()
+        # One spool and one replayer per process, however many crawlers it runs
+        self.spool = get_shared_spool(self.get_mysql_connection, log=self.log) if SPOOL_CONFIG['enabled'] else None
         
         # Stats
         self.stats = {
@@ -37,28 +70,14 @@ class DunyaCrawlerMySQL:
             'search_pages': [],  # Pages we've checked during binary search
             'target_start_date': None,
             'target_end_date': None,
-            'search_phase': "initializing"
+            'search_phase': "initializing",
+            'skipped_before_fetch': 0
         }
         
     def setup_logging(self):
-        """Setup proper logging with file and console output"""
-        # Create logs directory
-        log_dir = "logs"
-        os.makedirs(log_dir, exist_ok=True)
-        
-        # Create log filename with timestamp
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        log_file = os.path.join(log_dir, f"dunya_crawler_mysql_{timestamp}.log")
-        
-        # Setup logging configuration with UTF-8 support
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s - %(levelname)s - %(message)s',
-            handlers=[
-                logging.FileHandler(log_file, encoding='utf-8'),
-                logging.StreamHandler()  # Console output
-            ]
-        )
+        """Setup queued logging: rotating JSON log file and console, written off the crawl thread"""
+        self.logger = setup_crawler_logging('dunya_crawler', 'dunya_crawler_mysql.log')
+        self.sampler = LogSampler()
         
         # Set console encoding to UTF-8 if possible
         import sys
@@ -69,19 +88,41 @@ class DunyaCrawlerMySQL:
             except:
                 pass
         
-        self.logger = logging.getLogger(__name__)
-        
         # Minimal initialization logging
         self.logger.info("Dunya Crawler MySQL initialized")
         self.use_emojis = False
         
-    def log(self, message: str):
-        """Minimal log function"""
-        self.logger.info(message)
+    def log(self, message: str, **fields):
+        """Minimal log function; keyword fields become JSON attributes in the log file"""
+        self.logger.info(self.log_prefix + message, extra=fields or None)
         
+    def log_sampled(self, kind: str, message: str, **fields):
+        """Per-article detail line: every one at DEBUG level, otherwise sampled"""
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(self.log_prefix + message, extra=dict(fields, kind=kind))
+            return
+        occurrence = self.sampler.should_log(kind)
+        if occurrence:
+            self.logger.info(self.log_prefix + message, extra=dict(fields, kind=kind, occurrence=occurrence))
+        
+    def enable_connection_pool(self, pool_size: int = 2):
+        """Reuse MySQL connections across saves (used by long-running processes)"""
+        try:
+            self.db_pool = mysql.connector.pooling.MySQLConnectionPool(
+                pool_name=f"dunya_{os.getpid()}_{id(self)}",
+                pool_size=pool_size,
+                **MYSQL_CONFIG
+            )
+        except mysql.connector.Error as e:
+            self.log(f"MySQL pool creation error: {e}")
+            self.db_pool = None
+    
     def get_mysql_connection(self):
         """Get MySQL database connection"""
         try:
+            if self.db_pool is not None:
+                # close() on a pooled connection hands it back to the pool
+                return self.db_pool.get_connection()
             conn = mysql.connector.connect(**MYSQL_CONFIG)
             return conn
         except mysql.connector.Error as e:
@@ -128,6 +169,10 @@ class DunyaCrawlerMySQL:
                 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
             ''')
             
+            # Near-duplicate fingerprint tables (shared by both crawlers)
+            setup_fingerprint_tables(cursor)
+            setup_daily_stats_table(cursor)
+            
             conn.commit()
             self.log("MySQL database tables initialized for Dunya crawler")
             
@@ -145,11 +190,19 @@ class DunyaCrawlerMySQL:
             "Connection": "keep-alive"
         }
     
-    def make_request(self, url: str, max_retries: int = 1):
-        """Make HTTP request - OPTIMIZED FOR SPEED"""
+    def make_request(self, url: str, max_retries: int = None, hedged: bool = False):
+        """Make HTTP request - retries transient errors with backoff, pauses on host outages
+        
+        Timeouts adapt to the host's observed p99 (5 s until measured); hedged=True
+        fires a second attempt when the first is slower than the host's p95.
+        """
         try:
-            response = self.session.get(url, headers=self.get_headers(), timeout=5)  # Increased for stability
-            response.raise_for_status()
+            # Streamed, size-capped and decoded once - see fetch_utils.py
+            response = fetch_with_retry(self.session, url, breakers=self.breakers,
+                                        max_retries=max_retries, log=self.log,
+                                        latency=self.latency,
+                                        hedger=self.hedger if hedged else None,
+                                        timeout=5, headers=self.get_headers())
             self.stats['successful_requests'] += 1
             return response
         except Exception as e:
@@ -189,6 +242,32 @@ class DunyaCrawlerMySQL:
             'published_time': published_time
         }
     
+    def extract_with_render_fallback(self, url: str, html: str):
+        """Extract content, re-rendering in a headless browser if the static HTML has none"""
+        article_data = self.extract_article_content(html)
+        if article_data['content'] != "No content found" or not RENDER_CONFIG['enabled']:
+            return article_data, html
+        
+        if self.renderer is None:
+            self.renderer = BrowserRenderPool(log=self.log)
+        
+        rendered = self.renderer.render(url)
+        if not rendered:
+            return article_data, html
+        
+        rendered_data = self.extract_article_content(rendered.text)
+        if rendered_data['content'] == "No content found":
+            return article_data, html
+        
+        self.log_sampled('rendered', f"Content recovered by rendering: {url[:80]}", url=url)
+        return rendered_data, rendered.text
+    
+    def close_renderer(self):
+        """Shut down the headless browser pool, if this crawler started one"""
+        if self.renderer is not None:
+            self.renderer.close()
+            self.renderer = None
+    
     def parse_date(self, date_str: str):
         """Parse date string to datetime object"""
         if not date_str:
@@ -207,6 +286,10 @@ class DunyaCrawlerMySQL:
         except Exception:
             return None
     
+    def extract_article_links(self, html: str):
+        """Find unique article links on a /gundem listing page (regex scan, no DOM parse)"""
+        return extract_listing_links(html)
+    
     def get_page_date_range(self, page_num: int):
         """Get date from a specific page (check only first article)"""
         base_url = 'https://www.dunya.com/gundem'
@@ -214,21 +297,13 @@ class DunyaCrawlerMySQL:
         
         self.log(f"Checking page {page_num} for dates...")
         
-        response = self.make_request(url)
+        # Search probes are latency-critical - hedge them
+        response = self.make_request(url, hedged=True)
         if not response:
             self.log(f"Failed to load page {page_num}")
             return None, None
         
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
-        # Find article links
-        article_links = []
-        for link in soup.find_all('a', href=True):
-            href = link['href']
-            if '/gundem/' in href and 'haberi-' in href:
-                if not href.startswith('http'):
-                    href = urljoin(base_url, href)
-                article_links.append(href)
+        article_links = self.extract_article_links(response.text)
         
         if not article_links:
             self.log(f"No articles found on page {page_num}")
@@ -238,7 +313,7 @@ class DunyaCrawlerMySQL:
         article_url = article_links[0]  # Only check first article
         self.log(f"Checking first article from page {page_num}: {article_url[:80]}...")
         
-        article_response = self.make_request(article_url)
+        article_response = self.make_request(article_url, hedged=True)
         if not article_response:
             self.log(f"Failed to load article from page {page_num}")
             return None, None
@@ -248,6 +323,7 @@ class DunyaCrawlerMySQL:
             parsed_date = self.parse_date(article_data['published_time'])
             if parsed_date:
                 self.log(f"Page {page_num}: Article date = {parsed_date.strftime('%Y-%m-%d %H:%M')}")
+                self.page_dates[page_num] = parsed_date.date()
                 return parsed_date, parsed_date  # Same date for min and max
         
         self.log(f"Page {page_num}: No valid date found")
@@ -372,6 +448,8 @@ class DunyaCrawlerMySQL:
             # Process this page and save articles
             page_articles = self.process_page_articles(page_num)
             total_articles += page_articles
+            if page_articles:
+                bump_data_version()  # Invalidate cached web pages
             self.log(f"Page {page_num}: {page_articles} articles saved")
             
             # Move to next page
@@ -381,8 +459,108 @@ class DunyaCrawlerMySQL:
         self.log(f"Total articles saved: {total_articles}")
         return total_articles
     
+    def get_save_range(self):
+        """(start, end) dates of articles to save"""
+        if self.save_range:
+            return self.save_range
+        return self.stats['target_start_date'].date(), self.stats['target_end_date'].date()
+    
+    def visit_listed_article(self, article_url: str, page_url: str, page_num: int, position: int):
+        """Fetch one listed article and save it if it is in range; returns (date or None, saved)"""
+        # Listings shift as new articles are published, so neighbouring page ranges can overlap - fetch each article once
+        if self.claimed_urls is not None and not self.claimed_urls.claim(article_url):
+            return None, False
+        
+        article_response = self.make_request(article_url)
+        if not article_response:
+            return None, False
+        
+        article_data, article_html = self.extract_with_render_fallback(article_url, article_response.text)
+        article_data['url'] = article_url
+        
+        if not article_data.get('published_time'):
+            self.log_sampled('missing_date', f"No published_time found in article {position + 1}", url=article_url)
+            return None, False
+        article_date = self.parse_date(article_data['published_time'])
+        if not article_date:
+            self.log_sampled('unparsed_date', f"Failed to parse date from article {position + 1}", url=article_url)
+            return None, False
+        
+        # Compare only dates, not times
+        start_date_only, end_date_only = self.get_save_range()
+        saved = False
+        if start_date_only <= article_date.date() <= end_date_only:
+            # Save this article with HTML content
+            saved = bool(self.save_article(article_data, page_url, page_num, article_html))
+        return article_date.date(), saved
+    
+    def page_inside_range(self, page_num: int, start_date_only, end_date_only):
+        """True if known neighbouring page dates put every article of the page in range"""
+        newest = self.page_dates.get(page_num)
+        oldest_bound = self.page_dates.get(page_num + 1)  # Next page starts where this one ends
+        return (newest is not None and oldest_bound is not None
+                and newest <= end_date_only and oldest_bound >= start_date_only)
+    
+    def find_range_bounds(self, visit, count: int, start_date_only, end_date_only):
+        """Bisect a newest-first listing for the in-range slice [lo, hi)
+        
+        Every probe is a real visit (in-range probes are saved), so the ends of the
+        page are probed first: on pages entirely inside the range that costs nothing extra.
+        Returns None when a probe has no date or the probed dates are not newest
+        first (e.g. a pinned card) - the caller then visits everything.
+        """
+        probed = {}  # index -> date of every probe so far
+        
+        def position(index):
+            # 0: newer than the range, 1: inside, 2: older
+            article_date = visit(index)
+            if article_date is None:
+                raise LookupError(index)
+            probed[index] = article_date
+            # Bisection is only sound on a newest-first listing
+            if any((other < index and other_date < article_date) or (other > index and other_date > article_date)
+                   for other, other_date in probed.items()):
+                raise LookupError(index)
+            if article_date > end_date_only:
+                return 0
+            return 1 if article_date >= start_date_only else 2
+        
+        try:
+            # lo = first article not newer than the range
+            if position(0) >= 1:
+                lo = 0
+            elif position(count - 1) == 0:
+                return count, count
+            else:
+                low, high = 0, count - 1  # position(low) == 0, position(high) >= 1
+                while high - low > 1:
+                    middle = (low + high) // 2
+                    if position(middle) == 0:
+                        low = middle
+                    else:
+                        high = middle
+                lo = high
+            
+            # hi = first article older than the range
+            if position(count - 1) <= 1:
+                hi = count
+            elif position(lo) == 2:
+                hi = lo
+            else:
+                low, high = lo, count - 1  # position(low) <= 1, position(high) == 2
+                while high - low > 1:
+                    middle = (low + high) // 2
+                    if position(middle) <= 1:
+                        low = middle
+                    else:
+                        high = middle
+                hi = high
+        except LookupError:
+            return None
+        return lo, hi
+    
     def process_page_articles(self, page_num: int):
-        """Process all articles on a specific page"""
+        """Process all articles on a specific page, skipping ones that are clearly out of range"""
         base_url = 'https://www.dunya.com/gundem'
         url = base_url if page_num == 1 else f"{base_url}/{page_num}"
         
@@ -390,102 +568,461 @@ class DunyaCrawlerMySQL:
         if not response:
             return 0
         
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
-        # Find article links
-        article_links = []
-        for link in soup.find_all('a', href=True):
-            href = link['href']
-            if '/gundem/' in href and 'haberi-' in href:
-                if not href.startswith('http'):
-                    href = urljoin(base_url, href)
-                article_links.append(href)
+        cards = extract_listing_cards(response.text)
         
-        if not article_links:
+        if not cards:
             return 0
         
-        # Process all articles on this page
-        page_articles = 0
-        for i, article_url in enumerate(article_links):
-            article_response = self.make_request(article_url)
-            if not article_response:
+        start_date_only, end_date_only = self.get_save_range()
+        slack = timedelta(days=PREFILTER_CONFIG['card_date_slack_days'])
+        
+        # Listing-card dates drop out-of-range articles before download
+        candidates = []
+        for article_url, card_date in cards:
+            if (PREFILTER_CONFIG['enabled'] and card_date is not None
+                    and not (start_date_only - slack <= card_date <= end_date_only + slack)):
                 continue
-            
-            article_data = self.extract_article_content(article_response.text)
-            article_data['url'] = article_url
-            
-            # Check if this article is within our date range
-            if article_data.get('published_time'):
-                article_date = self.parse_date(article_data['published_time'])
-                if article_date:
-                    # Compare only dates, not times
-                    article_date_only = article_date.date()
-                    start_date_only = self.stats['target_start_date'].date()
-                    end_date_only = self.stats['target_end_date'].date()
-                    
-                    if start_date_only <= article_date_only <= end_date_only:
-                        # Save this article with HTML content
-                        article_id = self.save_article(article_data, url, page_num, article_response.text)
-                        if article_id:
-                            page_articles += 1
-                else:
-                    self.log(f"Failed to parse date from article {i+1}")
-            else:
-                self.log(f"No published_time found in article {i+1}")
-            
-            # Process all articles on this page
+            if self.claimed_urls is not None and self.claimed_urls.is_claimed(article_url):
+                continue
+            candidates.append(article_url)
+        
+        visited = {}  # candidate index -> article date
+        page_articles = 0
+        
+        def visit(index):
+            nonlocal page_articles
+            if index not in visited:
+                article_date, saved = self.visit_listed_article(candidates[index], url, page_num, index)
+                visited[index] = article_date
+                page_articles += int(saved)
+            return visited[index]
+        
+        # Listings are newest first: find the in-range slice with few fetches, then fetch only that
+        bounds = None
+        if (PREFILTER_CONFIG['enabled'] and candidates
+                and not self.page_inside_range(page_num, start_date_only, end_date_only)):
+            bounds = self.find_range_bounds(visit, len(candidates), start_date_only, end_date_only)
+        
+        if bounds is None:
+            lo, hi = 0, len(candidates)
+        else:
+            # A few articles past each boundary in case the listing is not strictly ordered
+            margin = PREFILTER_CONFIG['boundary_margin']
+            lo, hi = max(0, bounds[0] - margin), min(len(candidates), bounds[1] + margin)
+        
+        for index in range(lo, hi):
+            visit(index)
+        
+        if candidates and cards[0][0] == candidates[0] and visited.get(0):
+            self.page_dates.setdefault(page_num, visited[0])
         
-        print(f"Page {page_num}: {page_articles}/{len(article_links)} articles saved")
+        skipped = len(cards) - len(visited)
+        self.stats['skipped_before_fetch'] += skipped
+        print(f"Page {page_num}: {page_articles}/{len(cards)} articles saved, {skipped} skipped before download")
         
         return page_articles
     
     def save_article(self, article_data: dict, page_url: str = None, page_number: int = 0, raw_html: str = None):
-        """Save article to MySQL database with HTML content"""
+        """Save article to MySQL database with HTML content (spooled locally if MySQL is unavailable)"""
+        title = str(article_data.get('title', '')).encode('utf-8', errors='replace').decode('utf-8')
+        content = str(article_data.get('content', '')).encode('utf-8', errors='replace').decode('utf-8')
+        url = str(article_data.get('url', '')).encode('utf-8', errors='replace').decode('utf-8')
+        
+        row = {
+            'crawl_datetime': datetime.now().isoformat(),
+            'news_visible_datetime': article_data.get('published_time'),
+            'news_visible_title_subtitle': title,
+            'news_visible_body': content,
+            'news_url': url,
+            'news_sub_sitemap_link': page_url,
+            'page_number': page_number,
+            'raw_html': raw_html if raw_html else '',
+            'html_fetch_datetime': datetime.now().isoformat(),
+            'html_status': 'success' if raw_html else 'missing'
+        }
+        
+        if self.spool is not None and SPOOL_CONFIG['mode'] == 'always':
+            return self.spool.append('dunya', row)
+        
         conn = self.get_mysql_connection()
         if not conn:
-            return None
+            return self.spool.append('dunya', row) if self.spool is not None else None
             
         cursor = conn.cursor()
         
         try:
-            title = str(article_data.get('title', '')).encode('utf-8', errors='replace').decode('utf-8')
-            content = str(article_data.get('content', '')).encode('utf-8', errors='replace').decode('utf-8')
-            url = str(article_data.get('url', '')).encode('utf-8', errors='replace').decode('utf-8')
+            # Near-duplicate check against articles from both sources
+            fingerprint = compute_fingerprint(content) if DEDUP_CONFIG['enabled'] else None
+            canonical = find_near_duplicate(cursor, fingerprint, url) if fingerprint else None
+            if canonical:
+                self.log_sampled('near_duplicate', f"Near-duplicate of {canonical[0]} article {canonical[1]}: {url}", url=url)
+                if DEDUP_CONFIG['skip_duplicate_html']:
+                    row['html_status'] = 'duplicate'
+                    row['raw_html'] = ''
             
-            # Process HTML content
-            html_status = 'success' if raw_html else 'missing'
-            html_content = raw_html if raw_html else ''
-            
-            cursor.execute(f'''
-                INSERT IGNORE INTO {TABLE_NAMES['dunya_articles']} 
-                (crawl_datetime, news_visible_datetime, news_visible_title_subtitle, 
-                 news_visible_body, news_url, news_sub_sitemap_link, page_number,
-                 raw_html, html_fetch_datetime, html_status)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-            ''', (
-                datetime.now().isoformat(),
-                article_data.get('published_time'),
-                title,
-                content,
-                url,
-                page_url,
-                page_number,
-                html_content,
-                datetime.now().isoformat(),
-                html_status
-            ))
-            
-            conn.commit()
-            article_id = cursor.lastrowid
+            # Article row, fingerprint and rollup commit together, so a replay after a
+            # failure never finds the row already stored without its side entries
+            conn.start_transaction()
+            try:
+                cursor.execute(f'''
+                    INSERT IGNORE INTO {TABLE_NAMES['dunya_articles']} 
+                    ({', '.join(ARTICLE_COLUMNS)})
+                    VALUES ({', '.join(['%s'] * len(ARTICLE_COLUMNS))})
+                ''', tuple(row[column] for column in ARTICLE_COLUMNS))
+                
+                article_id = cursor.lastrowid
+                if article_id and fingerprint:
+                    register_fingerprint(cursor, 'dunya', article_id, url, fingerprint, canonical)
+                if article_id:
+                    record_daily_stats(cursor, 'dunya', [article_id])
+                
+                conn.commit()
+            except mysql.connector.Error:
+                conn.rollback()
+                raise
             
             return article_id
             
         except mysql.connector.Error as e:
+            if self.spool is not None:
+                self.log(f"MySQL error saving article, spooling locally: {e}")
+                return self.spool.append('dunya', row)
             self.log(f"MySQL error saving article: {e}")
             return None
         finally:
             conn.close()
     
+    def iter_sitemap_entries(self, sitemap_url: str):
+        """Parse <sitemap>/<url> entries from an XML sitemap incrementally"""
+        try:
+            # Same retries, breaker and size cap as page fetches, with a sitemap-sized limit
+            page = fetch_with_retry(self.session, sitemap_url, breakers=self.breakers, log=self.log,
+                                    latency=self.latency, timeout=15, headers=self.get_headers(),
+                                    max_bytes=FETCH_CONFIG['sitemap_max_body_bytes'],
+                                    allowed_types=FETCH_CONFIG['sitemap_content_types'], decode=False)
+            self.stats['successful_requests'] += 1
+        except Exception as e:
+            self.stats['failed_requests'] += 1
+            self.log(f"Sitemap request failed: {e}")
+            return
+        
+        stream = io.BytesIO(page.content)
+        try:
+            if sitemap_url.endswith('.gz') or page.content[:2] == b'\x1f\x8b':
+                stream = gzip.GzipFile(fileobj=stream)
+            
+            entry = {}
+            root = None
+            for event, elem in ET.iterparse(stream, events=('start', 'end')):
+                if root is None:
+                    root = elem
+                if event == 'start':
+                    continue
+                
+                tag = elem.tag.rsplit('}', 1)[-1]  # Drop the XML namespace
+                
+                if tag == 'loc':
+                    # First <loc> is the page; later ones belong to <image:image> etc.
+                    entry.setdefault('loc', (elem.text or '').strip())
+                elif tag == 'lastmod':
+                    entry['lastmod'] = (elem.text or '').strip()
+                elif tag == 'publication_date':
+                    entry['publication_date'] = (elem.text or '').strip()
+                elif tag in ('url', 'sitemap'):
+                    entry['type'] = tag
+                    yield entry
+                    entry = {}
+                    root.clear()  # Drop finished elements so memory stays bounded
+        except (ET.ParseError, OSError) as e:
+            self.log(f"Sitemap parse error in {sitemap_url}: {e}")
+        finally:
+            stream.close()
+    
+    def sitemap_may_overlap(self, entry: dict):
+        """Decide from URL/lastmod alone whether a sub-sitemap can hold in-range articles"""
+        start_date_only = self.stats['target_start_date'].date()
+        end_date_only = self.stats['target_end_date'].date()
+        loc = entry.get('loc', '')
+        
+        day_match = SITEMAP_DAY_RE.search(loc)
+        if day_match:
+            try:
+                day = datetime(*map(int, day_match.groups())).date()
+                return start_date_only <= day <= end_date_only
+            except ValueError:
+                pass
+        
+        month_match = SITEMAP_MONTH_RE.search(loc)
+        if month_match:
+            year, month = map(int, month_match.groups())
+            if 1 <= month <= 12:
+                month_start = datetime(year, month, 1).date()
+                next_month = datetime(year + month // 12, month % 12 + 1, 1).date()
+                return month_start <= end_date_only and next_month > start_date_only
+        
+        # Nothing in a sitemap last modified before the range can be in it
+        lastmod = self.parse_date(entry.get('lastmod'))
+        if lastmod and lastmod.date() < start_date_only:
+            return False
+        
+        return True
+    
+    def discover_sitemap_articles(self):
+        """Yield (article_url, published_date, sitemap_url) for the target range"""
+        start_date_only = self.stats['target_start_date'].date()
+        end_date_only = self.stats['target_end_date'].date()
+        
+        pending = [SITEMAP_INDEX_URL]
+        seen_sitemaps = set()
+        
+        while pending:
+            sitemap_url = pending.pop(0)
+            if sitemap_url in seen_sitemaps:
+                continue
+            seen_sitemaps.add(sitemap_url)
+            
+            self.log(f"Reading sitemap: {sitemap_url}")
+            for entry in self.iter_sitemap_entries(sitemap_url):
+                loc = entry.get('loc')
+                if not loc:
+                    continue
+                
+                if entry['type'] == 'sitemap':
+                    if self.sitemap_may_overlap(entry):
+                        pending.append(loc)
+                    continue
+                
+                if '/gundem/' not in loc or 'haberi-' not in loc:
+                    continue
+                
+                # Range filtering happens here - before any article fetch
+                published = self.parse_date(entry.get('publication_date') or entry.get('lastmod'))
+                if not published:
+                    continue
+                if start_date_only <= published.date() <= end_date_only:
+                    yield loc, published, sitemap_url
+    
+    def run_sitemap_crawler(self, start_date: str, end_date: str):
+        """Crawl a date range straight from the dated XML sitemaps (no search phase)"""
+        try:
+            self.stats['target_start_date'] = datetime.strptime(start_date, '%Y-%m-%d')
+            self.stats['target_end_date'] = datetime.strptime(end_date, '%Y-%m-%d')
+        except ValueError:
+            print("Invalid date format. Use YYYY-MM-DD")
+            return
+        
+        if self.stats['target_start_date'] > self.stats['target_end_date']:
+            print("Start date must not be after end date")
+            return
+        
+        print(f"Dunya Crawler MySQL (sitemap mode): {start_date} to {end_date}")
+        self.log(f"Sitemap discovery for date range: {start_date} to {end_date}")
+        self.stats['search_phase'] = "sitemap"
+        
+        total_articles = 0
+        found_articles = 0
+        batch_saved = 0
+        seen_urls = set()
+        
+        try:
+            for article_url, published, sitemap_url in self.discover_sitemap_articles():
+                if article_url in seen_urls:
+                    continue
+                seen_urls.add(article_url)
+                found_articles += 1
+                
+                article_response = self.make_request(article_url)
+                if not article_response:
+                    continue
+                
+                article_data, article_html = self.extract_with_render_fallback(article_url, article_response.text)
+                article_data['url'] = article_url
+                if not article_data.get('published_time'):
+                    article_data['published_time'] = published.isoformat()
+                
+                if self.save_article(article_data, sitemap_url, 0, article_html):
+                    total_articles += 1
+                    batch_saved += 1
+                
+                # Invalidate cached web pages once per batch rather than per article
+                if batch_saved >= 20:
+                    bump_data_version()
+                    batch_saved = 0
+                    self.log(f"Sitemap progress: {total_articles}/{found_articles} articles saved")
+            
+            if batch_saved:
+                bump_data_version()
+            
+            elapsed = datetime.now() - self.stats['start_time']
+            print(f"Crawling completed in {elapsed}")
+            print(f"Total articles saved: {total_articles}")
+            self.log(f"FINAL SUMMARY - Time: {elapsed}, Articles: {total_articles}/{found_articles}")
+            
+        except KeyboardInterrupt:
+            self.log("Stopped by user")
+        except Exception as e:
+            self.log(f"Error: {e}")
+        finally:
+            self.close_renderer()
+        
+        return total_articles
+    
+    def clone_for_partition(self, label: str):
+        """Worker crawler sharing logger, DB pool, breakers and latency stats, with its own session, hedger and page dates"""
+        worker = DunyaCrawlerMySQL.__new__(DunyaCrawlerMySQL)
+        worker.session = requests.Session()
+        worker.hedger = RequestHedger()
+        worker.db_pool = self.db_pool
+        worker.logger = self.logger
+        worker.sampler = self.sampler
+        worker.use_emojis = False
+        worker.breakers = self.breakers
+        worker.latency = self.latency
+        worker.renderer = None  # Playwright objects are bound to their thread
+        worker.log_prefix = f"[{label}] "
+        worker.save_range = self.save_range
+        worker.claimed_urls = self.claimed_urls
+        worker.page_dates = dict(self.page_dates)  # Snapshot of the search's probes; not shared between threads
+        worker.spool = self.spool
+        worker.stats = {
+            'current_page': 0,
+            'total_articles': 0,
+            'successful_requests': 0,
+            'failed_requests': 0,
+            'start_time': datetime.now(),
+            'search_pages': [],
+            'target_start_date': None,
+            'target_end_date': None,
+            'search_phase': "initializing",
+            'skipped_before_fetch': 0
+        }
+        return worker
+    
+    def page_date(self, page_num: int):
+        """Newest article date of a listing page, probed once and cached in page_dates"""
+        if page_num not in self.page_dates:
+            self.get_page_date_range(page_num)
+        return self.page_dates.get(page_num)
+    
+    def find_last_page(self, first_page: int, start_date_only, max_page: int = 1000):
+        """Last listing page whose newest article is not older than start_date_only
+        
+        Listings are newest first, so gallop forward from first_page and then
+        bisect. A page without a date counts as older, as in the serial walk.
+        """
+        def in_range(page_num):
+            page_date = self.page_date(page_num)
+            return page_date is not None and page_date >= start_date_only
+        
+        low, step = first_page, 1  # low is in range (or the first page, which is always crawled)
+        while True:
+            probe = min(low + step, max_page)
+            if probe == low or not in_range(probe):
+                high = probe
+                break
+            low = probe
+            step *= 2
+        
+        while high - low > 1:
+            middle = (low + high) // 2
+            if in_range(middle):
+                low = middle
+            else:
+                high = middle
+        return low
+    
+    def split_page_range(self, first_page: int, last_page: int, partitions: int):
+        """Split [first_page, last_page] into contiguous, disjoint page ranges"""
+        total_pages = last_page - first_page + 1
+        partitions = max(1, min(partitions, total_pages))
+        size = -(-total_pages // partitions)  # Ceiling division
+        return [(page, min(page + size - 1, last_page)) for page in range(first_page, last_page + 1, size)]
+    
+    def crawl_partition(self, first_page: int, last_page: int, progress: dict):
+        """Crawl one page range; the search already placed it inside the date range"""
+        label = f"pages {first_page}-{last_page}"
+        worker = self.clone_for_partition(label)
+        progress[label] = {'state': 'crawling', 'articles': 0}
+        
+        articles = 0
+        try:
+            for page_num in range(first_page, last_page + 1):
+                worker.stats['current_page'] = page_num
+                page_articles = worker.process_page_articles(page_num)
+                articles += page_articles
+                if page_articles:
+                    bump_data_version()  # Invalidate cached web pages
+                progress[label]['articles'] = articles
+        finally:
+            worker.close_renderer()
+        
+        progress[label].update(state='done', requests=worker.stats['successful_requests'])
+        return articles
+    
+    def run_partitioned_crawler(self, start_date: str, end_date: str, workers: int = 4, partitions: int = None):
+        """Backfill a long date range: locate its pages once, then crawl page ranges in parallel"""
+        try:
+            start = datetime.strptime(start_date, '%Y-%m-%d')
+            end = datetime.strptime(end_date, '%Y-%m-%d')
+        except ValueError:
+            print("Invalid date format. Use YYYY-MM-DD")
+            return
+        
+        if start > end:
+            print("Start date must not be after end date")
+            return
+        
+        progress = {}
+        total_articles = 0
+        
+        try:
+            # Save anything inside the overall range, whichever worker happens to fetch it
+            self.save_range = (start.date(), end.date())
+            self.claimed_urls = SharedUrlSet()  # Listings shift while crawling - fetch each article once
+            self.stats['target_start_date'] = start
+            self.stats['target_end_date'] = end
+            if self.db_pool is None:
+                self.enable_connection_pool(min(workers + 1, 32))
+            
+            # One serial search for both ends of the range; workers never search
+            first_page = self.smart_search_for_end_date()
+            last_page = self.find_last_page(first_page, start.date())
+            ranges = self.split_page_range(first_page, last_page, partitions or workers)
+            print(f"Dunya Crawler MySQL (partitioned): {start_date} to {end_date} is pages {first_page}-{last_page}, "
+                  f"{len(ranges)} page ranges on {workers} workers")
+            self.log(f"Page ranges: {', '.join(f'{a}-{b}' for a, b in ranges)}")
+            
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='partition') as pool:
+                futures = {pool.submit(self.crawl_partition, a, b, progress): f"pages {a}-{b}" for a, b in ranges}
+                for future in as_completed(futures):
+                    label = futures[future]
+                    try:
+                        articles = future.result()
+                        total_articles += articles
+                    except Exception as e:
+                        progress[label] = {'state': f'failed: {e}', 'articles': 0}
+                        self.log(f"Partition {label} failed: {e}")
+                        continue
+                    done = sum(1 for p in progress.values() if p['state'] == 'done')
+                    print(f"Partition {label}: {articles} articles ({done}/{len(ranges)} page ranges done)")
+            
+            elapsed = datetime.now() - self.stats['start_time']
+            print(f"Crawling completed in {elapsed}")
+            print(f"Total articles saved: {total_articles}")
+            self.log(f"FINAL SUMMARY - Time: {elapsed}, Articles: {total_articles}, Partitions: {progress}")
+            
+        except KeyboardInterrupt:
+            self.log("Stopped by user")
+        except Exception as e:
+            self.log(f"Error: {e}")
+        finally:
+            # The next run on this crawler (e.g. the scheduler's) starts unrestricted
+            self.save_range = None
+            self.claimed_urls = None
+            self.close_renderer()
+        
+        return total_articles
+    
     def run_smart_crawler(self, start_date: str, end_date: str):
         """Run smart date-based crawler"""
         # Parse dates
@@ -503,6 +1040,8 @@ class DunyaCrawlerMySQL:
         print(f"Dunya Crawler MySQL: {start_date} to {end_date}")
         self.log(f"Target date range: {start_date} to {end_date}")
         
+        total_articles = 0
+        
         try:
             # Phase 1: Smart search to find the page with our end date
             self.stats['search_phase'] = "searching"
@@ -516,7 +1055,7 @@ class DunyaCrawlerMySQL:
             else:
                 print("Could not find target page")
                 self.log("Could not find target page")
-                return
+                return total_articles
             
             # Phase 2: START SCRAPING IMMEDIATELY from the target page
             total_articles = self.scrape_from_target_page(end_page)
@@ -531,6 +1070,10 @@ class DunyaCrawlerMySQL:
             self.log("Stopped by user")
         except Exception as e:
             self.log(f"Error: {e}")
+        finally:
+            self.close_renderer()
+        
+        return total_articles
 
 def main():
     """
@@ -550,8 +1093,19 @@ def main():
     START_DATE = "2025-09-01"  # Older date (start of range)
     END_DATE = "2025-10-01"    # Newer date (end of range)
     
+    # Discovery mode: "pages" = search /gundem/N listing pages, "sitemap" = read dated XML sitemaps
+    DISCOVERY_MODE = "pages"
+    
+    # Parallel workers for long backfills (pages mode): 1 = classic serial crawl
+    WORKERS = 1
+    
     print(f"Starting Dunya crawler MySQL for date range: {START_DATE} to {END_DATE}")
-    crawler.run_smart_crawler(START_DATE, END_DATE)
+    if DISCOVERY_MODE == "sitemap":
+        crawler.run_sitemap_crawler(START_DATE, END_DATE)
+    elif WORKERS > 1:
+        crawler.run_partitioned_crawler(START_DATE, END_DATE, workers=WORKERS)
+    else:
+        crawler.run_smart_crawler(START_DATE, END_DATE)
 
 if __name__ == "__main__":
     main()
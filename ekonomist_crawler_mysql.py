@@ -2,6 +2,12 @@
 """
 Ekonomist.com.tr Crawler V2 - MySQL Version
 Matches database schema with Dunya crawler
+
+crawl_pages() walks one category's kategori-sayfa listing serially.
+crawl_categories() crawls several categories in parallel threads under one
+shared per-host request budget; an article listed in several categories is
+fetched once, and each category stops on its own limits (see
+EKONOMIST_CATEGORY_CONFIG).
 """
 
 import requests
@@ -12,10 +18,21 @@ import logging
 import re
 import json
 import mysql.connector
+import mysql.connector.pooling
 from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from bs4 import BeautifulSoup
 from urllib.parse import urljoin, urlparse
-from mysql_config import MYSQL_CONFIG, TABLE_NAMES
+from crawl_logging import setup_crawler_logging, LogSampler
+from mysql_config import (MYSQL_CONFIG, TABLE_NAMES, DEDUP_CONFIG, FETCH_CONFIG, RENDER_CONFIG, SPOOL_CONFIG,
+                          EKONOMIST_CATEGORY_CONFIG)
+from data_version import bump_data_version
+from article_spool import ARTICLE_COLUMNS, get_shared_spool
+from fetch_utils import HostBreakers, HostBudget, LatencyTracker, SharedUrlSet, fetch_with_retry
+from render_pool import BrowserRenderPool
+from daily_stats import setup_daily_stats_table, record_daily_stats
+from near_duplicates import (compute_fingerprint, find_near_duplicate,
+                             register_fingerprint, setup_fingerprint_tables)
 
 # User agents
 USER_AGENTS = [
@@ -27,12 +44,21 @@ USER_AGENTS = [
 class EkonomistCrawlerMySQL:
     def __init__(self):
         self.session = requests.Session()
+        self.db_pool = None  # Optional, see enable_connection_pool()
         self.base_url = "https://www.ekonomist.com.tr"
         self.api_url = "https://www.ekonomist.com.tr/kategori-sayfa"
         
         self.setup_logging()
+        self.breakers = HostBreakers(log=self.log)  # Per-host circuit breakers
+        self.latency = LatencyTracker()  # Per-host latencies for adaptive timeouts
+        self.renderer = None  # Headless browser pool, started on first use
+        self.host_budget = None  # HostBudget shared by category workers
+        self.claimed_urls = None  # SharedUrlSet when categories crawl in parallel
+        self.article_categories = {'dunya'}  # article paths (/<category>/...) kept from listings
         self.setup_database()
         self.setup_session()
+        # One spool and one replayer per process, however many crawlers it runs
+        self.spool = get_shared_spool(self.get_mysql_connection, log=self.log) if SPOOL_CONFIG['enabled'] else None
         
         # Stats
         self.stats = {
@@ -46,24 +72,9 @@ class EkonomistCrawlerMySQL:
         }
         
     def setup_logging(self):
-        """Setup proper logging with UTF-8 support"""
-        # Create logs directory
-        log_dir = "logs"
-        os.makedirs(log_dir, exist_ok=True)
-        
-        # Create log filename with timestamp
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        log_file = os.path.join(log_dir, f"ekonomist_mysql_{timestamp}.log")
-        
-        # Setup logging configuration with UTF-8 support
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s - %(levelname)s - %(message)s',
-            handlers=[
-                logging.FileHandler(log_file, encoding='utf-8'),
-                logging.StreamHandler()  # Console output
-            ]
-        )
+        """Setup queued logging: rotating JSON log file and console, written off the crawl thread"""
+        self.logger = setup_crawler_logging('ekonomist_crawler', 'ekonomist_mysql.log')
+        self.sampler = LogSampler()
         
         # Set console encoding to UTF-8 if possible
         import sys
@@ -74,20 +85,40 @@ class EkonomistCrawlerMySQL:
             except:
                 pass
         
-        self.logger = logging.getLogger(__name__)
         self.logger.info("Ekonomist Crawler MySQL initialized")
         
-    def log(self, message: str):
-        """Minimal log function"""
+    def log(self, message: str, **fields):
+        """Minimal log function; keyword fields become JSON attributes in the log file"""
+        message = message.encode('utf-8', errors='replace').decode('utf-8')
+        self.logger.info(message, extra=fields or None)
+        
+    def log_sampled(self, kind: str, message: str, **fields):
+        """Per-article detail line: every one at DEBUG level, otherwise sampled"""
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(message, extra=dict(fields, kind=kind))
+            return
+        occurrence = self.sampler.should_log(kind)
+        if occurrence:
+            self.logger.info(message, extra=dict(fields, kind=kind, occurrence=occurrence))
+    
+    def enable_connection_pool(self, pool_size: int = 2):
+        """Reuse MySQL connections across saves (used by long-running processes)"""
         try:
-            self.logger.info(message)
-        except UnicodeEncodeError:
-            safe_message = message.encode('utf-8', errors='replace').decode('utf-8')
-            self.logger.info(safe_message)
+            self.db_pool = mysql.connector.pooling.MySQLConnectionPool(
+                pool_name=f"ekonomist_{os.getpid()}_{id(self)}",
+                pool_size=pool_size,
+                **MYSQL_CONFIG
+            )
+        except mysql.connector.Error as e:
+            self.log(f"MySQL pool creation error: {e}")
+            self.db_pool = None
     
     def get_mysql_connection(self):
         """Get MySQL database connection"""
         try:
+            if self.db_pool is not None:
+                # close() on a pooled connection hands it back to the pool
+                return self.db_pool.get_connection()
             conn = mysql.connector.connect(**MYSQL_CONFIG)
             return conn
         except mysql.connector.Error as e:
@@ -134,6 +165,10 @@ class EkonomistCrawlerMySQL:
                 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
             ''')
             
+            # Near-duplicate fingerprint tables (shared by both crawlers)
+            setup_fingerprint_tables(cursor)
+            setup_daily_stats_table(cursor)
+            
             conn.commit()
             self.log("MySQL database tables initialized for Ekonomist crawler")
             
@@ -176,8 +211,10 @@ class EkonomistCrawlerMySQL:
             if random.random() < 0.3:
                 self.session.headers['user-agent'] = random.choice(USER_AGENTS)
             
-            response = self.session.get(url, timeout=timeout)
-            response.raise_for_status()
+            # Streamed, size-capped, decoded once and retried - see fetch_utils.py
+            # timeout is the fallback until the host's p99 latency is known
+            response = fetch_with_retry(self.session, url, breakers=self.breakers, log=self.log,
+                                        latency=self.latency, budget=self.host_budget, timeout=timeout)
             
             self.stats['successful_requests'] += 1
             return response
@@ -187,20 +224,23 @@ class EkonomistCrawlerMySQL:
             self.stats['failed_requests'] += 1
             return None
             
-    def fetch_page_articles(self, page_num: int):
-        """Fetch articles from a specific page using the API"""
+    def fetch_page_articles(self, page_num: int, category: str = 'dunya'):
+        """Fetch articles from a specific page of a category using the API"""
         params = {
-            'url': 'dunya',
+            'url': category,
             'page': str(page_num)
         }
         
-        self.log(f"Fetching page {page_num} from API...")
+        self.log(f"Fetching {category} page {page_num} from API...", category=category)
         
         # Make request with parameters
         try:
-            response = requests.get(self.api_url, headers=self.session.headers, 
-                                  cookies=self.session.cookies, params=params, timeout=15)
-            response.raise_for_status()
+            # The listing API answers with an HTML fragment, sometimes labelled as JSON/text
+            response = fetch_with_retry(self.session, self.api_url, breakers=self.breakers,
+                                        log=self.log, latency=self.latency, budget=self.host_budget,
+                                        timeout=15, params=params,
+                                        headers={'referer': f"{self.base_url}/{category}"},
+                                        allowed_types=FETCH_CONFIG['allowed_content_types'] + ('application/json', 'text/plain'))
             self.stats['successful_requests'] += 1
         except requests.RequestException as e:
             self.log(f"Request failed: {e}")
@@ -208,7 +248,7 @@ class EkonomistCrawlerMySQL:
             return []
         
         if not response.text:
-            self.log(f"Empty response from page {page_num}")
+            self.log(f"Empty response from {category} page {page_num}")
             return []
             
         # Parse HTML response
@@ -228,8 +268,9 @@ class EkonomistCrawlerMySQL:
                     
                 href = link['href']
                 
-                # Skip if not a dunya article
-                if not href.startswith('/dunya/'):
+                # Skip links outside the crawled categories (ads, other sections)
+                segments = href.split('/')
+                if len(segments) < 3 or segments[1] not in self.article_categories:
                     continue
                 
                 # Get title
@@ -250,13 +291,14 @@ class EkonomistCrawlerMySQL:
                     'image_url': image_url
                 })
                 
-                self.log(f"Found article: {title[:50]}... -> {href}")
+                self.log_sampled('found_article', f"Found article: {title[:50]}... -> {href}",
+                                 page=page_num, category=category)
                 
             except Exception as e:
                 self.log(f"Error parsing article div: {e}")
                 continue
                 
-        self.log(f"Page {page_num}: Found {len(articles)} articles")
+        self.log(f"{category} page {page_num}: Found {len(articles)} articles", category=category)
         return articles
         
     def extract_article_content(self, html_content: str):
@@ -358,9 +400,35 @@ class EkonomistCrawlerMySQL:
         
         return article_data
         
+    def extract_with_render_fallback(self, url: str, html_content: str):
+        """Extract content, re-rendering in a headless browser if the static HTML has none"""
+        article_data = self.extract_article_content(html_content)
+        if article_data['content'] != 'No content found' or not RENDER_CONFIG['enabled']:
+            return article_data, html_content
+        
+        if self.renderer is None:
+            self.renderer = BrowserRenderPool(log=self.log)
+        
+        rendered = self.renderer.render(url)
+        if not rendered:
+            return article_data, html_content
+        
+        rendered_data = self.extract_article_content(rendered.text)
+        if rendered_data['content'] == 'No content found':
+            return article_data, html_content
+        
+        self.log_sampled('rendered', f"Content recovered by rendering: {url[:80]}", url=url)
+        return rendered_data, rendered.text
+        
+    def close_renderer(self):
+        """Shut down the headless browser pool, if this crawler started one"""
+        if self.renderer is not None:
+            self.renderer.close()
+            self.renderer = None
+        
     def fetch_article_html(self, article_url: str):
         """Fetch the full HTML content of an article"""
-        self.log(f"Fetching article HTML: {article_url}")
+        self.log_sampled('fetch_article', f"Fetching article HTML: {article_url}")
         
         article_response = self.make_request(article_url, timeout=15)
         
@@ -369,45 +437,66 @@ class EkonomistCrawlerMySQL:
             
         return article_response.text, 'success'
         
-    def save_article(self, article_data: dict, page_num: int, raw_html: str = None, html_status: str = 'missing'):
-        """Save article to MySQL database - matching dunya_crawler schema"""
+    def save_article(self, article_data: dict, page_num: int, raw_html: str = None, html_status: str = 'missing',
+                     category: str = 'dunya'):
+        """Save article to MySQL database - matching dunya_crawler schema (spooled locally if MySQL is unavailable)"""
+        # Process data with UTF-8 encoding
+        title = article_data.get('title', '')
+        content = article_data.get('content', '')
+        url = article_data.get('url', '')
+        
+        row = {
+            'crawl_datetime': datetime.now().isoformat(),
+            'news_visible_datetime': article_data.get('published_time'),
+            'news_visible_title_subtitle': title,
+            'news_visible_body': content,
+            'news_url': url,
+            'news_sub_sitemap_link': f"{self.api_url}?url={category}&page={page_num}",  # sitemap link
+            'page_number': page_num,
+            'raw_html': raw_html if raw_html else '',
+            'html_fetch_datetime': datetime.now().isoformat(),
+            'html_status': html_status
+        }
+        
+        if self.spool is not None and SPOOL_CONFIG['mode'] == 'always':
+            return self.spool.append('ekonomist', row)
+        
         conn = self.get_mysql_connection()
         if not conn:
-            return None
+            return self.spool.append('ekonomist', row) if self.spool is not None else None
             
         cursor = conn.cursor()
         
         try:
-            # Process data with UTF-8 encoding
-            title = article_data.get('title', '')
-            content = article_data.get('content', '')
-            url = article_data.get('url', '')
-            published_time = article_data.get('published_time')
-            
-            # Process HTML content
-            html_content = raw_html if raw_html else ''
-            
-            cursor.execute(f'''
-                INSERT IGNORE INTO {TABLE_NAMES['ekonomist_articles']} 
-                (crawl_datetime, news_visible_datetime, news_visible_title_subtitle, 
-                 news_visible_body, news_url, news_sub_sitemap_link, page_number,
-                 raw_html, html_fetch_datetime, html_status)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-            ''', (
-                datetime.now().isoformat(),
-                published_time,
-                title,
-                content,
-                url,
-                f"{self.api_url}?url=dunya&page={page_num}",  # sitemap link
-                page_num,
-                html_content,
-                datetime.now().isoformat(),
-                html_status
-            ))
-            
-            conn.commit()
-            article_db_id = cursor.lastrowid
+            # Near-duplicate check against articles from both sources
+            fingerprint = compute_fingerprint(content) if DEDUP_CONFIG['enabled'] else None
+            canonical = find_near_duplicate(cursor, fingerprint, url) if fingerprint else None
+            if canonical:
+                self.log_sampled('near_duplicate', f"Near-duplicate of {canonical[0]} article {canonical[1]}: {url}", url=url)
+                if DEDUP_CONFIG['skip_duplicate_html']:
+                    row['html_status'] = 'duplicate'
+                    row['raw_html'] = ''
+            
+            # Article row, fingerprint and rollup commit together, so a replay after a
+            # failure never finds the row already stored without its side entries
+            conn.start_transaction()
+            try:
+                cursor.execute(f'''
+                    INSERT IGNORE INTO {TABLE_NAMES['ekonomist_articles']} 
+                    ({', '.join(ARTICLE_COLUMNS)})
+                    VALUES ({', '.join(['%s'] * len(ARTICLE_COLUMNS))})
+                ''', tuple(row[column] for column in ARTICLE_COLUMNS))
+                
+                article_db_id = cursor.lastrowid
+                if article_db_id and fingerprint:
+                    register_fingerprint(cursor, 'ekonomist', article_db_id, url, fingerprint, canonical)
+                if article_db_id:
+                    record_daily_stats(cursor, 'ekonomist', [article_db_id])
+                
+                conn.commit()
+            except mysql.connector.Error:
+                conn.rollback()
+                raise
             
             # Check if article was actually inserted (not ignored due to duplicate)
             if article_db_id == 0:
@@ -415,7 +504,7 @@ class EkonomistCrawlerMySQL:
                 cursor.execute(f'SELECT id FROM {TABLE_NAMES["ekonomist_articles"]} WHERE news_url = %s', (url,))
                 existing = cursor.fetchone()
                 if existing:
-                    self.log(f"Duplicate article skipped: {url}")
+                    self.log_sampled('duplicate', f"Duplicate article skipped: {url}", url=url)
                     return existing[0]  # Return existing ID
                 else:
                     self.log(f"Article insert failed for unknown reason: {url}")
@@ -424,12 +513,16 @@ class EkonomistCrawlerMySQL:
             return article_db_id
             
         except mysql.connector.Error as e:
+            if self.spool is not None:
+                self.log(f"MySQL error saving article {url}, spooling locally: {e}")
+                return self.spool.append('ekonomist', row)
             self.log(f"MySQL error saving article {url}: {e}")
             return None
         finally:
             conn.close()
             
-    def save_page_info(self, page_num: int, articles_found: int, articles_processed: int, status: str = 'completed'):
+    def save_page_info(self, page_num: int, articles_found: int, articles_processed: int, status: str = 'completed',
+                       category: str = 'dunya'):
         """Save page processing info"""
         conn = self.get_mysql_connection()
         if not conn:
@@ -444,7 +537,7 @@ class EkonomistCrawlerMySQL:
                 VALUES (%s, %s, %s, %s, %s, %s)
             ''', (
                 page_num,
-                f"{self.api_url}?url=dunya&page={page_num}",
+                f"{self.api_url}?url={category}&page={page_num}",
                 articles_found,
                 articles_processed,
                 datetime.now().isoformat(),
@@ -458,47 +551,62 @@ class EkonomistCrawlerMySQL:
         finally:
             conn.close()
             
-    def process_page(self, page_num: int):
-        """Process a single page - fetch articles and their HTML content"""
-        self.stats['current_page'] = page_num
-        # Fetch articles from the page
-        articles = self.fetch_page_articles(page_num)
-        
-        if not articles:
-            self.save_page_info(page_num, 0, 0, 'no_articles')
-            return 0
-            
-        # Process each article
+    def process_articles(self, articles: list, page_num: int, category: str = 'dunya'):
+        """Fetch, extract and save listed articles; returns how many were saved"""
         processed_count = 0
         
         for i, article in enumerate(articles, 1):
-            
+        
             # Fetch article HTML
             html_content, html_status = self.fetch_article_html(article['url'])
-            
+        
+            # Parallel categories: hand a failed article back so another listing of it (or the next run) retries
+            if not html_content and self.claimed_urls is not None:
+                self.claimed_urls.release(article['url'])
+                continue
+        
             # Extract article content from HTML
             if html_content:
-                article_content = self.extract_article_content(html_content)
+                article_content, html_content = self.extract_with_render_fallback(article['url'], html_content)
                 article.update(article_content)
-            
+        
             # Save article to database
-            article_id = self.save_article(article, page_num, html_content, html_status)
-            
+            article_id = self.save_article(article, page_num, html_content, html_status, category)
+        
             if article_id:
                 processed_count += 1
                 self.stats['total_articles'] += 1
-                
+        
                 if html_status == 'success':
                     self.stats['articles_with_html'] += 1
                 else:
                     self.stats['articles_without_html'] += 1
-                    
+        
                 pass
             else:
                 self.log(f"Failed to save article {i}")
-                
+                if self.claimed_urls is not None:
+                    self.claimed_urls.release(article['url'])
+        
+        return processed_count
+        
+    def process_page(self, page_num: int, category: str = 'dunya'):
+        """Process a single page - fetch articles and their HTML content"""
+        self.stats['current_page'] = page_num
+        # Fetch articles from the page
+        articles = self.fetch_page_articles(page_num, category)
+        
+        if not articles:
+            self.save_page_info(page_num, 0, 0, 'no_articles', category)
+            return 0
+        
+        # Process each article
+        processed_count = self.process_articles(articles, page_num, category)
+        
         # Save page info
-        self.save_page_info(page_num, len(articles), processed_count, 'completed')
+        self.save_page_info(page_num, len(articles), processed_count, 'completed', category)
+        if processed_count:
+            bump_data_version()  # Invalidate cached web pages
         
         print(f"Page {page_num}: {processed_count}/{len(articles)} articles saved")
         return processed_count
@@ -523,6 +631,8 @@ class EkonomistCrawlerMySQL:
             self.log("Crawler interrupted by user")
         except Exception as e:
             self.log(f"Unexpected error: {e}")
+        finally:
+            self.close_renderer()
             
         # Final summary
         elapsed = datetime.now() - self.stats['start_time']
@@ -531,6 +641,172 @@ class EkonomistCrawlerMySQL:
         self.log(f"FINAL SUMMARY - Time: {elapsed}, Articles: {total_processed}")
         
         return total_processed
+        
+    def stored_urls(self, urls: list):
+        """Subset of urls already in the article table"""
+        if not urls:
+            return set()
+        conn = self.get_mysql_connection()
+        if not conn:
+            return set()
+        
+        cursor = conn.cursor()
+        
+        try:
+            cursor.execute(f'''
+                SELECT news_url FROM {TABLE_NAMES['ekonomist_articles']}
+                WHERE news_url IN ({', '.join(['%s'] * len(urls))})
+            ''', tuple(urls))
+            return {row[0] for row in cursor.fetchall()}
+        except mysql.connector.Error as e:
+            self.log(f"Error checking stored articles: {e}")
+            return set()
+        finally:
+            conn.close()
+        
+    def filter_new_articles(self, articles: list):
+        """Drop articles another category already took in this run or an earlier run stored"""
+        if self.claimed_urls is not None:
+            articles = [article for article in articles if self.claimed_urls.claim(article['url'])]
+        known = self.stored_urls([article['url'] for article in articles])
+        return [article for article in articles if article['url'] not in known]
+        
+    def clone_for_category(self, category: str):
+        """Worker crawler sharing logger, DB pool, breakers, host budget and claimed URLs, with its own session"""
+        worker = EkonomistCrawlerMySQL.__new__(EkonomistCrawlerMySQL)
+        worker.session = requests.Session()
+        worker.db_pool = self.db_pool
+        worker.base_url = self.base_url
+        worker.api_url = self.api_url
+        worker.logger = self.logger
+        worker.sampler = self.sampler
+        worker.breakers = self.breakers
+        worker.latency = self.latency
+        worker.renderer = None  # Playwright objects are bound to their thread
+        worker.host_budget = self.host_budget
+        worker.claimed_urls = self.claimed_urls
+        worker.article_categories = self.article_categories
+        worker.spool = self.spool
+        worker.stats = {
+            'current_page': 0,
+            'total_articles': 0,
+            'successful_requests': 0,
+            'failed_requests': 0,
+            'start_time': datetime.now(),
+            'articles_with_html': 0,
+            'articles_without_html': 0
+        }
+        worker.setup_session()
+        return worker
+        
+    def category_limits(self, category: str, max_pages: int = None):
+        """Stop conditions for one category: defaults, then per-category overrides"""
+        config = EKONOMIST_CATEGORY_CONFIG
+        limits = {
+            'start_page': 1,
+            'max_pages': config['max_pages'],
+            'stop_after_empty_pages': config['stop_after_empty_pages'],
+            'stop_after_known_pages': config['stop_after_known_pages']
+        }
+        limits.update(config['overrides'].get(category, {}))
+        if max_pages is not None:
+            limits['max_pages'] = max_pages
+        return limits
+        
+    def crawl_category(self, category: str, limits: dict, progress: dict):
+        """Crawl one category's listing pages until one of its stop conditions is met"""
+        worker = self.clone_for_category(category)
+        progress[category] = {'state': 'crawling', 'pages': 0, 'articles': 0, 'skipped': 0}
+        empty_pages = 0
+        known_pages = 0
+        stopped = 'max_pages'
+        
+        try:
+            for page_num in range(limits['start_page'], limits['start_page'] + limits['max_pages']):
+                worker.stats['current_page'] = page_num
+                articles = worker.fetch_page_articles(page_num, category)
+                progress[category]['pages'] += 1
+            
+                if not articles:
+                    if page_num == limits['start_page']:
+                        worker.log(f"Category {category}: first listing page is empty - check the slug",
+                                   category=category)
+                    worker.save_page_info(page_num, 0, 0, 'no_articles', category)
+                    empty_pages += 1
+                    if empty_pages >= limits['stop_after_empty_pages']:
+                        stopped = 'empty_pages'
+                        break
+                    continue
+                empty_pages = 0
+            
+                # Listed in another category this run, or stored by an earlier run
+                new_articles = worker.filter_new_articles(articles)
+                progress[category]['skipped'] += len(articles) - len(new_articles)
+                if not new_articles:
+                    worker.save_page_info(page_num, len(articles), 0, 'known', category)
+                    known_pages += 1
+                    if limits['stop_after_known_pages'] and known_pages >= limits['stop_after_known_pages']:
+                        stopped = 'caught_up'
+                        break
+                    continue
+                known_pages = 0
+            
+                processed = worker.process_articles(new_articles, page_num, category)
+                worker.save_page_info(page_num, len(articles), processed, 'completed', category)
+                if processed:
+                    bump_data_version()  # Invalidate cached web pages
+                progress[category]['articles'] += processed
+                print(f"{category} page {page_num}: {processed}/{len(articles)} articles saved "
+                      f"({len(articles) - len(new_articles)} already taken)")
+        finally:
+            worker.close_renderer()
+        
+        progress[category].update(state=f'done ({stopped})', requests=worker.stats['successful_requests'])
+        worker.log(f"Category {category} stopped: {stopped}", category=category, pages=progress[category]['pages'],
+                   articles=progress[category]['articles'], skipped=progress[category]['skipped'])
+        return progress[category]['articles']
+        
+    def crawl_categories(self, categories: list = None, workers: int = None, max_pages: int = None):
+        """Crawl several listing categories in parallel under one per-host request budget"""
+        categories = list(categories or EKONOMIST_CATEGORY_CONFIG['categories'])
+        workers = max(1, min(workers or EKONOMIST_CATEGORY_CONFIG['workers'], len(categories)))
+        
+        # Fresh shared state per run; the budget covers listing API and article requests alike
+        self.host_budget = HostBudget()
+        self.claimed_urls = SharedUrlSet()
+        self.article_categories = set(categories)
+        if self.db_pool is None or self.db_pool.pool_size < workers + 1:
+            self.enable_connection_pool(min(workers + 1, 32))
+        
+        print(f"Ekonomist Crawler MySQL (categories): {', '.join(categories)} on {workers} workers")
+        self.log(f"Categories: {', '.join(categories)}, workers: {workers}")
+        
+        progress = {}
+        total_articles = 0
+        try:
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='category') as pool:
+                futures = {pool.submit(self.crawl_category, category, self.category_limits(category, max_pages),
+                                       progress): category for category in categories}
+                for future in as_completed(futures):
+                    category = futures[future]
+                    try:
+                        articles = future.result()
+                        total_articles += articles
+                    except Exception as e:
+                        progress[category] = {'state': f'failed: {e}', 'articles': 0}
+                        self.log(f"Category {category} failed: {e}")
+                        continue
+                    print(f"Category {category}: {articles} articles, {progress[category]['state']}")
+        finally:
+            self.host_budget = None
+            self.claimed_urls = None
+            self.article_categories = {'dunya'}
+        
+        elapsed = datetime.now() - self.stats['start_time']
+        print(f"Crawling completed in {elapsed}")
+        print(f"Total articles saved: {total_articles}")
+        self.log(f"FINAL SUMMARY - Time: {elapsed}, Articles: {total_articles}, Categories: {progress}")
+        return total_articles
 
 def main():
     """
@@ -543,6 +819,7 @@ def main():
     - crawler.crawl_pages(start_page=1, max_pages=5)   # Pages 1-5
     - crawler.crawl_pages(start_page=10, max_pages=3)  # Pages 10-12
     - crawler.crawl_pages(start_page=1, max_pages=50)  # Pages 1-50
+    - crawler.crawl_categories(['dunya', 'finans'])     # Categories in parallel
     """
     # Create crawler
     crawler = EkonomistCrawlerMySQL()
@@ -551,6 +828,14 @@ def main():
     START_PAGE = 1      # Change this to start from a different page
     MAX_PAGES = 50       # Change this to crawl more/fewer pages
     
+    # Parallel multi-category crawl: None = the 'dunya' category serially (pages above),
+    # or a list of categories, e.g. EKONOMIST_CATEGORY_CONFIG['categories']
+    CATEGORIES = None
+    
+    if CATEGORIES:
+        crawler.crawl_categories(CATEGORIES)
+        return
+    
     print(f"Starting Ekonomist crawler MySQL: pages {START_PAGE} to {START_PAGE + MAX_PAGES - 1}")
     crawler.crawl_pages(start_page=START_PAGE, max_pages=MAX_PAGES)
 
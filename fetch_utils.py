@@ -0,0 +1,462 @@
+#!/usr/bin/env python3
+"""
+Shared HTTP fetch layer for the crawlers
+
+Responses are streamed with a hard size cap and rejected early when the
+Content-Type is not HTML/XML. The body is decoded exactly once into a
+FetchedPage whose .text is reused for both parsing and storage, so a page
+is never held as bytes, decoded text and a second decoded copy at once.
+
+fetch_with_retry() adds jittered exponential backoff for transient errors
+and a per-host circuit breaker that pauses crawling during an outage. With a
+LatencyTracker it also derives per-host timeouts from observed p99 latency
+and can hedge latency-critical requests with a second attempt after p95.
+A HostBudget shared by parallel workers caps the requests in flight and the
+request rate per host across all of them.
+"""
+
+import re
+import time
+import random
+import threading
+import requests
+from collections import deque
+from contextlib import contextmanager, nullcontext
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from urllib.parse import urlparse
+from mysql_config import FETCH_CONFIG, RETRY_CONFIG, LATENCY_CONFIG
+
+CHARSET_RE = re.compile(rb'<meta[^>]+charset=["\']?([\w-]+)', re.IGNORECASE)
+
+
+class FetchError(requests.RequestException):
+    """Base class for fetch-layer rejections (caught like any request failure)"""
+
+
+class BodyTooLarge(FetchError):
+    """Response body exceeded FETCH_CONFIG['max_body_bytes']"""
+
+
+class UnexpectedContentType(FetchError):
+    """Response was not HTML/XML"""
+
+
+class FetchCancelled(FetchError):
+    """A hedged attempt stopped because the other attempt already answered"""
+
+
+class CircuitOpenError(FetchError):
+    """Host circuit stayed open for longer than the caller was willing to wait"""
+
+
+class FetchedPage:
+    """Decoded page - drop-in for the parts of requests.Response the crawlers use"""
+
+    __slots__ = ('url', 'status_code', 'headers', 'content_type', 'encoding', 'text', 'content')
+
+    def __init__(self, url, status_code, headers, content_type, encoding, text, content=None):
+        self.url = url
+        self.status_code = status_code
+        self.headers = headers
+        self.content_type = content_type
+        self.encoding = encoding
+        self.text = text
+        self.content = content  # Raw body, only kept when fetched with decode=False
+
+
+def _detect_encoding(response, body: bytes):
+    """Charset from the Content-Type header, then <meta charset>, then UTF-8"""
+    content_type = response.headers.get('Content-Type', '')
+    if 'charset=' in content_type.lower():
+        return content_type.lower().split('charset=', 1)[1].split(';')[0].strip().strip('"\'') or 'utf-8'
+
+    match = CHARSET_RE.search(body[:4096])
+    if match:
+        return match.group(1).decode('ascii', errors='ignore') or 'utf-8'
+    return 'utf-8'
+
+
+def fetch_page(session, url: str, timeout=10, headers: dict = None, params: dict = None,
+               max_bytes: int = None, allowed_types=None, cancel: threading.Event = None,
+               decode: bool = True):
+    """Stream a page into memory with a size cap; raises FetchError subclasses on rejection
+
+    decode=False keeps the body as bytes in .content (e.g. gzipped sitemaps).
+    """
+    max_bytes = max_bytes or FETCH_CONFIG['max_body_bytes']
+    allowed_types = allowed_types or FETCH_CONFIG['allowed_content_types']
+
+    with session.get(url, headers=headers, params=params, timeout=timeout, stream=True) as response:
+        response.raise_for_status()
+
+        # Reject before downloading anything we would not parse
+        content_type = response.headers.get('Content-Type', '').split(';')[0].strip().lower()
+        if content_type and content_type not in allowed_types:
+            raise UnexpectedContentType(f"Unexpected content type {content_type} for {url}")
+
+        declared = response.headers.get('Content-Length')
+        if declared and declared.isdigit() and int(declared) > max_bytes:
+            raise BodyTooLarge(f"Body of {declared} bytes exceeds limit for {url}")
+
+        body = bytearray()
+        for chunk in response.iter_content(chunk_size=FETCH_CONFIG['chunk_size']):
+            if cancel is not None and cancel.is_set():
+                raise FetchCancelled(f"Attempt abandoned for {url}")
+            body += chunk
+            if len(body) > max_bytes:
+                raise BodyTooLarge(f"Body exceeds {max_bytes} bytes for {url}")
+
+        if not decode:
+            return FetchedPage(response.url, response.status_code, response.headers,
+                               content_type, None, None, bytes(body))
+
+        encoding = _detect_encoding(response, body)
+        try:
+            text = body.decode(encoding, errors='replace')
+        except LookupError:
+            encoding = 'utf-8'
+            text = body.decode(encoding, errors='replace')
+        del body  # Only the decoded text is kept from here on
+
+        return FetchedPage(response.url, response.status_code, response.headers,
+                           content_type, encoding, text)
+
+
+# HTTP statuses worth retrying - everything else in 4xx is a permanent answer
+RETRYABLE_STATUS = {408, 425, 429, 500, 502, 503, 504}
+
+
+def is_retryable(error: Exception):
+    """Transient network/server errors are retried; rejections and 4xx are not"""
+    if isinstance(error, FetchError):
+        return False
+    if isinstance(error, requests.HTTPError):
+        return error.response is not None and error.response.status_code in RETRYABLE_STATUS
+    return isinstance(error, (requests.ConnectionError, requests.Timeout,
+                              requests.exceptions.ChunkedEncodingError))
+
+
+def _retry_after(error: Exception):
+    """Seconds requested by a Retry-After header, if any"""
+    response = getattr(error, 'response', None)
+    if response is None:
+        return None
+    value = response.headers.get('Retry-After', '')
+    return float(value) if value.isdigit() else None
+
+
+def backoff_delay(attempt: int, retry_after: float = None):
+    """Full-jitter exponential backoff, capped at RETRY_CONFIG['backoff_max']"""
+    ceiling = min(RETRY_CONFIG['backoff_max'], RETRY_CONFIG['backoff_base'] * (2 ** attempt))
+    delay = random.uniform(0, ceiling)
+    if retry_after is not None:
+        delay = max(delay, min(retry_after, RETRY_CONFIG['backoff_max']))
+    return delay
+
+
+class CircuitBreaker:
+    """Per-host breaker: opens after consecutive failures, then lets one probe through"""
+
+    def __init__(self, host: str, log=print):
+        self.host = host
+        self.log = log
+        self.failure_threshold = RETRY_CONFIG['breaker_failure_threshold']
+        self.cooldown = RETRY_CONFIG['breaker_cooldown_seconds']
+        self.lock = threading.Lock()
+        self.changed = threading.Condition(self.lock)  # Wakes callers held behind a probe
+        self.failures = 0
+        self.state = 'closed'
+        self.open_until = 0.0
+        self.current_cooldown = self.cooldown
+        self.probe_started = None  # Half-open: when the single probe went out (None = no probe in flight)
+
+    def wait_until_allowed(self, max_wait: float = None):
+        """Block while the circuit is open or another caller's probe is in flight - this is what pauses the crawl"""
+        deadline = None if max_wait is None else time.monotonic() + max_wait
+        with self.changed:
+            while True:
+                now = time.monotonic()
+                if self.state == 'closed':
+                    return
+                if self.state == 'open':
+                    remaining = self.open_until - now
+                    if remaining <= 0:
+                        # Cooldown over: half-open, this caller is the one probe
+                        self.state = 'half-open'
+                        self.probe_started = now
+                        return
+                elif self.probe_started is None or now - self.probe_started >= self.cooldown:
+                    # The last probe ended without a verdict, or never reported back
+                    self.probe_started = now
+                    return
+                else:
+                    remaining = self.probe_started + self.cooldown - now
+                if deadline is not None and now + remaining > deadline:
+                    raise CircuitOpenError(f"Circuit for {self.host} is open")
+                if self.state == 'open':
+                    self.log(f"Circuit open for {self.host} - pausing {remaining:.0f}s")
+                self.changed.wait(remaining)
+
+    def record_success(self):
+        with self.changed:
+            if self.state != 'closed':
+                self.log(f"Circuit for {self.host} closed again")
+            self.failures = 0
+            self.state = 'closed'
+            self.current_cooldown = self.cooldown
+            self.probe_started = None
+            self.changed.notify_all()
+
+    def record_failure(self):
+        with self.changed:
+            self.failures += 1
+            if self.state == 'half-open':
+                # Probe failed - stay open longer each time
+                self.current_cooldown = min(self.current_cooldown * 2, RETRY_CONFIG['breaker_max_cooldown_seconds'])
+            elif self.failures < self.failure_threshold:
+                return
+            self.state = 'open'
+            self.open_until = time.monotonic() + self.current_cooldown
+            self.probe_started = None
+            self.changed.notify_all()
+            self.log(f"Circuit opened for {self.host} after {self.failures} failures "
+                     f"({self.current_cooldown:.0f}s cooldown)")
+
+    def release_probe(self):
+        """The probe ended with an error that says nothing about the host - let the next caller probe"""
+        with self.changed:
+            if self.state == 'half-open':
+                self.probe_started = None
+                self.changed.notify()
+
+
+class HostBreakers:
+    """Circuit breakers keyed by host"""
+
+    def __init__(self, log=print):
+        self.log = log
+        self.lock = threading.Lock()
+        self.breakers = {}
+
+    def get(self, url: str):
+        host = urlparse(url).netloc
+        with self.lock:
+            if host not in self.breakers:
+                self.breakers[host] = CircuitBreaker(host, self.log)
+            return self.breakers[host]
+
+
+class HostBudget:
+    """Per-host request budget shared by parallel workers"""
+
+    def __init__(self, concurrency: int = None, min_interval: float = None):
+        self.concurrency = concurrency or FETCH_CONFIG['host_concurrency']
+        self.min_interval = FETCH_CONFIG['host_min_interval_seconds'] if min_interval is None else min_interval
+        self.lock = threading.Lock()
+        self.hosts = {}  # host -> [semaphore, monotonic time the next request may start]
+
+    @contextmanager
+    def slot(self, url: str):
+        """Hold one of the host's concurrent slots, spaced min_interval after the previous start"""
+        host = urlparse(url).netloc
+        with self.lock:
+            if host not in self.hosts:
+                self.hosts[host] = [threading.BoundedSemaphore(self.concurrency), 0.0]
+            state = self.hosts[host]
+
+        state[0].acquire()
+        try:
+            with self.lock:
+                now = time.monotonic()
+                start = max(now, state[1])
+                state[1] = start + self.min_interval
+            if start > now:
+                time.sleep(start - now)
+            yield
+        finally:
+            state[0].release()
+
+
+class SharedUrlSet:
+    """Thread-safe set of article URLs already taken by a parallel worker"""
+
+    def __init__(self):
+        self.urls = set()
+        self.lock = threading.Lock()
+
+    def claim(self, url: str):
+        """True if the caller is the first to claim the URL"""
+        with self.lock:
+            if url in self.urls:
+                return False
+            self.urls.add(url)
+            return True
+
+    def release(self, url: str):
+        """Give a claimed URL back after a failed fetch or save, so another worker may retry it"""
+        with self.lock:
+            self.urls.discard(url)
+
+    def is_claimed(self, url: str):
+        with self.lock:
+            return url in self.urls
+
+
+class LatencyTracker:
+    """Sliding window of successful response times per host"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.samples = {}
+
+    def record(self, url: str, seconds: float):
+        host = urlparse(url).netloc
+        with self.lock:
+            if host not in self.samples:
+                self.samples[host] = deque(maxlen=LATENCY_CONFIG['window'])
+            self.samples[host].append(seconds)
+
+    def percentile(self, url: str, pct: float):
+        """Observed latency percentile for the URL's host, None until enough samples"""
+        host = urlparse(url).netloc
+        with self.lock:
+            window = self.samples.get(host)
+            if not window or len(window) < LATENCY_CONFIG['min_samples']:
+                return None
+            ordered = sorted(window)
+        index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+        return ordered[index]
+
+    def timeout_for(self, url: str, default: float):
+        """p99-based timeout, clamped; the static default until the host is measured"""
+        p99 = self.percentile(url, 99)
+        if p99 is None:
+            return default
+        timeout = p99 * LATENCY_CONFIG['timeout_multiplier']
+        return max(LATENCY_CONFIG['min_timeout'], min(LATENCY_CONFIG['max_timeout'], timeout))
+
+    def hedge_delay(self, url: str):
+        """How long to wait before firing a hedge (None = not enough data to hedge)"""
+        p95 = self.percentile(url, LATENCY_CONFIG['hedge_percentile'])
+        if p95 is None:
+            return None
+        return max(LATENCY_CONFIG['min_hedge_delay'], p95)
+
+
+def timed_fetch(session, url: str, latency: LatencyTracker = None, **fetch_kwargs):
+    """fetch_page() that reports successful latencies to the tracker"""
+    started = time.monotonic()
+    page = fetch_page(session, url, **fetch_kwargs)
+    if latency is not None:
+        latency.record(url, time.monotonic() - started)
+    return page
+
+
+class RequestHedger:
+    """Per-crawler thread pool for hedged attempts
+
+    Each pool thread fetches on its own requests.Session, so an attempt that
+    loses the race never shares a session with the crawler's next request.
+    """
+
+    def __init__(self, pool_size: int = None, session_factory=requests.Session):
+        self.pool = ThreadPoolExecutor(max_workers=pool_size or LATENCY_CONFIG['hedge_pool_size'],
+                                       thread_name_prefix='hedge')
+        self.local = threading.local()
+        self.session_factory = session_factory
+
+    def _session(self, template):
+        session = getattr(self.local, 'session', None)
+        if session is None:
+            session = self.local.session = self.session_factory()
+        session.headers.update(template.headers)
+        session.cookies.update(template.cookies)
+        return session
+
+    def _attempt(self, template, url, latency, budget, cancel, fetch_kwargs):
+        with budget.slot(url) if budget else nullcontext():
+            if cancel.is_set():
+                raise FetchCancelled(f"Attempt abandoned for {url}")
+            return timed_fetch(self._session(template), url, latency, cancel=cancel, **fetch_kwargs)
+
+    def submit(self, template, url, latency, budget, cancel, fetch_kwargs):
+        return self.pool.submit(self._attempt, template, url, latency, budget, cancel, fetch_kwargs)
+
+
+def hedged_fetch(hedger: RequestHedger, session, url: str, latency: LatencyTracker, log=print,
+                 budget: HostBudget = None, **fetch_kwargs):
+    """Send a second attempt after the host's p95 delay and return whichever answers first
+
+    Both attempts hold their own HostBudget slot. Once one answers, the other
+    is cancelled at its next body chunk (or by its timeout).
+    """
+    delay = latency.hedge_delay(url)
+    if delay is None:
+        with budget.slot(url) if budget else nullcontext():
+            return timed_fetch(session, url, latency, **fetch_kwargs)
+
+    cancel = threading.Event()
+    try:
+        first = hedger.submit(session, url, latency, budget, cancel, fetch_kwargs)
+        done, _ = wait([first], timeout=delay)
+        if done:
+            return first.result()
+
+        log(f"Hedging slow request after {delay:.2f}s: {url[:80]}")
+        second = hedger.submit(session, url, latency, budget, cancel, fetch_kwargs)
+
+        pending = {first, second}
+        errors = []
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    return future.result()
+                errors.append(future.exception())
+        raise errors[0]
+    finally:
+        cancel.set()
+
+
+def fetch_with_retry(session, url: str, breakers: HostBreakers = None, max_retries: int = None,
+                     log=print, latency: LatencyTracker = None, hedger: RequestHedger = None,
+                     budget: HostBudget = None, **fetch_kwargs):
+    """fetch_page() with retries, a per-host circuit breaker, adaptive timeouts and optional hedging
+
+    With a budget each attempt holds a host slot; backoff sleeps do not.
+    """
+    if max_retries is None:
+        max_retries = RETRY_CONFIG['max_retries']
+    breaker = breakers.get(url) if breakers else None
+
+    if latency is not None:
+        fetch_kwargs['timeout'] = latency.timeout_for(url, fetch_kwargs.get('timeout', 10))
+    hedge = (hedger is not None and latency is not None and LATENCY_CONFIG['hedging_enabled'])
+
+    attempt = 0
+    while True:
+        if breaker:
+            breaker.wait_until_allowed()
+        try:
+            if hedge:
+                page = hedged_fetch(hedger, session, url, latency, log, budget, **fetch_kwargs)
+            else:
+                with budget.slot(url) if budget else nullcontext():
+                    page = timed_fetch(session, url, latency, **fetch_kwargs)
+        except Exception as e:
+            retryable = is_retryable(e)
+            if breaker and retryable:
+                breaker.record_failure()
+            elif breaker:
+                breaker.release_probe()
+            if not retryable or attempt >= max_retries:
+                raise
+            delay = backoff_delay(attempt, _retry_after(e))
+            log(f"Retrying {url} in {delay:.1f}s after {type(e).__name__} (attempt {attempt + 1}/{max_retries})")
+            time.sleep(delay)
+            attempt += 1
+            continue
+
+        if breaker:
+            breaker.record_success()
+        return page
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Gunicorn configuration for the News Crawler Web Application
+
+Usage:
+    gunicorn -c gunicorn_config.py app:app
+    (run_web.py does the same thing programmatically)
+
+SIGHUP re-forks the workers from the master's preloaded app, so it does not
+pick up new code - deploy with a full restart (systemctl restart).
+Every value can be overridden with an environment variable, e.g.
+WEB_WORKERS=3 WEB_THREADS=8 python3 run_web.py
+"""
+
+import os
+import multiprocessing
+from mysql_config import WEB_SERVER_CONFIG
+
+
+def _env_int(name: str, default):
+    """Read an integer setting from the environment"""
+    value = os.environ.get(name)
+    if value:
+        try:
+            return int(value)
+        except ValueError:
+            pass
+    return default
+
+
+bind = os.environ.get('WEB_BIND', WEB_SERVER_CONFIG['bind'])
+
+# Worker processes x threads: one slow page only occupies a single thread
+workers = _env_int('WEB_WORKERS', WEB_SERVER_CONFIG['workers']) or multiprocessing.cpu_count() * 2 + 1
+threads = _env_int('WEB_THREADS', WEB_SERVER_CONFIG['threads'])
+worker_class = 'gthread'
+
+# Load the app once in the master and fork it into the workers
+# (code changes therefore need a restart of the master, not a SIGHUP)
+preload_app = True
+
+timeout = _env_int('WEB_TIMEOUT', WEB_SERVER_CONFIG['timeout'])
+graceful_timeout = 30
+
+# nginx keeps idle upstream connections for 60s - stay open a little longer
+keepalive = _env_int('WEB_KEEPALIVE', WEB_SERVER_CONFIG['keepalive'])
+
+# Recycle workers now and then to keep memory in check
+max_requests = 2000
+max_requests_jitter = 200
+
+accesslog = '-'
+errorlog = '-'
+loglevel = 'info'
+proc_name = 'news-crawler-web'
+
+
+def post_fork(server, worker):
+    """Give every worker its own DB pool - sockets must not be shared across fork"""
+    from app import init_db_pool
+    init_db_pool(pool_size=threads)
+    server.log.info(f"Worker {worker.pid}: MySQL pool initialised ({threads} connections)")
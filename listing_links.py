@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Fast article-link extraction for /gundem listing pages
+
+Listing pages are only scanned for article hrefs, so building a full
+BeautifulSoup tree for them is wasted work. extract_listing_links() runs one
+compiled regex over the raw HTML and returns unique, ordered, absolute URLs.
+Entities in hrefs (&amp;) are unescaped the same way the HTML parser does.
+
+Benchmark against the BeautifulSoup loop on saved listing pages:
+    python3 listing_links.py --fetch 5              # download pages 1-5 first
+    python3 listing_links.py pages/*.html
+    python3 listing_links.py --save-dir pages --fetch 20
+"""
+
+import os
+import re
+import sys
+import html
+import time
+import argparse
+from datetime import date
+from urllib.parse import urljoin
+
+LISTING_BASE_URL = 'https://www.dunya.com/gundem'
+
+# href of every <a> tag, quoted or not; attribute order inside the tag does not matter
+ANCHOR_HREF_RE = re.compile(
+    r'<a\s[^>]*?(?<=\s)href\s*=\s*(?:"([^"]*)"|\'([^\']*)\'|([^\s"\'>]+))',
+    re.IGNORECASE
+)
+
+# Date hints inside a listing card: <time datetime>, data-date style attributes,
+# JSON "datePublished", or a dd.mm.yyyy date in the card text
+CARD_DATE_RE = re.compile(
+    r'(?:datetime|data-date|data-published|datePublished)["\']?\s*[=:]\s*["\'](\d{4})-(\d{2})-(\d{2})'
+    r'|\b(\d{2})\.(\d{2})\.(\d{4})\b',
+    re.IGNORECASE
+)
+
+# How far past the last link of a page a card is assumed to extend
+LAST_CARD_CHARS = 2000
+
+
+def extract_listing_links(page_html: str, base_url: str = LISTING_BASE_URL):
+    """Unique article URLs in page order"""
+    seen = set()
+    links = []
+    for quoted, single_quoted, bare in ANCHOR_HREF_RE.findall(page_html):
+        href = quoted or single_quoted or bare
+        if '/gundem/' not in href or 'haberi-' not in href or href in seen:
+            continue
+        seen.add(href)  # Raw hrefs are deduplicated before the (slower) unescape and urljoin
+        if '&' in href:
+            href = html.unescape(href)
+        if not href.startswith('http'):
+            href = urljoin(base_url, href)
+        links.append(href)
+    return list(dict.fromkeys(links))
+
+
+def _card_date(card_html: str):
+    match = CARD_DATE_RE.search(card_html)
+    if not match:
+        return None
+    try:
+        if match.group(1):
+            return date(int(match.group(1)), int(match.group(2)), int(match.group(3)))
+        return date(int(match.group(6)), int(match.group(5)), int(match.group(4)))
+    except ValueError:
+        return None
+
+
+def extract_listing_cards(page_html: str, base_url: str = LISTING_BASE_URL):
+    """(url, date hint) pairs in page order; the hint is None when the card shows no date
+
+    A card is the markup from an article's first link up to the next article's
+    first link, so image and title links of the same story share one card.
+    """
+    starts = []
+    seen = set()
+    for match in ANCHOR_HREF_RE.finditer(page_html):
+        href = match.group(1) or match.group(2) or match.group(3)
+        if '/gundem/' not in href or 'haberi-' not in href:
+            continue
+        if '&' in href:
+            href = html.unescape(href)
+        if not href.startswith('http'):
+            href = urljoin(base_url, href)
+        if href not in seen:
+            seen.add(href)
+            starts.append((match.start(), href))
+
+    cards = []
+    for index, (start, url) in enumerate(starts):
+        end = starts[index + 1][0] if index + 1 < len(starts) else start + LAST_CARD_CHARS
+        cards.append((url, _card_date(page_html[start:end])))
+    return cards
+
+
+def extract_listing_links_soup(page_html: str, base_url: str = LISTING_BASE_URL):
+    """Previous BeautifulSoup implementation, kept as the benchmark baseline"""
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(page_html, 'html.parser')
+    article_links = []
+    for link in soup.find_all('a', href=True):
+        href = link['href']
+        if '/gundem/' in href and 'haberi-' in href:
+            if not href.startswith('http'):
+                href = urljoin(base_url, href)
+            article_links.append(href)
+    return article_links
+
+
+def fetch_listing_pages(count: int, save_dir: str = None):
+    """Download listing pages 1..count (optionally saving them for later runs)"""
+    import requests
+    from fetch_utils import fetch_page
+
+    session = requests.Session()
+    headers = {'User-Agent': 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36'}
+    pages = []
+    for page_num in range(1, count + 1):
+        url = LISTING_BASE_URL if page_num == 1 else f"{LISTING_BASE_URL}/{page_num}"
+        text = fetch_page(session, url, timeout=15, headers=headers).text
+        pages.append((url, text))
+        if save_dir:
+            os.makedirs(save_dir, exist_ok=True)
+            with open(os.path.join(save_dir, f"gundem_{page_num}.html"), 'w', encoding='utf-8') as f:
+                f.write(text)
+        time.sleep(0.5)
+    return pages
+
+
+def time_extractor(extract, pages: list, rounds: int):
+    """Best-of-rounds total seconds for running extract over every page"""
+    best = None
+    for _ in range(rounds):
+        started = time.perf_counter()
+        for _, text in pages:
+            extract(text)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def benchmark(pages: list, rounds: int = 5):
+    """Compare speed and output of the regex scanner and the soup loop"""
+    mismatches = 0
+    for name, text in pages:
+        fast = extract_listing_links(text)
+        # The soup loop does not deduplicate - compare against its ordered unique links
+        baseline = list(dict.fromkeys(extract_listing_links_soup(text)))
+        if fast != baseline:
+            mismatches += 1
+            print(f"MISMATCH {name}: regex {len(fast)} links, soup {len(baseline)} links")
+            for link in set(fast) ^ set(baseline):
+                print(f"    {link}")
+
+    soup_seconds = time_extractor(extract_listing_links_soup, pages, rounds)
+    fast_seconds = time_extractor(extract_listing_links, pages, rounds)
+    total_kb = sum(len(text) for _, text in pages) / 1024
+
+    print(f"Pages: {len(pages)} ({total_kb:.0f} KB), best of {rounds} rounds")
+    print(f"BeautifulSoup loop: {soup_seconds * 1000 / len(pages):8.2f} ms/page")
+    print(f"Regex scanner:      {fast_seconds * 1000 / len(pages):8.2f} ms/page")
+    print(f"Speedup:            {soup_seconds / fast_seconds:8.1f}x")
+    print(f"Output mismatches:  {mismatches}")
+    return mismatches == 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark listing-page link extraction")
+    parser.add_argument('files', nargs='*', help='saved listing pages (HTML)')
+    parser.add_argument('--fetch', type=int, default=0, help='download this many /gundem pages')
+    parser.add_argument('--save-dir', help='where to save downloaded pages')
+    parser.add_argument('--rounds', type=int, default=5)
+    args = parser.parse_args()
+
+    pages = []
+    for path in args.files:
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            pages.append((path, f.read()))
+    if args.fetch:
+        pages.extend(fetch_listing_pages(args.fetch, args.save_dir))
+
+    if not pages:
+        parser.error("give saved pages or --fetch N")
+    sys.exit(0 if benchmark(pages, args.rounds) else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""
+Load-testing harness for the web application
+
+1. Seed a separate local database with synthetic articles of realistic size:
+    MYSQL_DATABASE=news_crawler_loadtest python3 load_test.py seed --articles 50000
+2. Start the app against it:
+    MYSQL_DATABASE=news_crawler_loadtest python3 run_web.py
+3. Drive a route mix at a target concurrency and read the latency report:
+    MYSQL_DATABASE=news_crawler_loadtest python3 load_test.py run --concurrency 32 --duration 60
+    python3 load_test.py run --mix "index=1,dunya=4,article=4,raw=1" --cold --json report.json
+
+The report gives requests/s and p50/p95/p99 latency per route, plus errors
+and page-cache hit ratio. --cold adds a random query argument so every page
+request misses the page cache.
+"""
+
+import sys
+import json
+import time
+import random
+import argparse
+import threading
+import mysql.connector
+from datetime import datetime, timedelta
+from mysql_config import MYSQL_CONFIG, TABLE_NAMES
+
+DEFAULT_MIX = 'index=1,dunya=3,ekonomist=2,article=4,raw=1,api_stats=1,api_recent=1'
+
+WORDS = ('ekonomi piyasa dolar enflasyon faiz merkez bankasi borsa ihracat sanayi yatirim '
+         'uretim buyume istihdam butce vergi enerji petrol altin kur tahvil sirket hisse '
+         'kredi tuketici fiyat endeks rapor karar toplanti aciklama bakan hukumet').split()
+
+
+def synthetic_text(words: int, rng: random.Random):
+    return ' '.join(rng.choice(WORDS) for _ in range(words)).capitalize() + '.'
+
+
+def synthetic_html(title: str, body: str, target_bytes: int, rng: random.Random):
+    """Article page padded with navigation/script-like markup up to the target size"""
+    parts = [f"<!DOCTYPE html><html><head><title>{title}</title>"
+             f"<meta property=\"og:title\" content=\"{title}\"></head><body>"
+             f"<h1 class=\"post-title\">{title}</h1><div class=\"content-text\">{body}</div>"]
+    size = sum(len(part) for part in parts)
+    while size < target_bytes:
+        block = (f"<div class=\"related\"><a href=\"/gundem/{rng.choice(WORDS)}-haberi-{rng.randint(1, 10**6)}\">"
+                 f"{synthetic_text(8, rng)}</a></div><script>var x{rng.randint(0, 10**9)}=1;</script>")
+        parts.append(block)
+        size += len(block)
+    parts.append("</body></html>")
+    return ''.join(parts)
+
+
+def create_tables():
+    """Create the article tables with the crawlers' own schema code"""
+    from dunya_crawler_mysql import DunyaCrawlerMySQL
+    from ekonomist_crawler_mysql import EkonomistCrawlerMySQL
+
+    for crawler_class in (DunyaCrawlerMySQL, EkonomistCrawlerMySQL):
+        crawler = crawler_class.__new__(crawler_class)  # Schema only - no session, spool or logging
+        crawler.db_pool = None
+        crawler.log = print
+        crawler.setup_database()
+
+
+def seed(articles: int, html_kb: int, days: int, force: bool = False, batch_size: int = 500, seed_value: int = 42):
+    """Insert synthetic articles, split 60/40 between the two sources"""
+    if MYSQL_CONFIG['database'] == 'news_crawler_db' and not force:
+        print("Refusing to seed the production database - set MYSQL_DATABASE (or pass --force)")
+        sys.exit(2)
+
+    server_config = {key: value for key, value in MYSQL_CONFIG.items() if key != 'database'}
+    conn = mysql.connector.connect(**server_config)
+    conn.cursor().execute(f"CREATE DATABASE IF NOT EXISTS `{MYSQL_CONFIG['database']}` "
+                          f"CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci")
+    conn.close()
+    create_tables()
+
+    rng = random.Random(seed_value)
+    conn = mysql.connector.connect(**MYSQL_CONFIG)
+    cursor = conn.cursor()
+    now = datetime.now()
+    started = time.monotonic()
+
+    for source, share in (('dunya', 0.6), ('ekonomist', 0.4)):
+        table = TABLE_NAMES[f'{source}_articles']
+        count = int(articles * share)
+        rows = []
+        for number in range(count):
+            published = now - timedelta(seconds=rng.randint(0, days * 86400))
+            title = synthetic_text(rng.randint(6, 14), rng)
+            body = synthetic_text(rng.randint(300, 900), rng)
+            html = synthetic_html(title, body, int(html_kb * 1024 * rng.uniform(0.6, 1.4)), rng)
+            rows.append((
+                (published + timedelta(minutes=rng.randint(1, 600))).isoformat(), published.isoformat(),
+                title, body, f"https://loadtest.invalid/{source}/synthetic-haberi-{number}",
+                f"https://loadtest.invalid/{source}/page", rng.randint(1, 500), html,
+                now.isoformat(), 'success'
+            ))
+            if len(rows) >= batch_size or number == count - 1:
+                cursor.executemany(f'''
+                    INSERT IGNORE INTO {table}
+                    (crawl_datetime, news_visible_datetime, news_visible_title_subtitle,
+                     news_visible_body, news_url, news_sub_sitemap_link, page_number,
+                     raw_html, html_fetch_datetime, html_status)
+                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+                ''', rows)
+                conn.commit()
+                rows = []
+                print(f"{source}: {number + 1}/{count} articles", end='\r', flush=True)
+        print()
+
+    from daily_stats import rebuild_daily_stats
+    rebuild_daily_stats(conn)
+    conn.close()
+    print(f"Seeded {articles} articles (~{html_kb} KB HTML each) in {time.monotonic() - started:.0f}s")
+
+
+def article_ids():
+    """(source, min id, max id) for choosing random article routes"""
+    conn = mysql.connector.connect(**MYSQL_CONFIG)
+    cursor = conn.cursor()
+    ranges = []
+    try:
+        for source in ('dunya', 'ekonomist'):
+            cursor.execute(f"SELECT MIN(id), MAX(id), COUNT(*) FROM {TABLE_NAMES[f'{source}_articles']}")
+            low, high, count = cursor.fetchone()
+            if count:
+                ranges.append((source, low, high, count))
+    finally:
+        conn.close()
+    return ranges
+
+
+class RouteMix:
+    """Weighted random choice of request paths"""
+
+    def __init__(self, spec: str, id_ranges: list, per_page: int = 20):
+        self.weights = {}
+        for item in spec.split(','):
+            name, _, weight = item.partition('=')
+            self.weights[name.strip()] = float(weight or 1)
+        self.id_ranges = id_ranges
+        self.pages = {source: max(1, count // per_page) for source, _, _, count in id_ranges}
+
+    def next_path(self, rng: random.Random):
+        name = rng.choices(list(self.weights), weights=list(self.weights.values()))[0]
+        if name in ('dunya', 'ekonomist'):
+            return name, f"/{name}?page={rng.randint(1, self.pages.get(name, 1))}"
+        if name in ('article', 'raw'):
+            source, low, high, _ = rng.choice(self.id_ranges)
+            path = f"/article/{rng.randint(low, high)}/{source}"
+            return name, path + '/raw' if name == 'raw' else path
+        if name == 'index':
+            return name, '/'
+        if name.startswith('api_'):
+            return name, f"/api/{name[4:]}"
+        raise ValueError(f"Unknown route in mix: {name}")
+
+
+def percentile(ordered: list, pct: float):
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def run(base_url: str, mix: RouteMix, concurrency: int, duration: float, cold: bool, warmup: float):
+    """Closed-loop load: each worker sends its next request as soon as the previous one returns"""
+    import requests
+
+    results = []  # (route, seconds, status, cache_hit)
+    lock = threading.Lock()
+    stop_at = time.monotonic() + warmup + duration
+    record_after = time.monotonic() + warmup
+
+    def worker(number):
+        rng = random.Random(number)
+        session = requests.Session()
+        session.headers['Accept-Encoding'] = 'gzip'
+        local = []
+        while time.monotonic() < stop_at:
+            route, path = mix.next_path(rng)
+            if cold:
+                path += ('&' if '?' in path else '?') + f"_lt={rng.getrandbits(40)}"
+            started = time.monotonic()
+            try:
+                response = session.get(base_url + path, timeout=60)
+                status = response.status_code
+                cache_hit = response.headers.get('X-Cache') == 'HIT'
+            except requests.RequestException:
+                status, cache_hit = 0, False
+            if started >= record_after:
+                local.append((route, time.monotonic() - started, status, cache_hit))
+        with lock:
+            results.extend(local)
+
+    threads = [threading.Thread(target=worker, args=(number,), daemon=True) for number in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def report(results: list, duration: float, concurrency: int):
+    by_route = {}
+    for route, seconds, status, cache_hit in results:
+        by_route.setdefault(route, []).append((seconds, status, cache_hit))
+
+    summary = {'concurrency': concurrency, 'duration_seconds': duration, 'routes': {}}
+    print(f"\n{'route':12} {'requests':>9} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8} {'errors':>7} {'cache':>6}")
+    for route, samples in sorted(by_route.items()) + [('TOTAL', [(s, st, c) for _, s, st, c in results])]:
+        latencies = sorted(seconds for seconds, _, _ in samples)
+        errors = sum(1 for _, status, _ in samples if status == 0 or status >= 500)
+        hits = sum(1 for _, _, cache_hit in samples if cache_hit)
+        row = {
+            'requests': len(samples),
+            'throughput': round(len(samples) / duration, 1),
+            'p50_ms': round(percentile(latencies, 50) * 1000, 1),
+            'p95_ms': round(percentile(latencies, 95) * 1000, 1),
+            'p99_ms': round(percentile(latencies, 99) * 1000, 1),
+            'max_ms': round((latencies[-1] if latencies else 0) * 1000, 1),
+            'errors': errors,
+            'cache_hit_ratio': round(hits / len(samples), 2) if samples else 0
+        }
+        summary['routes'][route] = row
+        print(f"{route:12} {row['requests']:9} {row['throughput']:8} {row['p50_ms']:8} {row['p95_ms']:8} "
+              f"{row['p99_ms']:8} {row['max_ms']:8} {row['errors']:7} {row['cache_hit_ratio']:6}")
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Seed synthetic data and load-test the web app")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    seed_parser = sub.add_parser('seed', help='insert synthetic articles into MYSQL_DATABASE')
+    seed_parser.add_argument('--articles', type=int, default=20000)
+    seed_parser.add_argument('--html-kb', type=int, default=150, help='average raw_html size')
+    seed_parser.add_argument('--days', type=int, default=365, help='spread publication dates over this many days')
+    seed_parser.add_argument('--force', action='store_true', help='allow seeding news_crawler_db')
+
+    run_parser = sub.add_parser('run', help='drive the route mix against a running app')
+    run_parser.add_argument('--url', default='http://127.0.0.1:5000')
+    run_parser.add_argument('--mix', default=DEFAULT_MIX, help='route=weight list')
+    run_parser.add_argument('--concurrency', type=int, default=16)
+    run_parser.add_argument('--duration', type=float, default=30, help='measured seconds')
+    run_parser.add_argument('--warmup', type=float, default=5, help='unmeasured seconds first')
+    run_parser.add_argument('--cold', action='store_true', help='defeat the page cache')
+    run_parser.add_argument('--json', help='write the report to this file')
+    args = parser.parse_args()
+
+    if args.command == 'seed':
+        seed(args.articles, args.html_kb, args.days, args.force)
+        return
+
+    id_ranges = article_ids()
+    if not id_ranges:
+        print("No articles in the database - run the seed command first")
+        sys.exit(1)
+    mix = RouteMix(args.mix, id_ranges)
+    print(f"Load test: {args.concurrency} workers, {args.warmup:.0f}s warm-up + {args.duration:.0f}s against {args.url}")
+    results = run(args.url.rstrip('/'), mix, args.concurrency, args.duration, args.cold, args.warmup)
+    summary = report(results, args.duration, args.concurrency)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
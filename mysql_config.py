@@ -3,21 +3,237 @@
 MySQL Database Configuration
 """
 
+import os
+
 # MySQL Database Configuration
 MYSQL_CONFIG = {
     'host': 'localhost',
     'user': 'newscrawler',
     'password': 'news_crawler_2025',
-    'database': 'news_crawler_db',
+    'database': os.environ.get('MYSQL_DATABASE', 'news_crawler_db'),  # e.g. a load-test database
     'charset': 'utf8mb4',
     'autocommit': True,
     'use_unicode': True
 }
 
+# Optional read endpoint (replica) for the web app's read-only routes - see db_routing.py
+# None sends every query to MYSQL_CONFIG. Example: dict(MYSQL_CONFIG, host='db-replica')
+MYSQL_READ_CONFIG = None
+if os.environ.get('MYSQL_READ_HOST'):
+    MYSQL_READ_CONFIG = dict(MYSQL_CONFIG,
+                             host=os.environ['MYSQL_READ_HOST'],
+                             port=int(os.environ.get('MYSQL_READ_PORT', 3306)))
+
+REPLICA_CONFIG = {
+    'max_lag_seconds': 30,           # reads fall back to the primary above this lag
+    'lag_check_interval': 5,         # seconds between lag checks per web process
+    'retry_after_failure_seconds': 30,
+    'lag_check': os.environ.get('REPLICA_LAG_CHECK', 'replica_status')  # 'none' for a stand-in that is not a replica
+}
+
 # Table names for different crawlers
 TABLE_NAMES = {
     'dunya_articles': 'dunya_news_articles',
     'dunya_pages': 'dunya_page_backup',
     'ekonomist_articles': 'ekonomist_news_articles', 
-    'ekonomist_pages': 'ekonomist_page_backup'
+    'ekonomist_pages': 'ekonomist_page_backup',
+    'fingerprints': 'article_fingerprints',
+    'lsh_bands': 'article_lsh_bands',
+    'frontier': 'crawl_frontier',
+    'archive_index': 'article_archive_index',
+    'daily_stats': 'article_daily_stats',
+    'trending_day_terms': 'trending_day_terms',
+    'trending_terms': 'trending_terms',
+    'data_version': 'data_version'
+}
+
+# Rendered-page cache for the web application
+CACHE_CONFIG = {
+    'enabled': True,
+    'backend': 'memory',              # 'memory' (per process) or 'file' (shared by workers)
+    'max_entries': 512,               # LRU bound on cached pages
+    'cache_dir': 'cache/pages',       # used by the 'file' backend
+    'version_store': 'mysql',         # 'mysql' (shared by every host) or 'file' (single host) - see data_version.py
+    'version_file': 'cache/data_version',  # "last write" stamp bumped by the crawlers ('file' store)
+    'version_check_interval': 1.0     # seconds between re-reads of the stamp
+}
+
+# Production web server (gunicorn) settings - see gunicorn_config.py
+WEB_SERVER_CONFIG = {
+    'bind': '127.0.0.1:5000',
+    'workers': None,         # None = 2 x CPU count + 1
+    'threads': 4,            # threads per worker (one DB connection each)
+    'timeout': 60,
+    'keepalive': 75          # must outlive nginx's upstream keepalive_timeout (60s)
+}
+
+# Near-duplicate detection (MinHash + LSH) at save time - see near_duplicates.py
+DEDUP_CONFIG = {
+    'enabled': True,
+    'min_similarity': 0.8,          # estimated Jaccard similarity to count as duplicate
+    'min_body_length': 200,         # shorter bodies are not fingerprinted
+    'skip_duplicate_html': False    # True = don't store raw_html of near-duplicates
+}
+
+# Distributed crawling work queue - see work_queue.py
+WORK_QUEUE_CONFIG = {
+    'lease_seconds': 300,           # claimed tasks return to the queue after this
+    'max_attempts': 3,              # tasks failing this often are marked 'failed'
+    'claim_batch_size': 10,
+    'idle_sleep_seconds': 5,
+    'idle_rounds_before_exit': 3
+}
+
+# Resident crawl scheduler - see crawl_scheduler.py
+SCHEDULER_CONFIG = {
+    'status_file': 'cache/scheduler_status.json',
+    'pool_size': 2,                  # MySQL connections kept warm per crawler
+    'lock_retry_seconds': 300,       # retry delay when a source is already running elsewhere (or MySQL is down)
+    'shutdown_timeout_seconds': 30,
+    'sources': {
+        'dunya': {
+            'enabled': True,
+            'interval_minutes': 60,
+            'jitter_seconds': 300,
+            'lookback_days': 1,          # crawl yesterday..today
+            'discovery_mode': 'pages'    # or 'sitemap'
+        },
+        'ekonomist': {
+            'enabled': True,
+            'interval_minutes': 30,
+            'jitter_seconds': 180,
+            'initial_delay_seconds': 60, # don't start both sources at once
+            'start_page': 1,
+            'max_pages': 5,
+            'categories': False          # True = all EKONOMIST_CATEGORY_CONFIG categories in parallel
+        }
+    }
+}
+
+# Crawler fetch layer - see fetch_utils.py
+FETCH_CONFIG = {
+    'max_body_bytes': 5 * 1024 * 1024,   # abort downloads larger than this
+    'chunk_size': 64 * 1024,
+    'allowed_content_types': (
+        'text/html', 'application/xhtml+xml', 'application/xml', 'text/xml'
+    ),
+    'sitemap_max_body_bytes': 50 * 1024 * 1024,   # sitemaps may be up to 50 MB uncompressed
+    'sitemap_content_types': (
+        'application/xml', 'text/xml', 'application/x-gzip', 'application/gzip', 'application/octet-stream'
+    ),
+    'host_concurrency': 2,               # HostBudget: requests in flight per host across workers
+    'host_min_interval_seconds': 1.0     # HostBudget: minimum gap between request starts per host
+}
+
+# Retry / circuit breaker policy for crawler requests - see fetch_utils.py
+RETRY_CONFIG = {
+    'max_retries': 3,
+    'backoff_base': 0.5,                 # seconds, doubled per attempt (full jitter)
+    'backoff_max': 20,
+    'breaker_failure_threshold': 5,      # consecutive transient failures that open a host circuit
+    'breaker_cooldown_seconds': 30,      # pause before probing the host again
+    'breaker_max_cooldown_seconds': 300
+}
+
+# Per-host latency tracking, adaptive timeouts and hedged requests - see fetch_utils.py
+LATENCY_CONFIG = {
+    'window': 200,                # latest successful responses kept per host
+    'min_samples': 20,            # static timeouts are used until a host has this many
+    'timeout_multiplier': 2.0,    # timeout = p99 x multiplier ...
+    'min_timeout': 2,             # ... clamped to [min_timeout, max_timeout] seconds
+    'max_timeout': 30,
+    'hedging_enabled': True,
+    'hedge_percentile': 95,       # fire the second attempt after this percentile
+    'min_hedge_delay': 0.2,
+    'hedge_pool_size': 4          # hedge threads per crawler (each with its own session)
+}
+
+# Headless-browser rendering fallback for pages without static content - see render_pool.py
+RENDER_CONFIG = {
+    'enabled': False,                # requires: playwright install chromium
+    'pool_size': 2,                  # persistent browser contexts
+    'max_pages_per_context': 50,     # recycle contexts to keep browser memory bounded
+    'navigation_timeout_ms': 20000,
+    'wait_for_selector': None,       # e.g. 'div.content-text'
+    'selector_timeout_ms': 5000,
+    'user_agent': 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36',
+    'blocked_resource_types': ('image', 'media', 'font'),
+    'blocked_domains': (
+        'google-analytics.com', 'googletagmanager.com', 'doubleclick.net',
+        'googlesyndication.com', 'facebook.net', 'hotjar.com', 'scorecardresearch.com'
+    )
+}
+
+# Local write-ahead spool used when MySQL is slow or unavailable - see article_spool.py
+SPOOL_CONFIG = {
+    'enabled': True,
+    'mode': 'fallback',              # 'fallback': spool only on DB failure, 'always': spool every article first
+    'path': 'spool/articles.db',     # relative to the project directory
+    'batch_size': 200,               # rows per bulk replay transaction
+    'replay_interval_seconds': 10
+}
+
+# Crawler logging (queued, rotating JSON files) - see crawl_logging.py
+LOGGING_CONFIG = {
+    'dir': 'logs',                   # relative to the project directory
+    'level': 'INFO',                 # 'DEBUG' logs every per-article line, unsampled
+    'json_file': True,               # one JSON object per line in the log file
+    'console': True,
+    'max_bytes': 20 * 1024 * 1024,   # rotate at 20 MB ...
+    'backup_count': 5,               # ... keeping 5 old files
+    'sample_first': 5,               # per-article lines: log the first 5 of each kind ...
+    'sample_every': 100              # ... then every 100th
+}
+
+# Offline re-extraction of stored raw_html - see reextract.py
+REEXTRACT_CONFIG = {
+    'workers': 2,                    # extraction processes; keep low on the web server host
+    'batch_size': 200,               # rows read and updated per batch
+    'pause_seconds': 0.5,            # sleep between batches so the live site stays responsive
+    'checkpoint_dir': 'cache'        # reextract_<source>.json holds the last processed id
+}
+
+# Skipping out-of-range articles on Dunya listing pages before download - see dunya_crawler_mysql.py
+PREFILTER_CONFIG = {
+    'enabled': True,
+    'card_date_slack_days': 1,       # listing-card dates must miss the range by more than this
+    'boundary_margin': 2             # extra articles fetched past each detected range boundary
+}
+
+# Monthly cold archive of old raw_html - see article_archive.py
+ARCHIVE_CONFIG = {
+    'keep_months': 6,                # months of HTML kept in the hot tables
+    'archive_dir': 'archive',        # <source>/<YYYY-MM>.zip, relative to the project directory
+    'batch_size': 500,               # articles moved per transaction
+    'compress_level': 9              # deflate level for zip entries
+}
+
+# Trending keywords per source per day - see trending_keywords.py
+TRENDING_CONFIG = {
+    'baseline_days': 14,             # trailing days a day is compared with
+    'min_baseline_days': 3,          # days with less stored history are not scored
+    'top_terms': 30,                 # terms stored per source per day
+    'min_doc_count': 3,              # a term must appear in this many articles that day
+    'store_min_doc_count': 2,        # rarer terms are dropped from the stored day counts
+    'smoothing': 0.5,                # added to baseline document counts
+    'backfill_days': 30,             # days counted on the first run
+    'recheck_days': 2,               # days before the last counted day checked for late articles
+    'batch_size': 500                # article bodies tokenised per sparse matrix
+}
+
+# Parallel multi-category Ekonomist crawl - see EkonomistCrawlerMySQL.crawl_categories()
+EKONOMIST_CATEGORY_CONFIG = {
+    # kategori-sayfa ?url= slugs. Only 'dunya' is confirmed against the live API; the others
+    # are guesses from the site's URL scheme - check each before enabling it (an unknown slug lists nothing)
+    'categories': [
+        'dunya',
+        # 'ekonomi', 'finans', 'sirketler', 'teknoloji',
+    ],
+    'workers': 3,                    # categories crawled at the same time (FETCH_CONFIG caps per-host load)
+    'max_pages': 50,                 # per category
+    'stop_after_empty_pages': 2,     # stop a category after this many consecutive empty listing pages ...
+    'stop_after_known_pages': 2,     # ... or pages with no new articles (0 = never)
+    'overrides': {                   # per-category values for any of the limits above, plus start_page
+        # 'dunya': {'max_pages': 100},
+    }
 }
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Near-duplicate article detection with MinHash and banded LSH
+
+Each saved article body gets a 128-value MinHash signature over its word
+3-shingles. The signature is cut into 32 bands of 4 values and each band is
+hashed into an indexed table: articles that share any band hash become
+candidates, so a lookup touches a handful of index entries instead of the
+whole history. Candidates are confirmed by their estimated Jaccard similarity
+and near-duplicates are linked to the canonical (first seen) article.
+"""
+
+import re
+import struct
+import hashlib
+from datetime import datetime
+from mysql_config import TABLE_NAMES, DEDUP_CONFIG
+
+NUM_PERM = 128
+BANDS = 32
+ROWS_PER_BAND = NUM_PERM // BANDS
+
+# Universal hashing h(x) = (a*x + b) mod p, truncated to 32 bits
+MERSENNE_PRIME = (1 << 61) - 1
+MAX_HASH = (1 << 32) - 1
+
+
+def _make_permutations():
+    """Deterministic (a, b) pairs - signatures must be stable across processes"""
+    params = []
+    for i in range(NUM_PERM):
+        digest = hashlib.blake2b(f"minhash-perm-{i}".encode('ascii'), digest_size=16).digest()
+        a = int.from_bytes(digest[:8], 'big') % (MERSENNE_PRIME - 1) + 1
+        b = int.from_bytes(digest[8:], 'big') % MERSENNE_PRIME
+        params.append((a, b))
+    return params
+
+
+PERMUTATIONS = _make_permutations()
+SIGNATURE_FORMAT = f'<{NUM_PERM}I'
+
+WORD_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def _shingles(text: str, size: int = 3):
+    """Set of overlapping word n-grams of the lower-cased text"""
+    words = WORD_RE.findall(text.lower())
+    if len(words) < size:
+        return {' '.join(words)} if words else set()
+    return {' '.join(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+
+def minhash(text: str):
+    """MinHash signature (list of NUM_PERM ints) of a text, None if it has no words"""
+    shingles = _shingles(text)
+    if not shingles:
+        return None
+
+    hashes = [int.from_bytes(hashlib.blake2b(s.encode('utf-8'), digest_size=8).digest(), 'big')
+              for s in shingles]
+
+    signature = []
+    for a, b in PERMUTATIONS:
+        signature.append(min(((a * h + b) % MERSENNE_PRIME) & MAX_HASH for h in hashes))
+    return signature
+
+
+def estimate_similarity(sig_a, sig_b):
+    """Estimated Jaccard similarity of two signatures"""
+    return sum(1 for x, y in zip(sig_a, sig_b) if x == y) / NUM_PERM
+
+
+def band_hashes(signature):
+    """One 64-bit hash per LSH band"""
+    result = []
+    for band in range(BANDS):
+        rows = signature[band * ROWS_PER_BAND:(band + 1) * ROWS_PER_BAND]
+        digest = hashlib.blake2b(struct.pack(f'<{ROWS_PER_BAND}I', *rows), digest_size=8).digest()
+        result.append(int.from_bytes(digest, 'big'))
+    return result
+
+
+def pack_signature(signature):
+    return struct.pack(SIGNATURE_FORMAT, *signature)
+
+
+def unpack_signature(data: bytes):
+    return list(struct.unpack(SIGNATURE_FORMAT, data))
+
+
+def compute_fingerprint(content: str):
+    """Fingerprint an extracted article body, or None if it is too short to compare"""
+    if not content or content == 'No content found':
+        return None
+    if len(content) < DEDUP_CONFIG['min_body_length']:
+        return None
+    return minhash(content)
+
+
+def setup_fingerprint_tables(cursor):
+    """Create the signature and LSH band tables"""
+    cursor.execute(f'''
+        CREATE TABLE IF NOT EXISTS {TABLE_NAMES['fingerprints']} (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            source VARCHAR(20) NOT NULL,
+            article_id INT NOT NULL,
+            news_url VARCHAR(500),
+            signature VARBINARY(512) NOT NULL,
+            canonical_source VARCHAR(20),
+            canonical_article_id INT,
+            created_datetime DATETIME,
+            UNIQUE KEY uniq_article (source, article_id),
+            KEY idx_canonical (canonical_source, canonical_article_id)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    ''')
+
+    cursor.execute(f'''
+        CREATE TABLE IF NOT EXISTS {TABLE_NAMES['lsh_bands']} (
+            band_no TINYINT UNSIGNED NOT NULL,
+            band_hash BIGINT UNSIGNED NOT NULL,
+            fingerprint_id INT NOT NULL,
+            PRIMARY KEY (band_no, band_hash, fingerprint_id)
+        ) ENGINE=InnoDB
+    ''')
+
+
+def find_near_duplicate(cursor, signature, news_url: str = None):
+    """Return (canonical_source, canonical_article_id) of a near-duplicate, or None"""
+    bands = band_hashes(signature)
+    placeholders = ', '.join(['(%s, %s)'] * BANDS)
+    params = [value for band_no, band_hash in enumerate(bands) for value in (band_no, band_hash)]
+
+    # Primary key lookups on (band_no, band_hash) - cost depends on matches, not table size
+    cursor.execute(f'''
+        SELECT DISTINCT f.source, f.article_id, f.signature, f.canonical_source, f.canonical_article_id
+        FROM {TABLE_NAMES['lsh_bands']} b
+        JOIN {TABLE_NAMES['fingerprints']} f ON f.id = b.fingerprint_id
+        WHERE (b.band_no, b.band_hash) IN ({placeholders})
+          AND (f.news_url IS NULL OR f.news_url <> %s)
+        LIMIT 100
+    ''', (*params, news_url or ''))
+
+    best = None
+    for source, article_id, packed, canonical_source, canonical_id in cursor.fetchall():
+        similarity = estimate_similarity(signature, unpack_signature(packed))
+        if similarity < DEDUP_CONFIG['min_similarity']:
+            continue
+        if best is None or similarity > best[0]:
+            # Link to the candidate's canonical article so chains collapse to one root
+            best = (similarity, canonical_source or source, canonical_id or article_id)
+
+    return (best[1], best[2]) if best else None
+
+
+def register_fingerprint(cursor, source: str, article_id: int, news_url: str,
+                         signature, canonical=None):
+    """Store an article's signature, its LSH bands and its canonical link"""
+    canonical_source, canonical_id = canonical if canonical else (None, None)
+    cursor.execute(f'''
+        INSERT IGNORE INTO {TABLE_NAMES['fingerprints']}
+        (source, article_id, news_url, signature, canonical_source, canonical_article_id, created_datetime)
+        VALUES (%s, %s, %s, %s, %s, %s, %s)
+    ''', (
+        source, article_id, news_url, pack_signature(signature),
+        canonical_source, canonical_id, datetime.now().isoformat()
+    ))
+
+    fingerprint_id = cursor.lastrowid
+    if not fingerprint_id:
+        return None
+
+    cursor.executemany(f'''
+        INSERT IGNORE INTO {TABLE_NAMES['lsh_bands']} (band_no, band_hash, fingerprint_id)
+        VALUES (%s, %s, %s)
+    ''', [(band_no, band_hash, fingerprint_id) for band_no, band_hash in enumerate(band_hashes(signature))])
+    return fingerprint_id
+
+
+def replace_fingerprint(cursor, source: str, article_id: int, news_url: str, signature):
+    """Swap the stored signature and LSH bands of an article whose body was rewritten
+
+    The canonical link is kept; an article that had no fingerprint before is
+    matched like a new one. A None signature (body now too short) just drops
+    the old entries.
+    """
+    cursor.execute(f'''
+        SELECT id, signature, canonical_source, canonical_article_id
+        FROM {TABLE_NAMES['fingerprints']}
+        WHERE source = %s AND article_id = %s
+    ''', (source, article_id))
+    rows = cursor.fetchall()
+
+    if rows:
+        fingerprint_id, packed, canonical_source, canonical_id = rows[0]
+        canonical = (canonical_source, canonical_id) if canonical_source else None
+        # Old band hashes give primary-key deletes instead of a scan by fingerprint_id
+        cursor.executemany(f'''
+            DELETE FROM {TABLE_NAMES['lsh_bands']}
+            WHERE band_no = %s AND band_hash = %s AND fingerprint_id = %s
+        ''', [(band_no, band_hash, fingerprint_id)
+              for band_no, band_hash in enumerate(band_hashes(unpack_signature(packed)))])
+        cursor.execute(f"DELETE FROM {TABLE_NAMES['fingerprints']} WHERE id = %s", (fingerprint_id,))
+    else:
+        canonical = find_near_duplicate(cursor, signature, news_url) if signature else None
+
+    if signature is None:
+        return None
+    return register_fingerprint(cursor, source, article_id, news_url, signature, canonical)
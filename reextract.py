@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+Offline re-extraction of stored articles from their raw_html
+
+After extract_article_content() improves, old rows can be fixed without
+re-crawling: rows are read in primary-key order (keyset batches, so memory
+stays bounded), re-parsed in a process pool with the current extractor, and
+only rows whose title or body actually changed are written back in one
+batched UPDATE per batch. The same transaction moves the rewritten rows in
+the daily rollup (body_chars, and the day when a missing date is filled in)
+and replaces the MinHash fingerprints and LSH bands of rewritten bodies.
+
+The last processed id is checkpointed after every batch, so an interrupted
+run resumes where it stopped. A pause between batches and a small pool keep
+the database and the live site responsive.
+
+Usage:
+    python3 reextract.py dunya
+    python3 reextract.py ekonomist --workers 4 --pause 0.2
+    python3 reextract.py dunya --dry-run --end-id 5000
+    python3 reextract.py dunya --restart          # ignore the checkpoint
+"""
+
+import os
+import json
+import time
+import logging
+import argparse
+import mysql.connector
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+from mysql_config import MYSQL_CONFIG, TABLE_NAMES, REEXTRACT_CONFIG, DEDUP_CONFIG
+from data_version import BASE_DIR, bump_data_version
+from daily_stats import record_daily_stats, remove_daily_stats
+from near_duplicates import compute_fingerprint, replace_fingerprint
+
+# Results that mean the extractor found nothing - never overwrite stored text with these
+FAILED_EXTRACTION = {'', 'No content found', 'No title found', 'Extraction error'}
+
+_extractor = None
+
+
+def _init_worker(source: str):
+    """Build an extractor per process without the crawler's DB, session or log setup"""
+    global _extractor
+    if source == 'dunya':
+        from dunya_crawler_mysql import DunyaCrawlerMySQL as crawler_class
+    else:
+        from ekonomist_crawler_mysql import EkonomistCrawlerMySQL as crawler_class
+    _extractor = crawler_class.__new__(crawler_class)
+    _extractor.logger = logging.getLogger(f"reextract.{source}")
+    _extractor.log_prefix = ''
+
+
+def _extract(item):
+    """(id, raw_html) -> (id, title, content, published_time)"""
+    article_id, raw_html = item
+    data = _extractor.extract_article_content(raw_html)
+    return article_id, data.get('title'), data.get('content'), data.get('published_time')
+
+
+def get_checkpoint_file(source: str):
+    path = os.path.join(REEXTRACT_CONFIG['checkpoint_dir'], f"reextract_{source}.json")
+    if not os.path.isabs(path):
+        path = os.path.join(BASE_DIR, path)
+    return path
+
+
+def read_checkpoint(source: str):
+    try:
+        with open(get_checkpoint_file(source), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def write_checkpoint(source: str, state: dict):
+    path = get_checkpoint_file(source)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(state, f, indent=2, default=str)
+    os.replace(tmp_path, path)
+
+
+class ReExtractor:
+    """Re-runs the current extractor over one source's stored raw_html"""
+
+    def __init__(self, source: str, workers: int = None, batch_size: int = None,
+                 pause_seconds: float = None, dry_run: bool = False, log=print):
+        self.source = source
+        self.table = TABLE_NAMES[f'{source}_articles']
+        self.workers = workers or REEXTRACT_CONFIG['workers']
+        self.batch_size = batch_size or REEXTRACT_CONFIG['batch_size']
+        self.pause_seconds = REEXTRACT_CONFIG['pause_seconds'] if pause_seconds is None else pause_seconds
+        self.dry_run = dry_run
+        self.log = log
+
+    def read_batch(self, cursor, after_id: int, end_id: int = None):
+        """Next batch of rows with stored HTML, in primary-key order"""
+        query = f'''
+            SELECT id, raw_html, news_visible_title_subtitle, news_visible_body, news_visible_datetime, news_url
+            FROM {self.table}
+            WHERE id > %s AND raw_html IS NOT NULL AND raw_html <> ''
+        '''
+        params = [after_id]
+        if end_id is not None:
+            query += ' AND id <= %s'
+            params.append(end_id)
+        query += ' ORDER BY id LIMIT %s'
+        params.append(self.batch_size)
+        cursor.execute(query, params)
+        return cursor.fetchall()
+
+    def changed_rows(self, rows: list, results):
+        """UPDATE parameters for rows whose extraction differs from what is stored"""
+        stored = {row[0]: row for row in rows}
+        updates = []
+        for article_id, title, content, published_time in results:
+            _, _, old_title, old_body, old_datetime, _ = stored[article_id]
+            if content in FAILED_EXTRACTION or title in FAILED_EXTRACTION:
+                continue
+            if title == old_title and content == old_body and (old_datetime or not published_time):
+                continue
+            # The stored datetime is only filled in when it is missing
+            updates.append((title, content, published_time, article_id))
+        return updates
+
+    def write_updates(self, conn, updates: list, rows: list):
+        """Rewrite changed rows with their rollup and fingerprint entries in one transaction"""
+        stored = {row[0]: row for row in rows}
+        article_ids = [update[-1] for update in updates]
+        conn.start_transaction()
+        try:
+            cursor = conn.cursor()
+            remove_daily_stats(cursor, self.source, article_ids)
+            cursor.executemany(f'''
+                UPDATE {self.table}
+                SET news_visible_title_subtitle = %s,
+                    news_visible_body = %s,
+                    news_visible_datetime = COALESCE(news_visible_datetime, %s)
+                WHERE id = %s
+            ''', updates)
+            record_daily_stats(cursor, self.source, article_ids)
+
+            if DEDUP_CONFIG['enabled']:
+                for _, content, _, article_id in updates:
+                    if content != stored[article_id][3]:
+                        replace_fingerprint(cursor, self.source, article_id, stored[article_id][5],
+                                            compute_fingerprint(content))
+            conn.commit()
+        except mysql.connector.Error:
+            conn.rollback()
+            raise
+
+    def run(self, start_id: int = None, end_id: int = None, restart: bool = False):
+        checkpoint = {} if restart else read_checkpoint(self.source)
+        last_id = start_id if start_id is not None else checkpoint.get('last_id', 0)
+        totals = {'scanned': 0, 'changed': 0}
+        if not restart and start_id is None and checkpoint:
+            self.log(f"Resuming {self.source} re-extraction after id {last_id}")
+
+        try:
+            conn = mysql.connector.connect(**MYSQL_CONFIG)
+        except mysql.connector.Error as e:
+            self.log(f"MySQL connection error: {e}")
+            return None
+
+        started = time.monotonic()
+        try:
+            with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                     initargs=(self.source,)) as pool:
+                while True:
+                    cursor = conn.cursor()
+                    rows = self.read_batch(cursor, last_id, end_id)
+                    cursor.close()
+                    if not rows:
+                        break
+
+                    results = pool.map(_extract, [(row[0], row[1]) for row in rows],
+                                       chunksize=max(1, len(rows) // (self.workers * 4)))
+                    updates = self.changed_rows(rows, results)
+                    if updates and not self.dry_run:
+                        self.write_updates(conn, updates, rows)
+                        bump_data_version()
+
+                    last_id = rows[-1][0]
+                    totals['scanned'] += len(rows)
+                    totals['changed'] += len(updates)
+                    if not self.dry_run:
+                        write_checkpoint(self.source, {
+                            'last_id': last_id,
+                            'updated': datetime.now().isoformat(timespec='seconds'),
+                            **totals
+                        })
+
+                    rate = totals['scanned'] / max(time.monotonic() - started, 1e-6)
+                    self.log(f"{self.source}: up to id {last_id} - {totals['scanned']} scanned, "
+                             f"{totals['changed']} changed ({rate:.0f} rows/s)")
+                    del rows, results
+
+                    # Throttle so the live site keeps its share of the database
+                    time.sleep(self.pause_seconds)
+        except mysql.connector.Error as e:
+            self.log(f"MySQL error at id {last_id}, rerun to resume: {e}")
+        finally:
+            conn.close()
+
+        verb = 'would change' if self.dry_run else 'changed'
+        self.log(f"Done: {totals['scanned']} rows scanned, {totals['changed']} {verb}")
+        return totals
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-extract stored articles from raw_html")
+    parser.add_argument('source', choices=['dunya', 'ekonomist'])
+    parser.add_argument('--workers', type=int, help='extraction processes')
+    parser.add_argument('--batch', type=int, help='rows per batch')
+    parser.add_argument('--pause', type=float, help='seconds to sleep between batches')
+    parser.add_argument('--start-id', type=int, help='start after this id (overrides the checkpoint)')
+    parser.add_argument('--end-id', type=int, help='stop at this id')
+    parser.add_argument('--restart', action='store_true', help='ignore the saved checkpoint')
+    parser.add_argument('--dry-run', action='store_true', help='count changes without writing')
+    args = parser.parse_args()
+
+    ReExtractor(args.source, args.workers, args.batch, args.pause, args.dry_run).run(
+        args.start_id, args.end_id, args.restart)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Headless-browser rendering tier for JS-dependent pages
+
+Keeps one Chromium instance with a small pool of persistent browser contexts
+(cookies and cache survive between pages) and blocks images, media, fonts and
+analytics requests so a render only waits for the document and its scripts.
+The crawlers use it only as a fallback, when static extraction of a fetched
+page comes back empty ("No content found").
+
+Playwright's sync API is bound to the thread that started it, so a pool must
+be created and used from a single crawler thread.
+
+Setup:
+    pip install playwright && playwright install chromium
+
+Self-test against a local static server:
+    python3 render_pool.py --selftest
+Render one URL:
+    python3 render_pool.py https://www.dunya.com/gundem/...
+"""
+
+import sys
+import time
+from itertools import cycle
+from urllib.parse import urlparse
+from mysql_config import RENDER_CONFIG
+from fetch_utils import FetchedPage
+
+
+class BrowserRenderPool:
+    """Pool of persistent Playwright browser contexts"""
+
+    def __init__(self, pool_size: int = None, log=print):
+        self.pool_size = pool_size or RENDER_CONFIG['pool_size']
+        self.log = log
+        self.playwright = None
+        self.browser = None
+        self.contexts = []
+        self.pages_rendered = {}
+        self.next_context = None
+        self.blocked_requests = 0
+        self.disabled = False  # Set once the browser cannot be started or used
+
+    def start(self):
+        """Launch the browser and open the contexts"""
+        try:
+            from playwright.sync_api import sync_playwright
+        except ImportError:
+            self.log("Playwright is not installed - rendering fallback disabled")
+            return False
+
+        self.playwright = sync_playwright().start()
+        self.browser = self.playwright.chromium.launch(headless=True)
+        self.contexts = [self._new_context() for _ in range(self.pool_size)]
+        self.next_context = cycle(range(self.pool_size))
+        self.log(f"Render pool started with {self.pool_size} browser contexts")
+        return True
+
+    def _new_context(self):
+        context = self.browser.new_context(
+            user_agent=RENDER_CONFIG['user_agent'],
+            locale='tr-TR',
+            java_script_enabled=True
+        )
+        context.set_default_navigation_timeout(RENDER_CONFIG['navigation_timeout_ms'])
+        context.route('**/*', self._filter_request)
+        self.pages_rendered[id(context)] = 0
+        return context
+
+    def _filter_request(self, route):
+        """Abort requests that cost render time but carry no article content"""
+        request = route.request
+        host = urlparse(request.url).netloc
+        if (request.resource_type in RENDER_CONFIG['blocked_resource_types']
+                or any(host == domain or host.endswith('.' + domain)
+                       for domain in RENDER_CONFIG['blocked_domains'])):
+            self.blocked_requests += 1
+            return route.abort()
+        return route.continue_()
+
+    def _checkout_context(self):
+        """Round-robin over the pool, recycling contexts that rendered too many pages"""
+        index = next(self.next_context)
+        context = self.contexts[index]
+        if self.pages_rendered[id(context)] >= RENDER_CONFIG['max_pages_per_context']:
+            self.pages_rendered.pop(id(context), None)
+            context.close()
+            context = self._new_context()
+            self.contexts[index] = context
+        self.pages_rendered[id(context)] += 1
+        return context
+
+    def render(self, url: str, wait_for_selector: str = None):
+        """Render a URL and return its final DOM as a FetchedPage (None on failure)"""
+        if self.disabled:
+            return None
+        try:
+            if self.browser is None and not self.start():
+                self.disabled = True
+                return None
+            page = self._checkout_context().new_page()
+        except Exception as e:
+            # Missing browser binary, crashed browser, ... - stop trying for the rest of the run
+            self.log(f"Render pool unavailable, rendering fallback disabled: {e}")
+            self.disabled = True
+            self.close()
+            return None
+
+        started = time.monotonic()
+        try:
+            response = page.goto(url, wait_until='domcontentloaded')
+            selector = wait_for_selector or RENDER_CONFIG['wait_for_selector']
+            if selector:
+                try:
+                    page.wait_for_selector(selector, timeout=RENDER_CONFIG['selector_timeout_ms'])
+                except Exception:
+                    pass  # Take whatever rendered - extraction decides if it is usable
+            html = page.content()
+            status = response.status if response else 200
+            self.log(f"Rendered {url[:80]} in {time.monotonic() - started:.2f}s")
+            return FetchedPage(page.url, status, {}, 'text/html', 'utf-8', html)
+        except Exception as e:
+            self.log(f"Render failed for {url}: {e}")
+            return None
+        finally:
+            page.close()
+
+    def close(self):
+        """Close the contexts, the browser and Playwright (safe after a failed start)"""
+        for resource in (*self.contexts, self.browser):
+            try:
+                if resource:
+                    resource.close()
+            except Exception:
+                pass
+        try:
+            if self.playwright:
+                self.playwright.stop()
+        except Exception:
+            pass
+        self.contexts = []
+        self.browser = None
+        self.playwright = None
+
+
+SELFTEST_PAGE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>Render test</title></head>
+<body>
+<h1 class="post-title">Statik baslik</h1>
+<img src="/missing-image.png">
+<div id="app"></div>
+<script>
+  document.getElementById('app').innerHTML =
+    '<div class="content-text">Bu metin JavaScript ile olusturuldu.</div>';
+</script>
+</body></html>
+"""
+
+
+def selftest():
+    """Render a JS-built page from a local static server"""
+    import os
+    import tempfile
+    import threading
+    from functools import partial
+    from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+    from bs4 import BeautifulSoup
+
+    with tempfile.TemporaryDirectory() as root:
+        with open(os.path.join(root, 'index.html'), 'w', encoding='utf-8') as f:
+            f.write(SELFTEST_PAGE)
+
+        handler = partial(SimpleHTTPRequestHandler, directory=root)
+        server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        url = f"http://127.0.0.1:{server.server_address[1]}/index.html"
+
+        pool = BrowserRenderPool(pool_size=1)
+        try:
+            page = pool.render(url, wait_for_selector='.content-text')
+        finally:
+            pool.close()
+            server.shutdown()
+
+    content = None
+    if page:
+        elem = BeautifulSoup(page.text, 'html.parser').find('div', class_='content-text')
+        content = elem.get_text(strip=True) if elem else None
+
+    print(f"Rendered content: {content!r}")
+    print(f"Blocked requests: {pool.blocked_requests}")
+    ok = content == 'Bu metin JavaScript ile olusturuldu.' and pool.blocked_requests >= 1
+    print("SELFTEST OK" if ok else "SELFTEST FAILED")
+    return ok
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == '--selftest':
+        sys.exit(0 if selftest() else 1)
+    if len(sys.argv) < 2:
+        print("Usage: python3 render_pool.py --selftest | <url>")
+        sys.exit(2)
+
+    pool = BrowserRenderPool(pool_size=1)
+    try:
+        page = pool.render(sys.argv[1])
+        print(page.text if page else "Render failed")
+    finally:
+        pool.close()
+
+
+if __name__ == "__main__":
+    main()
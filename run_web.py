@@ -1,16 +1,42 @@
 #!/usr/bin/env python3
 """
 Production runner for the News Crawler Web Application
+
+Serves the app with gunicorn (preloaded app, multiple workers and threads,
+settings in gunicorn_config.py). Use --dev for Flask's development server.
 """
 
 import os
 import sys
-from app import app
+from app import app, init_db_pool
+
+
+def run_gunicorn():
+    """Run the app under gunicorn with gunicorn_config.py settings"""
+    from gunicorn.app.base import BaseApplication
+    import gunicorn_config
+
+    class NewsCrawlerApplication(BaseApplication):
+        def load_config(self):
+            for key in dir(gunicorn_config):
+                if key.startswith('_') or key.lower() not in self.cfg.settings:
+                    continue
+                self.cfg.set(key.lower(), getattr(gunicorn_config, key))
+
+        def load(self):
+            return app
+
+    NewsCrawlerApplication().run()
+
 
 if __name__ == '__main__':
     # Set environment variables for production
     os.environ['FLASK_ENV'] = 'production'
     os.environ['FLASK_DEBUG'] = 'False'
-    
-    # Run the application
-    app.run(host='0.0.0.0', port=5000, debug=False)
+
+    if '--dev' in sys.argv:
+        # Single-process development server
+        init_db_pool()
+        app.run(host='0.0.0.0', port=5000, debug=False)
+    else:
+        run_gunicorn()
@@ -0,0 +1,132 @@
+from datetime import date, datetime
+
+import pytest
+
+pytest.importorskip('mysql.connector')
+
+import article_archive
+from article_archive import ArticleArchiver, month_bounds, read_archived_html
+from mysql_config import TABLE_NAMES
+
+ARTICLES = TABLE_NAMES['dunya_articles']
+INDEX = TABLE_NAMES['archive_index']
+
+
+class FakeDatabase:
+    """Just the statements the archiver issues, against in-memory rows"""
+
+    def __init__(self, articles):
+        self.articles = articles  # id -> dict(news_visible_datetime, crawl_datetime, raw_html, html_status)
+        self.index = {}           # (source, article_id) -> (month, archive_file, original_html_status)
+        self.commits = 0
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def commit(self):
+        self.commits += 1
+
+
+class FakeCursor:
+    def __init__(self, db):
+        self.db = db
+        self.result = []
+
+    def execute(self, sql, params=()):
+        sql = ' '.join(sql.split())
+        if sql.startswith(f'SELECT id, raw_html, html_status FROM {ARTICLES}'):
+            last_id, month_start, month_end, _, _, limit = params
+            rows = []
+            for article_id, row in sorted(self.db.articles.items()):
+                # IN_MONTH: the visible date, or the crawl date when there is none
+                day = (row['news_visible_datetime'] or row['crawl_datetime']).date()
+                if article_id > last_id and month_start <= day < month_end and row['raw_html']:
+                    rows.append((article_id, row['raw_html'], row['html_status']))
+            self.result = rows[:limit]
+        elif sql.startswith(f'SELECT article_id, archive_file, original_html_status FROM {INDEX}'):
+            source, month = params
+            self.result = [(article_id, archive_file, status)
+                           for (entry_source, article_id), (entry_month, archive_file, status) in self.db.index.items()
+                           if entry_source == source and entry_month == month]
+        elif sql.startswith(f'SELECT archive_file FROM {INDEX}'):
+            entry = self.db.index.get(tuple(params))
+            self.result = [(entry[1],)] if entry else []
+        else:
+            raise AssertionError(sql)
+
+    def executemany(self, sql, rows):
+        sql = ' '.join(sql.split())
+        for params in rows:
+            if sql.startswith(f'INSERT IGNORE INTO {INDEX}'):
+                source, article_id, month, archive_file, _, status, _ = params
+                self.db.index.setdefault((source, article_id), (month, archive_file, status))
+            elif sql.startswith(f"UPDATE {ARTICLES} SET raw_html = '', html_status = 'archived'"):
+                self.db.articles[params[0]].update(raw_html='', html_status='archived')
+            elif sql.startswith(f'UPDATE {ARTICLES} SET raw_html = %s, html_status = %s'):
+                raw_html, status, article_id = params
+                self.db.articles[article_id].update(raw_html=raw_html, html_status=status)
+            elif sql.startswith(f'DELETE FROM {INDEX}'):
+                del self.db.index[tuple(params)]
+            else:
+                raise AssertionError(sql)
+
+    def fetchall(self):
+        return self.result
+
+    def fetchone(self):
+        return self.result[0] if self.result else None
+
+    def close(self):
+        pass
+
+
+def article(visible, crawled, raw_html, status='success'):
+    return {'news_visible_datetime': visible, 'crawl_datetime': crawled, 'raw_html': raw_html, 'html_status': status}
+
+
+@pytest.fixture
+def archive_dir(tmp_path, monkeypatch):
+    monkeypatch.setitem(article_archive.ARCHIVE_CONFIG, 'archive_dir', str(tmp_path))
+    return tmp_path
+
+
+def test_month_bounds_cross_the_year():
+    assert month_bounds('2025-01') == (date(2025, 1, 1), date(2025, 2, 1))
+    assert month_bounds('2024-12') == (date(2024, 12, 1), date(2025, 1, 1))
+
+
+def test_archive_restore_and_read_round_trip(archive_dir):
+    db = FakeDatabase({
+        1: article(datetime(2025, 1, 31, 23, 59), datetime(2025, 2, 1), '<p>ocak sonu</p>'),
+        2: article(None, datetime(2025, 1, 10), '<p>tarihsiz</p>', 'duplicate'),  # crawl date decides
+        3: article(datetime(2025, 2, 1), datetime(2025, 1, 30), '<p>subat</p>'),  # visible date wins
+        4: article(datetime(2025, 1, 5), datetime(2025, 1, 5), ''),               # nothing to move
+    })
+    archiver = ArticleArchiver(batch_size=1, log=lambda message: None)
+
+    assert archiver.archive_month(db, 'dunya', '2025-01') == 2
+    assert sorted(db.index) == [('dunya', 1), ('dunya', 2)]
+    assert db.articles[1]['html_status'] == db.articles[2]['html_status'] == 'archived'
+    assert db.articles[1]['raw_html'] == ''
+    assert db.articles[3]['raw_html'] == '<p>subat</p>'
+    assert (archive_dir / 'dunya' / '2025-01.zip').exists()
+
+    # Archived HTML is served from the zip
+    assert read_archived_html(db.cursor(), 'dunya', 2) == '<p>tarihsiz</p>'
+    assert read_archived_html(db.cursor(), 'dunya', 3) is None
+
+    # Rerunning after a completed month moves nothing
+    assert archiver.archive_month(db, 'dunya', '2025-01') == 0
+
+    # An index entry without a zip entry is reported and left archived
+    db.articles[5] = article(datetime(2025, 1, 3), datetime(2025, 1, 3), '', 'archived')
+    db.index[('dunya', 5)] = ('2025-01', 'dunya/2025-01.zip', 'success')
+    messages = []
+    archiver.log = messages.append
+
+    assert archiver.restore_month(db, 'dunya', '2025-01') == 2
+    assert db.articles[1] == article(datetime(2025, 1, 31, 23, 59), datetime(2025, 2, 1), '<p>ocak sonu</p>')
+    assert db.articles[2]['html_status'] == 'duplicate'  # Original status comes back
+    assert db.articles[5]['html_status'] == 'archived'
+    assert list(db.index) == [('dunya', 5)]
+    assert len(messages) == 1 and '1 article(s) not in dunya/2025-01.zip' in messages[0]
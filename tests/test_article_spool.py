@@ -0,0 +1,72 @@
+import threading
+
+import pytest
+
+pytest.importorskip('mysql.connector')
+
+import article_spool
+
+
+def test_one_shared_spool_and_replayer_per_process(tmp_path, monkeypatch):
+    monkeypatch.setattr(article_spool, 'get_spool_path', lambda: str(tmp_path / 'spool.sqlite3'))
+
+    first = article_spool.get_shared_spool(lambda: None)
+    second = article_spool.get_shared_spool(lambda: None)
+    try:
+        assert first is second
+        replayers = [thread for thread in threading.enumerate() if thread.name == 'spool-replayer']
+        assert replayers == [first.replayer]
+    finally:
+        first.close()
+
+    # A closed spool is not handed out again
+    third = article_spool.get_shared_spool(lambda: None)
+    assert third is not first
+    third.close()
+
+
+class FailingConnection:
+    """Fails on the rollup write, after the article insert went through"""
+
+    def __init__(self):
+        self.calls = []
+
+    def start_transaction(self):
+        self.calls.append('start_transaction')
+
+    def cursor(self):
+        return self
+
+    def execute(self, sql, params=()):
+        if 'article_daily_stats' in sql:
+            raise article_spool.mysql.connector.Error('lost connection')
+        self.rowcount = 0
+
+    def executemany(self, sql, rows):
+        self.calls.append('insert')
+        self.rowcount = len(rows)
+
+    def fetchall(self):
+        return [(1, 'https://example.com/a')] if 'insert' in self.calls else []
+
+    def commit(self):
+        self.calls.append('commit')
+
+    def rollback(self):
+        self.calls.append('rollback')
+
+    def close(self):
+        self.calls.append('close')
+
+
+def test_replay_rolls_back_a_partial_batch_and_keeps_it_spooled(tmp_path, monkeypatch):
+    monkeypatch.setitem(article_spool.DEDUP_CONFIG, 'enabled', False)
+    spool = article_spool.ArticleSpool(str(tmp_path / 'spool.sqlite3'), log=lambda message: None)
+    spool.append('dunya', {column: '' for column in article_spool.ARTICLE_COLUMNS}
+                 | {'news_url': 'https://example.com/a'})
+
+    conn = FailingConnection()
+    assert spool.replay(lambda: conn) == 0
+    assert conn.calls == ['start_transaction', 'insert', 'rollback', 'close']
+    assert spool.pending_count() == 1
+    spool.db.close()
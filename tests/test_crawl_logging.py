@@ -0,0 +1,44 @@
+import json
+import logging
+import threading
+
+from crawl_logging import JsonFormatter, LogSampler
+
+
+def test_sampler_logs_first_records_then_every_nth():
+    sampler = LogSampler(first=3, every=10)
+    logged = [n for n in range(1, 41) if sampler.should_log('fetch_article')]
+    assert logged == [1, 2, 3, 10, 20, 30, 40]
+
+
+def test_sampler_counts_each_kind_separately():
+    sampler = LogSampler(first=1, every=0)
+    assert sampler.should_log('a') == 1
+    assert sampler.should_log('b') == 1
+    assert sampler.should_log('a') == 0  # every=0: nothing after the first records
+
+
+def test_sampler_counts_are_exact_across_threads():
+    sampler = LogSampler(first=0, every=1000)
+    hits = []
+
+    def worker():
+        hits.extend(count for count in (sampler.should_log('x') for _ in range(1000)) if count)
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sampler.counts['x'] == 8000
+    assert sorted(hits) == [1000 * n for n in range(1, 9)]
+
+
+def test_json_formatter_keeps_extra_fields():
+    record = logging.makeLogRecord({'msg': 'Saved %s', 'args': ('x',), 'levelname': 'INFO',
+                                    'url': 'https://example.com/a', 'occurrence': 7})
+    entry = json.loads(JsonFormatter().format(record))
+    assert entry['msg'] == 'Saved x'
+    assert entry['url'] == 'https://example.com/a'
+    assert entry['occurrence'] == 7
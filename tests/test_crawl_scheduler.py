@@ -0,0 +1,68 @@
+import pytest
+
+connector = pytest.importorskip('mysql.connector')
+
+import crawl_scheduler
+from crawl_scheduler import SourceJob
+
+
+class FakeScheduler:
+    def __init__(self):
+        self.messages = []
+        self.waits = iter([False, True])  # One loop iteration, then stop
+        self.stop_event = self
+
+    def wait(self, delay):
+        return next(self.waits)
+
+    def log(self, message):
+        self.messages.append(message)
+
+    def write_status(self):
+        pass
+
+
+class LockConnection:
+    def __init__(self, held):
+        self.held = held
+        self.closed = False
+
+    def cursor(self):
+        return self
+
+    def execute(self, sql, params=()):
+        pass
+
+    def fetchone(self):
+        return (0 if self.held else 1,)
+
+    def close(self):
+        self.closed = True
+
+
+def job():
+    return SourceJob('dunya', {'interval_minutes': 60}, FakeScheduler())
+
+
+def test_mysql_outage_is_not_reported_as_a_held_lock(monkeypatch):
+    def connect(**config):
+        raise connector.Error('Can\'t connect to MySQL server')
+
+    monkeypatch.setattr(crawl_scheduler.mysql.connector, 'connect', connect)
+    source = job()
+    source.loop()
+
+    [message] = source.scheduler.messages
+    assert 'MySQL unavailable for the run lock' in message
+    assert source.status['last_error'].startswith('lock unavailable')
+
+
+def test_held_lock_skips_the_slot(monkeypatch):
+    conn = LockConnection(held=True)
+    monkeypatch.setattr(crawl_scheduler.mysql.connector, 'connect', lambda **config: conn)
+    source = job()
+
+    assert source.acquire_lock() is None
+    assert conn.closed
+    source.loop()
+    assert source.scheduler.messages == ['[dunya] another run holds the lock - skipping this slot']
@@ -0,0 +1,47 @@
+import pytest
+
+pytest.importorskip('mysql.connector')
+
+from daily_stats import record_daily_stats, remove_daily_stats
+from mysql_config import TABLE_NAMES
+
+
+class RecordingCursor:
+    def __init__(self):
+        self.statements = []
+
+    def execute(self, sql, params=()):
+        self.statements.append((' '.join(sql.split()), params))
+
+
+def test_record_upserts_the_new_rows_by_day():
+    cursor = RecordingCursor()
+    record_daily_stats(cursor, 'dunya', [7, 9])
+
+    [(sql, params)] = cursor.statements
+    assert sql.startswith(f"INSERT INTO {TABLE_NAMES['daily_stats']} ")
+    assert f"FROM {TABLE_NAMES['dunya_articles']} WHERE id IN (%s, %s) GROUP BY day" in sql
+    # A day that already has a rollup row is added to, not overwritten
+    assert 'ON DUPLICATE KEY UPDATE articles = articles + VALUES(articles)' in sql
+    assert 'html_success = html_success + VALUES(html_success)' in sql
+    assert params == ('dunya', 7, 9)
+
+
+def test_remove_subtracts_the_rows_from_their_days():
+    cursor = RecordingCursor()
+    remove_daily_stats(cursor, 'ekonomist', [3])
+
+    [(sql, params)] = cursor.statements
+    assert sql.startswith(f"UPDATE {TABLE_NAMES['daily_stats']} d JOIN (")
+    assert f"FROM {TABLE_NAMES['ekonomist_articles']} WHERE id IN (%s) GROUP BY day" in sql
+    assert 'ON d.source = r.source AND d.day = r.day' in sql
+    assert 'd.articles = d.articles - r.articles' in sql
+    assert 'd.body_chars = d.body_chars - r.body_chars' in sql
+    assert params == ('ekonomist', 3)
+
+
+def test_no_ids_writes_nothing():
+    cursor = RecordingCursor()
+    record_daily_stats(cursor, 'dunya', [])
+    remove_daily_stats(cursor, 'dunya', [])
+    assert cursor.statements == []
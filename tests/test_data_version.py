@@ -0,0 +1,75 @@
+import threading
+
+import pytest
+
+import data_version
+from mysql_config import CACHE_CONFIG
+
+
+@pytest.fixture
+def file_store(tmp_path, monkeypatch):
+    monkeypatch.setitem(CACHE_CONFIG, 'version_store', 'file')
+    monkeypatch.setitem(CACHE_CONFIG, 'version_file', str(tmp_path / 'data_version'))
+    monkeypatch.setattr(data_version, '_cached_version', None)
+
+
+def test_file_stamp_increases_and_is_read_back(file_store):
+    assert data_version.read_data_version() == 0
+    first = data_version.bump_data_version()
+    second = data_version.bump_data_version()
+    assert second > first
+    assert data_version.read_data_version() == second
+    assert data_version.get_data_version() == second
+
+
+def test_last_stamp_is_kept_while_the_store_is_unreachable(monkeypatch):
+    monkeypatch.setitem(CACHE_CONFIG, 'version_check_interval', 0)
+    monkeypatch.setattr(data_version, '_cached_version', None)
+    reads = iter([42, None, 43])
+    monkeypatch.setattr(data_version, 'read_data_version', lambda: next(reads))
+
+    assert data_version.get_data_version() == 42
+    assert data_version.get_data_version() == 42  # MySQL down: caches stay valid
+    assert data_version.get_data_version() == 43
+
+
+def test_mysql_stamp_is_one_shared_row(monkeypatch):
+    connector = pytest.importorskip('mysql.connector')
+    statements = []
+
+    class Connection:
+        def cursor(self):
+            return self
+
+        def execute(self, sql, params=()):
+            statements.append((' '.join(sql.split()), params))
+
+        def fetchone(self):
+            return (7,)
+
+        def close(self):
+            pass
+
+    monkeypatch.setitem(CACHE_CONFIG, 'version_store', 'mysql')
+    monkeypatch.setattr(connector, 'connect', lambda **config: Connection())
+    monkeypatch.setattr(data_version, '_table_ready', True)
+
+    assert data_version.bump_data_version() == 7
+    upsert, params = statements[0]
+    assert upsert.startswith("INSERT INTO data_version (name, version, updated_datetime) VALUES ('articles', %s, NOW())")
+    assert 'ON DUPLICATE KEY UPDATE version = GREATEST(version + 1, VALUES(version))' in upsert
+    assert data_version.read_data_version() == 7
+
+
+def test_concurrent_file_bumps_leave_a_valid_stamp(file_store, tmp_path):
+    results = []
+    threads = [threading.Thread(target=lambda: results.extend(data_version.bump_data_version() for _ in range(20)))
+               for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(results) == 160 and None not in results  # No bump lost its temp file to another thread
+    assert data_version.read_data_version() in results
+    assert [path.name for path in tmp_path.iterdir()] == ['data_version']  # No temp files left behind
@@ -0,0 +1,110 @@
+import time
+
+import pytest
+
+pytest.importorskip('mysql.connector')
+
+from db_routing import ReplicaLagMonitor
+from mysql_config import REPLICA_CONFIG
+
+
+class FakeConnection:
+    def __init__(self, status):
+        self.status = status
+        self.closed = False
+
+    def cursor(self, dictionary=False):
+        return FakeCursor(self.status)
+
+    def close(self):
+        self.closed = True
+
+
+class FakeCursor:
+    def __init__(self, status):
+        self.status = status
+
+    def execute(self, query):
+        pass
+
+    def fetchone(self):
+        return self.status
+
+    def fetchall(self):
+        return []
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def lag_check(monkeypatch):
+    monkeypatch.setitem(REPLICA_CONFIG, 'lag_check', 'replica_status')
+
+
+def monitor_for(status):
+    return ReplicaLagMonitor(lambda: FakeConnection(status), log=lambda message: None)
+
+
+def test_replica_within_max_lag_is_usable(lag_check):
+    monitor = monitor_for({'Seconds_Behind_Source': 2})
+    assert monitor.check()
+    assert monitor.lag == 2.0
+
+
+def test_lagging_or_stopped_replica_falls_back_to_primary(lag_check):
+    assert not monitor_for({'Seconds_Behind_Source': REPLICA_CONFIG['max_lag_seconds'] + 1}).check()
+    assert not monitor_for({'Seconds_Behind_Source': None}).check()  # replication stopped
+    assert not monitor_for(None).check()  # not a replica
+    assert not ReplicaLagMonitor(lambda: None, log=lambda message: None).check()  # unreachable
+
+
+def test_failed_connection_blocks_the_replica_for_a_while(lag_check):
+    monitor = monitor_for({'Seconds_Behind_Source': 0})
+    monitor.check()
+    monitor.checked_at = time.monotonic()
+    monitor.mark_failed()
+    assert not monitor.replica_usable()
+
+
+def test_fresh_data_version_stays_on_the_primary(lag_check):
+    monitor = monitor_for({'Seconds_Behind_Source': 3})
+    monitor.check()
+    margin = 3 + REPLICA_CONFIG['lag_check_interval']
+
+    just_written = time.time_ns()
+    assert not monitor.has_caught_up(just_written)
+    assert monitor.has_caught_up(time.time_ns() - int((margin + 1) * 1e9))
+    assert monitor.has_caught_up(0)  # nothing written yet
+
+
+def test_unknown_lag_assumes_the_worst(lag_check):
+    monitor = monitor_for(None)
+    monitor.check()
+    recent = time.time_ns() - int(REPLICA_CONFIG['max_lag_seconds'] * 1e9)
+    assert not monitor.has_caught_up(recent)
+
+
+def test_app_reads_from_primary_right_after_a_write(monkeypatch):
+    pytest.importorskip('flask')
+    import app
+
+    monitor = monitor_for({'Seconds_Behind_Source': 0})
+    monitor.usable = True
+    monitor.lag = 0.0
+    monitor.checked_at = time.monotonic()
+    routes = []
+    monkeypatch.setattr(app, 'replica_monitor', monitor)
+    monkeypatch.setattr(app, 'get_replica_connection', lambda: routes.append('replica') or 'replica-conn')
+    monkeypatch.setattr(app, 'get_mysql_connection', lambda: routes.append('primary') or 'primary-conn')
+
+    monkeypatch.setattr(app, 'get_data_version', lambda: time.time_ns())
+    assert app.get_read_connection() == 'primary-conn'
+
+    monkeypatch.setattr(app, 'get_data_version', lambda: time.time_ns() - int(60e9))
+    assert app.get_read_connection() == 'replica-conn'
+
+    # A replica that refuses connections is skipped and blocked
+    monkeypatch.setattr(app, 'get_replica_connection', lambda: None)
+    assert app.get_read_connection() == 'primary-conn'
+    assert not monitor.replica_usable()
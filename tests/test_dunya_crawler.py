@@ -0,0 +1,143 @@
+from datetime import date, timedelta
+
+import pytest
+
+pytest.importorskip('requests')
+pytest.importorskip('bs4')
+pytest.importorskip('mysql.connector')
+
+from dunya_crawler_mysql import DunyaCrawlerMySQL
+
+
+@pytest.fixture
+def crawler():
+    return DunyaCrawlerMySQL.__new__(DunyaCrawlerMySQL)  # Pure logic only - no DB, session or logging
+
+
+def listing(count: int, newest: date, per_day: int = 3):
+    """Newest-first article dates, per_day articles per day"""
+    return [newest - timedelta(days=index // per_day) for index in range(count)]
+
+
+def brute_force_bounds(dates, start, end):
+    inside = [index for index, value in enumerate(dates) if start <= value <= end]
+    if not inside:
+        older = [index for index, value in enumerate(dates) if value < start]
+        first_older = older[0] if older else len(dates)
+        return first_older, first_older
+    return inside[0], inside[-1] + 1
+
+
+def test_bounds_match_a_full_scan_for_every_range(crawler):
+    dates = listing(20, date(2025, 9, 30))
+    days = sorted(set(dates))
+    for start in days:
+        for end in days:
+            if start > end:
+                continue
+            lo, hi = crawler.find_range_bounds(lambda index: dates[index], len(dates), start, end)
+            expected = brute_force_bounds(dates, start, end)
+            # Empty slices may sit anywhere between the newer and older articles
+            assert (lo, hi) == expected or (lo == hi and expected[0] == expected[1])
+
+
+def test_range_outside_the_page(crawler):
+    dates = listing(20, date(2025, 9, 30))
+    newer = date(2025, 10, 5), date(2025, 10, 9)
+    older = date(2025, 1, 1), date(2025, 1, 31)
+    assert crawler.find_range_bounds(lambda index: dates[index], 20, *newer) == (0, 0)
+    assert crawler.find_range_bounds(lambda index: dates[index], 20, *older) == (20, 20)
+
+
+def test_page_inside_the_range_costs_two_probes(crawler):
+    dates = listing(20, date(2025, 9, 30))
+    visited = []
+
+    def visit(index):
+        visited.append(index)
+        return dates[index]
+
+    assert crawler.find_range_bounds(visit, 20, date(2025, 1, 1), date(2025, 12, 31)) == (0, 20)
+    assert sorted(set(visited)) == [0, 19]
+
+
+def test_bisection_probes_logarithmically(crawler):
+    dates = listing(64, date(2025, 9, 30), per_day=1)
+    visited = set()
+
+    def visit(index):
+        visited.add(index)
+        return dates[index]
+
+    lo, hi = crawler.find_range_bounds(visit, 64, dates[40], dates[20])
+    assert (lo, hi) == (20, 41)
+    assert len(visited) <= 2 + 2 * 6
+
+
+def test_missing_date_falls_back_to_visiting_everything(crawler):
+    dates = listing(20, date(2025, 9, 30))
+    dates[1:19] = [None] * 18  # Only the ends show a date, so the first bisection probe has none
+    assert crawler.find_range_bounds(lambda index: dates[index], 20, date(2025, 9, 25), date(2025, 9, 28)) is None
+
+
+def test_out_of_order_card_falls_back_to_visiting_everything(crawler):
+    dates = listing(20, date(2025, 9, 30))
+    dates[0] = date(2025, 9, 1)  # Pinned older story above the newest ones
+    assert crawler.find_range_bounds(lambda index: dates[index], 20, date(2025, 9, 27), date(2025, 9, 28)) is None
+
+    # Disorder between two later probes is caught as well
+    dates = listing(20, date(2025, 9, 30))
+    dates[9] = date(2025, 9, 20)  # Older than the last card
+    assert crawler.find_range_bounds(lambda index: dates[index], 20, date(2025, 9, 25), date(2025, 9, 26)) is None
+
+
+def probed_listing(crawler, newest_per_page: dict):
+    """Serve get_page_date_range from a page -> newest date map, recording probes"""
+    crawler.page_dates = {}
+    probes = []
+
+    def get_page_date_range(page_num):
+        probes.append(page_num)
+        if newest_per_page.get(page_num) is not None:
+            crawler.page_dates[page_num] = newest_per_page[page_num]
+
+    crawler.get_page_date_range = get_page_date_range
+    return probes
+
+
+def test_last_page_is_found_with_few_probes(crawler):
+    pages = {page: date(2025, 9, 30) - timedelta(days=page) for page in range(1, 500)}
+    probes = probed_listing(crawler, pages)
+
+    assert crawler.find_last_page(5, pages[137]) == 137
+    assert len(probes) <= 2 * 8 + 1
+    assert len(probes) == len(set(probes))  # page dates are cached
+
+
+def test_last_page_stops_at_an_undated_page(crawler):
+    pages = {page: date(2025, 9, 30) - timedelta(days=page) for page in range(1, 40)}
+    probed_listing(crawler, pages)
+    assert crawler.find_last_page(5, date(2000, 1, 1)) == 39  # page 40 has no articles
+
+
+def test_page_ranges_are_disjoint_and_cover_every_page(crawler):
+    for first, last, parts in ((5, 137, 4), (1, 3, 8), (7, 7, 2)):
+        ranges = crawler.split_page_range(first, last, parts)
+        pages = [page for low, high in ranges for page in range(low, high + 1)]
+        assert pages == list(range(first, last + 1))
+        assert len(ranges) <= parts
+
+
+def test_partitioned_run_clears_its_range_even_when_it_fails(crawler, monkeypatch):
+    crawler.stats = {}
+    crawler.db_pool = object()
+    crawler.renderer = None
+    crawler.log = lambda message, **fields: None
+
+    def search():
+        assert crawler.save_range == (date(2025, 9, 1), date(2025, 9, 30))
+        raise RuntimeError('listing unreachable')
+
+    monkeypatch.setattr(crawler, 'smart_search_for_end_date', search)
+    assert crawler.run_partitioned_crawler('2025-09-01', '2025-09-30') == 0
+    assert crawler.save_range is None and crawler.claimed_urls is None
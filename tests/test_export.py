@@ -0,0 +1,67 @@
+import pytest
+
+pytest.importorskip('flask')
+mysql_connector = pytest.importorskip('mysql.connector')
+
+import app as web_app
+
+
+class FakeCursor:
+    """Unbuffered cursor: closing it with rows left raises like mysql.connector does"""
+
+    def __init__(self, rows):
+        self.rows = list(rows)
+
+    def execute(self, query, params=()):
+        pass
+
+    def fetchmany(self, size):
+        chunk, self.rows = self.rows[:size], self.rows[size:]
+        return chunk
+
+    def close(self):
+        if self.rows:
+            raise mysql_connector.errors.InternalError("Unread result found")
+
+
+class FakePooledConnection:
+    def __init__(self, pool, rows):
+        self.pool = pool
+        self.cursor_obj = FakeCursor(rows)
+        self.disconnected = False
+
+    def cursor(self, buffered=True):
+        return self.cursor_obj
+
+    def disconnect(self):
+        self.disconnected = True
+
+    def close(self):
+        self.pool.append(self)
+
+
+def make_rows(count):
+    return [(i, f"https://example.com/{i}", None, None, 'title', 'body', 1, 'success') for i in range(count)]
+
+
+def test_aborted_export_returns_connection_to_pool(monkeypatch):
+    pool = []
+    conn = FakePooledConnection(pool, make_rows(10))
+    monkeypatch.setattr(web_app, 'get_read_connection', lambda: conn)
+
+    rows = web_app._export_rows(['dunya'], None, None, False, chunk_size=2)
+    next(rows)
+    rows.close()  # client disconnected after the first chunk
+
+    assert pool == [conn]
+    assert conn.disconnected
+
+
+def test_finished_export_keeps_session(monkeypatch):
+    pool = []
+    conn = FakePooledConnection(pool, make_rows(3))
+    monkeypatch.setattr(web_app, 'get_read_connection', lambda: conn)
+
+    assert len(list(web_app._export_rows(['dunya'], None, None, False, chunk_size=2))) == 3
+    assert pool == [conn]
+    assert not conn.disconnected
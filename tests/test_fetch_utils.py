@@ -0,0 +1,232 @@
+import threading
+import time
+
+import pytest
+
+pytest.importorskip('requests')
+
+import fetch_utils
+from fetch_utils import (CircuitBreaker, CircuitOpenError, FetchCancelled, HostBudget, RequestHedger, SharedUrlSet,
+                         backoff_delay, hedged_fetch)
+from mysql_config import RETRY_CONFIG
+
+
+class FakeResponse:
+    def __init__(self, url, chunks, chunk_delay, log):
+        self.url = url
+        self.status_code = 200
+        self.headers = {'Content-Type': 'text/html; charset=utf-8'}
+        self.chunks = chunks
+        self.chunk_delay = chunk_delay
+        self.log = log
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def raise_for_status(self):
+        pass
+
+    def iter_content(self, chunk_size):
+        for chunk in self.chunks:
+            time.sleep(self.chunk_delay)
+            self.log.append(chunk)
+            yield chunk
+
+
+class FakeSession:
+    def __init__(self, chunk_delay, label):
+        self.headers = {}
+        self.cookies = {}
+        self.chunk_delay = chunk_delay
+        self.label = label
+        self.read = []
+
+    def get(self, url, **kwargs):
+        body = [self.label.encode()] + [b'.'] * 20
+        return FakeResponse(url, body, self.chunk_delay, self.read)
+
+
+class FixedLatency:
+    def __init__(self, delay):
+        self.delay = delay
+
+    def hedge_delay(self, url):
+        return self.delay
+
+    def record(self, url, seconds):
+        pass
+
+
+def test_hedge_wins_and_loser_is_cancelled_on_its_own_session():
+    created = []
+
+    def factory():
+        # First attempt is slow, the hedge is fast
+        session = FakeSession(0.05 if not created else 0.0, 'slow' if not created else 'fast')
+        created.append(session)
+        return session
+
+    template = FakeSession(0, 'template')
+    hedger = RequestHedger(pool_size=2, session_factory=factory)
+    page = hedged_fetch(hedger, template, 'https://example.com/a', FixedLatency(0.05))
+
+    assert page.text.startswith('fast')
+    assert template.read == []  # the crawler's own session is never used by an attempt
+    time.sleep(0.2)
+    slow = created[0]
+    assert 0 < len(slow.read) < 21  # stopped after the winner answered
+
+
+def test_fetch_page_honours_cancel():
+    cancel = threading.Event()
+    cancel.set()
+    with pytest.raises(FetchCancelled):
+        fetch_utils.fetch_page(FakeSession(0, 'x'), 'https://example.com/', cancel=cancel)
+
+
+def test_host_budget_limits_concurrency_and_spacing():
+    budget = HostBudget(concurrency=2, min_interval=0.05)
+    lock = threading.Lock()
+    state = {'in_flight': 0, 'peak': 0}
+    starts = []
+
+    def request():
+        with budget.slot('https://example.com/page'):
+            with lock:
+                state['in_flight'] += 1
+                state['peak'] = max(state['peak'], state['in_flight'])
+                starts.append(time.monotonic())
+            time.sleep(0.1)
+            with lock:
+                state['in_flight'] -= 1
+
+    threads = [threading.Thread(target=request) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    starts.sort()
+    assert state['peak'] == 2
+    assert all(b - a >= 0.045 for a, b in zip(starts, starts[1:]))
+
+
+def test_hedges_count_against_the_host_budget():
+    budget = HostBudget(concurrency=1, min_interval=0)
+    lock = threading.Lock()
+    state = {'in_flight': 0, 'peak': 0}
+
+    class CountingSession(FakeSession):
+        def get(self, url, **kwargs):
+            with lock:
+                state['in_flight'] += 1
+                state['peak'] = max(state['peak'], state['in_flight'])
+            time.sleep(0.05)
+            with lock:
+                state['in_flight'] -= 1
+            return super().get(url, **kwargs)
+
+    hedger = RequestHedger(pool_size=2, session_factory=lambda: CountingSession(0, 'x'))
+    hedged_fetch(hedger, FakeSession(0, 't'), 'https://example.com/a', FixedLatency(0.01), budget=budget)
+    time.sleep(0.1)
+    assert state['peak'] == 1
+
+
+def test_fetch_page_can_keep_the_raw_body():
+    session = FakeSession(0, 'gz')
+    page = fetch_utils.fetch_page(session, 'https://example.com/sitemap.xml.gz', decode=False)
+
+    assert page.content == b'gz' + b'.' * 20
+    assert page.text is None
+
+
+def test_released_url_can_be_claimed_again():
+    urls = SharedUrlSet()
+    assert urls.claim('https://example.com/a')
+    assert not urls.claim('https://example.com/a')
+
+    urls.release('https://example.com/a')
+    assert urls.claim('https://example.com/a')
+
+
+def test_backoff_delay_stays_under_the_exponential_ceiling():
+    for attempt in range(10):
+        ceiling = min(RETRY_CONFIG['backoff_max'], RETRY_CONFIG['backoff_base'] * 2 ** attempt)
+        for _ in range(50):
+            assert 0 <= backoff_delay(attempt) <= ceiling
+
+
+def test_backoff_delay_honours_retry_after_up_to_the_cap():
+    assert backoff_delay(0, retry_after=3) >= 3
+    assert backoff_delay(0, retry_after=10 ** 6) <= RETRY_CONFIG['backoff_max']
+
+
+def test_circuit_breaker_opens_half_opens_and_closes():
+    breaker = CircuitBreaker('example.com', log=lambda message: None)
+    for _ in range(breaker.failure_threshold - 1):
+        breaker.record_failure()
+    assert breaker.state == 'closed'
+    breaker.wait_until_allowed(max_wait=0)
+
+    breaker.record_failure()
+    assert breaker.state == 'open'
+    with pytest.raises(CircuitOpenError):
+        breaker.wait_until_allowed(max_wait=0)
+
+    # Cooldown over: the next request is a probe
+    breaker.open_until = time.monotonic() - 1
+    breaker.wait_until_allowed(max_wait=0)
+    assert breaker.state == 'half-open'
+
+    # A failed probe reopens the circuit with a longer cooldown
+    breaker.record_failure()
+    assert breaker.state == 'open'
+    assert breaker.current_cooldown == min(breaker.cooldown * 2, RETRY_CONFIG['breaker_max_cooldown_seconds'])
+
+    breaker.open_until = time.monotonic() - 1
+    breaker.wait_until_allowed(max_wait=0)
+    breaker.record_success()
+    assert breaker.state == 'closed'
+    assert breaker.failures == 0
+    assert breaker.current_cooldown == breaker.cooldown
+
+
+def test_half_open_circuit_lets_a_single_probe_through():
+    breaker = CircuitBreaker('example.com', log=lambda message: None)
+    for _ in range(breaker.failure_threshold):
+        breaker.record_failure()
+    breaker.open_until = time.monotonic() - 1
+
+    breaker.wait_until_allowed(max_wait=0)  # The probe
+    assert breaker.state == 'half-open'
+    with pytest.raises(CircuitOpenError):
+        breaker.wait_until_allowed(max_wait=0)  # Everyone else waits for its verdict
+
+    passed = threading.Event()
+    waiter = threading.Thread(target=lambda: (breaker.wait_until_allowed(), passed.set()))
+    waiter.start()
+    time.sleep(0.05)
+    assert not passed.is_set()
+
+    breaker.record_success()
+    waiter.join(timeout=2)
+    assert passed.is_set()
+
+
+def test_probe_without_a_verdict_hands_over_to_the_next_caller():
+    breaker = CircuitBreaker('example.com', log=lambda message: None)
+    for _ in range(breaker.failure_threshold):
+        breaker.record_failure()
+    breaker.open_until = time.monotonic() - 1
+    breaker.wait_until_allowed(max_wait=0)
+
+    breaker.release_probe()  # e.g. a 404: says nothing about the host
+    breaker.wait_until_allowed(max_wait=0)
+    assert breaker.state == 'half-open'
+
+    # A probe that never reports back stops blocking after one cooldown
+    breaker.probe_started = time.monotonic() - breaker.cooldown
+    breaker.wait_until_allowed(max_wait=0)
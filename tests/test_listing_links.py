@@ -0,0 +1,46 @@
+from datetime import date
+
+import pytest
+
+from listing_links import extract_listing_cards, extract_listing_links, extract_listing_links_soup
+
+BASE = 'https://www.dunya.com/gundem'
+
+LISTING_HTML = '''<!DOCTYPE html><html><body>
+<nav><a href="/ekonomi">Ekonomi</a><a href="https://www.dunya.com/gundem">Gundem</a></nav>
+<div class="card">
+  <a class="img" href="/gundem/faiz-karari-haberi-101"><img src="a.jpg"></a>
+  <a class="title" href="/gundem/faiz-karari-haberi-101">Faiz karari</a>
+  <time datetime="2025-09-30T10:00:00">30.09.2025</time>
+</div>
+<div class="card"><A TITLE="x" HREF='https://www.dunya.com/gundem/ihracat-rekor-haberi-102'>Ihracat</A></div>
+<div class="card"><a data-href="/gundem/hayalet-haberi-999" href=/gundem/kur-haberi-103>Kur</a></div>
+<div class="card"><a href="/gundem/borsa-haberi-104?utm=a&amp;ref=b">Borsa</a></div>
+<div class="card"><a
+   class="multi-line"
+   href="/gundem/enflasyon-haberi-105">Enflasyon</a></div>
+<footer><a href="/yazarlar/yazar-haberi-1">Yazar</a><a name="top">Top</a></footer>
+</body></html>'''
+
+
+def test_regex_finds_unique_article_links_in_page_order():
+    assert extract_listing_links(LISTING_HTML, BASE) == [
+        'https://www.dunya.com/gundem/faiz-karari-haberi-101',
+        'https://www.dunya.com/gundem/ihracat-rekor-haberi-102',
+        'https://www.dunya.com/gundem/kur-haberi-103',
+        'https://www.dunya.com/gundem/borsa-haberi-104?utm=a&ref=b',
+        'https://www.dunya.com/gundem/enflasyon-haberi-105',
+    ]
+
+
+def test_regex_matches_the_soup_baseline():
+    pytest.importorskip('bs4')
+    expected = list(dict.fromkeys(extract_listing_links_soup(LISTING_HTML, BASE)))
+    assert extract_listing_links(LISTING_HTML, BASE) == expected
+
+
+def test_cards_carry_the_date_shown_next_to_their_links():
+    cards = extract_listing_cards(LISTING_HTML, BASE)
+    assert [url for url, _ in cards] == extract_listing_links(LISTING_HTML, BASE)
+    assert cards[0][1] == date(2025, 9, 30)  # <time datetime> of the first card
+    assert all(card_date is None for _, card_date in cards[1:4])
@@ -0,0 +1,53 @@
+import random
+
+from near_duplicates import (BANDS, NUM_PERM, band_hashes, compute_fingerprint, estimate_similarity,
+                             minhash, pack_signature, unpack_signature)
+
+WORDS = ('ekonomi piyasa dolar enflasyon faiz merkez bankasi borsa ihracat sanayi yatirim '
+         'uretim buyume istihdam butce vergi enerji petrol altin kur tahvil sirket hisse').split()
+
+
+def article(seed: int, words: int = 300):
+    rng = random.Random(seed)
+    return ' '.join(rng.choice(WORDS) for _ in range(words))
+
+
+def test_signature_is_deterministic_and_sized():
+    text = article(1)
+    assert minhash(text) == minhash(text)
+    assert len(minhash(text)) == NUM_PERM
+    assert minhash('') is None
+
+
+def test_near_duplicates_share_an_lsh_band():
+    original = article(1)
+    words = original.split()
+    words[150] = 'degisti'  # one-word edit, e.g. a corrected typo
+    edited = ' '.join(words)
+
+    sig_a, sig_b = minhash(original), minhash(edited)
+    assert estimate_similarity(sig_a, sig_b) >= 0.8
+    assert set(enumerate(band_hashes(sig_a))) & set(enumerate(band_hashes(sig_b)))
+
+
+def test_unrelated_articles_are_not_similar():
+    sig_a, sig_b = minhash(article(1)), minhash(article(2))
+    assert estimate_similarity(sig_a, sig_b) < 0.3
+    assert not set(enumerate(band_hashes(sig_a))) & set(enumerate(band_hashes(sig_b)))
+
+
+def test_band_hashes_fit_the_band_table():
+    bands = band_hashes(minhash(article(3)))
+    assert len(bands) == BANDS
+    assert all(0 <= value < 2 ** 64 for value in bands)  # BIGINT UNSIGNED
+
+
+def test_signature_round_trips_through_storage():
+    signature = minhash(article(4))
+    assert unpack_signature(pack_signature(signature)) == signature
+
+
+def test_short_bodies_are_not_fingerprinted():
+    assert compute_fingerprint('Kisa haber.') is None
+    assert compute_fingerprint('No content found') is None
+    assert compute_fingerprint(article(5)) is not None
@@ -0,0 +1,44 @@
+import pytest
+
+pytest.importorskip('requests')
+
+from render_pool import BrowserRenderPool
+
+
+class BrokenBrowser:
+    def __init__(self):
+        self.closed = False
+
+    def new_context(self, **kwargs):
+        raise RuntimeError('browser has disconnected')
+
+    def close(self):
+        self.closed = True
+
+
+def test_start_failure_disables_the_pool_and_logs_once(monkeypatch):
+    messages = []
+    pool = BrowserRenderPool(pool_size=1, log=messages.append)
+    browser = BrokenBrowser()
+
+    def start():
+        pool.browser = browser
+        pool._new_context()
+
+    monkeypatch.setattr(pool, 'start', start)
+
+    assert pool.render('https://www.dunya.com/a') is None
+    assert pool.render('https://www.dunya.com/b') is None
+    assert pool.disabled
+    assert len(messages) == 1 and 'rendering fallback disabled' in messages[0]
+    assert browser.closed and pool.browser is None
+
+
+def test_missing_playwright_is_not_retried(monkeypatch):
+    pool = BrowserRenderPool(pool_size=1, log=lambda message: None)
+    calls = []
+    monkeypatch.setattr(pool, 'start', lambda: calls.append(1) and False)
+
+    assert pool.render('https://www.dunya.com/a') is None
+    assert pool.render('https://www.dunya.com/b') is None
+    assert calls == [1]
@@ -0,0 +1,132 @@
+import math
+from datetime import date, timedelta
+
+import pytest
+
+pytest.importorskip('mysql.connector')
+
+import trending_keywords
+from trending_keywords import TrendingKeywords, pack_counts, tokenize
+from mysql_config import TRENDING_CONFIG
+
+
+@pytest.fixture
+def numeric():
+    pytest.importorskip('numpy')
+    pytest.importorskip('scipy')
+
+
+@pytest.fixture
+def trending():
+    job = TrendingKeywords.__new__(TrendingKeywords)  # No numpy check, no DB
+    job.log = lambda message: None
+    job.config = dict(TRENDING_CONFIG)
+    return job
+
+
+class FakeCursor:
+    """Serves canned results in order and records every write"""
+
+    def __init__(self, results=()):
+        self.results = list(results)
+        self.executed = []
+        self.inserted = []
+
+    def execute(self, sql, params=()):
+        self.executed.append((' '.join(sql.split()), params))
+
+    def executemany(self, sql, rows):
+        self.inserted.extend(rows)
+
+    def fetchone(self):
+        return self.results.pop(0)
+
+    def fetchall(self):
+        return self.results.pop(0)
+
+    def fetchmany(self, size):
+        return self.results.pop(0) if self.results else []
+
+    def close(self):
+        pass
+
+
+def test_tokenize_applies_turkish_case_rules_and_drops_stopwords():
+    assert tokenize('İSTANBUL ve IĞDIR borsası') == ['istanbul', 'ığdır', 'borsası']
+    assert tokenize('Enflasyon %3,5 oldu; faiz 2025 de') == ['enflasyon', 'faiz']
+    assert tokenize('ab abc') == ['abc']  # Tokens need three letters
+    assert tokenize('') == [] and tokenize(None) == []
+
+
+def test_pending_days_recheck_the_last_counted_days(trending, monkeypatch):
+    last_counted = date(2025, 9, 10)
+    cursor = FakeCursor([
+        (last_counted,),
+        [(date(2025, 9, 8), 20, 20),
+         (date(2025, 9, 9), 21, 20),     # A late article arrived after counting
+         (date(2025, 9, 10), 15, 15),
+         (date(2025, 9, 11), 12, None)]  # Not counted yet
+    ])
+
+    assert trending.pending_days(cursor, 'dunya', backfill_days=30) == [date(2025, 9, 9), date(2025, 9, 11)]
+    _, params = cursor.executed[1]
+    assert params[:2] == ('dunya', last_counted - timedelta(days=TRENDING_CONFIG['recheck_days']))
+
+
+def test_first_run_backfills(trending):
+    cursor = FakeCursor([(None,), []])
+    assert trending.pending_days(cursor, 'dunya', backfill_days=30) == []
+    _, params = cursor.executed[1]
+    assert params[1] == date.today() - timedelta(days=30)
+
+
+def test_count_days_gives_per_day_document_and_term_counts(trending, numeric):
+    days = [date(2025, 9, 1), date(2025, 9, 2)]
+    trending.config['batch_size'] = 2
+
+    class Connection:
+        def __init__(self):
+            self.cursor_ = FakeCursor([
+                [(days[0], 'enflasyon enflasyon faiz'), (days[1], 'enflasyon')],
+                [(days[1], 'faiz kuru'), (date(2025, 9, 5), 'enflasyon')],  # Outside the requested days
+            ])
+
+        def cursor(self):
+            return self.cursor_
+
+    terms, articles, doc_counts, term_counts = trending.count_days(Connection(), 'dunya', days)
+    column = {term: index for index, term in enumerate(terms)}
+
+    assert list(articles) == [1, 2]
+    assert doc_counts[0, column['enflasyon']] == 1 and term_counts[0, column['enflasyon']] == 2
+    assert doc_counts[1, column['faiz']] == 1 and doc_counts[1, column['kuru']] == 1
+    assert doc_counts[1, column['enflasyon']] == 1
+
+
+def test_burst_is_scored_against_the_smoothed_baseline(trending, numeric):
+    day = date(2025, 9, 10)
+    baseline = [(day - timedelta(days=offset), 10, 100, pack_counts(['piyasa', 'enflasyon'], [5, 1], [8, 1]))
+                for offset in (3, 2, 1)]
+    today = (day, 10, 120, pack_counts(['piyasa', 'enflasyon', 'nadir'], [5, 6, 2], [8, 9, 2]))
+    cursor = FakeCursor([baseline + [today]])
+
+    assert trending.score_day(cursor, 'dunya', day) == 1
+    [(source, scored_day, rank, term, score, tfidf, doc_count, doc_share, baseline_share)] = cursor.inserted
+
+    smoothing = TRENDING_CONFIG['smoothing']
+    expected_share = (3 + smoothing) / (30 + 2 * smoothing)
+    expected = 10 * expected_share
+    assert (source, scored_day, rank, term, doc_count) == ('dunya', day, 1, 'enflasyon', 6)
+    assert score == pytest.approx((6 - expected) / math.sqrt(expected))
+    assert baseline_share == pytest.approx(expected_share)
+    assert doc_share == pytest.approx(0.6)
+    assert tfidf == pytest.approx(9 / 120)  # In every window day: idf is 1
+    # 'piyasa' matches its baseline (no burst) and 'nadir' is under min_doc_count
+
+
+def test_too_little_history_is_not_scored(trending):
+    day = date(2025, 9, 10)
+    window = [(day - timedelta(days=1), 10, 100, b''), (day, 10, 100, b'')]
+    cursor = FakeCursor([window])
+    assert trending.score_day(cursor, 'dunya', day) == 0
+    assert cursor.executed[-1][0].startswith('DELETE FROM')  # Stale ranks are still cleared
@@ -0,0 +1,89 @@
+import pytest
+
+pytest.importorskip('flask')
+
+from web_cache import MemoryPageCache
+
+
+def test_memory_cache_evicts_least_recently_used():
+    cache = MemoryPageCache(max_entries=2)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    assert cache.get('a') == 1  # 'a' is now the most recently used
+
+    cache.set('c', 3)
+    assert cache.get('b') is None
+    assert cache.get('a') == 1
+    assert cache.get('c') == 3
+
+
+def test_memory_cache_overwrite_refreshes_entry():
+    cache = MemoryPageCache(max_entries=2)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    cache.set('a', 10)
+
+    cache.set('c', 3)
+    assert cache.get('a') == 10
+    assert cache.get('b') is None
+
+
+@pytest.fixture
+def api_client(monkeypatch):
+    from flask import Flask, jsonify
+    import web_cache
+
+    state = {'version': 1_700_000_000_000_000_000, 'calls': 0}
+    monkeypatch.setattr(web_cache, 'get_data_version', lambda: state['version'])
+
+    app = Flask(__name__)
+
+    @app.route('/api/items')
+    @web_cache.conditional_api
+    def items():
+        state['calls'] += 1
+        return jsonify({'items': ['x' * 40] * 100})
+
+    return app.test_client(), state
+
+
+def test_api_answers_304_for_a_matching_etag(api_client):
+    client, state = api_client
+    first = client.get('/api/items')
+    assert first.status_code == 200
+    assert first.headers['Cache-Control'] == 'no-cache'
+    etag = first.headers['ETag']
+
+    second = client.get('/api/items', headers={'If-None-Match': etag})
+    assert second.status_code == 304
+    assert second.headers['ETag'] == etag
+    assert state['calls'] == 1  # the view is not run for a 304
+
+
+def test_api_etag_changes_with_the_data_version(api_client):
+    client, state = api_client
+    etag = client.get('/api/items').headers['ETag']
+
+    state['version'] += 1
+    response = client.get('/api/items', headers={'If-None-Match': etag})
+    assert response.status_code == 200
+    assert response.headers['ETag'] != etag
+
+
+def test_api_answers_304_for_if_modified_since(api_client):
+    client, _ = api_client
+    last_modified = client.get('/api/items').headers['Last-Modified']
+
+    response = client.get('/api/items', headers={'If-Modified-Since': last_modified})
+    assert response.status_code == 304
+
+
+def test_api_compresses_large_payloads(api_client, monkeypatch):
+    import gzip
+    import web_cache
+
+    monkeypatch.setattr(web_cache, 'brotli', None)
+    client, _ = api_client
+    response = client.get('/api/items', headers={'Accept-Encoding': 'gzip'})
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert b'"items"' in gzip.decompress(response.get_data())
@@ -0,0 +1,45 @@
+import pytest
+
+pytest.importorskip('mysql.connector')
+
+from work_queue import CrawlFrontier
+
+
+class RecordingConnection:
+    def __init__(self, expired_exhausted=0):
+        self.statements = []
+        self.expired_exhausted = expired_exhausted
+
+    def cursor(self, dictionary=False):
+        return self
+
+    def execute(self, sql, params=()):
+        sql = ' '.join(sql.split())
+        self.statements.append((sql, params))
+        self.rowcount = self.expired_exhausted if "SET state = 'failed'" in sql else 0
+
+    def fetchall(self):
+        return []
+
+    def start_transaction(self):
+        pass
+
+    def commit(self):
+        pass
+
+
+def test_claim_never_rehands_an_expired_lease_past_max_attempts():
+    messages = []
+    frontier = CrawlFrontier('dunya', owner='host:1', log=messages.append)
+    frontier.max_attempts = 3
+    frontier.conn = RecordingConnection(expired_exhausted=2)
+
+    assert frontier.claim(batch_size=10) == []
+    (fail_sql, fail_params), (select_sql, select_params) = frontier.conn.statements
+
+    assert "SET state = 'failed'" in fail_sql
+    assert "state = 'leased' AND lease_expires < NOW() AND attempts >= %s" in fail_sql
+    assert fail_params == ('dunya', 3)
+    assert "(state = 'leased' AND lease_expires < NOW() AND attempts < %s)" in select_sql
+    assert select_params == ('dunya', 3, 10)
+    assert messages == ["Frontier: 2 expired tasks out of attempts, marked failed"]
@@ -0,0 +1,381 @@
+#!/usr/bin/env python3
+"""
+Trending keywords per source per day
+
+Article bodies are tokenised (Turkish lower-casing, letters only, stopwords
+removed) and counted as sparse document x term matrices. Each day is reduced
+to per-term document and occurrence counts, stored compressed in
+trending_day_terms, so history is tokenised once. A day's terms are then
+scored against the stored counts of the preceding
+TRENDING_CONFIG['baseline_days'] days:
+
+    burst  = (docs_today - expected) / sqrt(expected)
+             expected = articles_today * (docs_baseline + a) / (articles_baseline + 2a)
+    tfidf  = share of today's tokens * (log((1 + days) / (1 + days with the term)) + 1)
+
+The top terms by burst score are stored in trending_terms and served at
+/api/trending.
+
+Runs are incremental: only days whose article count in the daily rollup
+(daily_stats.py) differs from the stored count are re-tokenised (new days,
+today, late arrivals), then those days and the days after them are rescored.
+
+Usage:
+    python3 trending_keywords.py update [--source dunya] [--backfill-days 30]
+    python3 trending_keywords.py show dunya [YYYY-MM-DD]
+
+Needs numpy and scipy (the web app only reads the stored results).
+"""
+
+import re
+import json
+import zlib
+import argparse
+import mysql.connector
+from datetime import date, datetime, timedelta
+from mysql_config import MYSQL_CONFIG, TABLE_NAMES, TRENDING_CONFIG
+from data_version import bump_data_version
+
+try:
+    import numpy as np
+    from scipy import sparse
+except ImportError:  # Optional - only the batch job needs them
+    np = sparse = None
+
+SOURCES = ('dunya', 'ekonomist')
+
+TOKEN_RE = re.compile(r'[^\W\d_]{3,40}', re.UNICODE)
+
+TURKISH_STOPWORDS = frozenset('''
+    acaba ama ancak artık asla aslında az bana bazen bazı bazıları belki ben benden beni benim
+    beri bile bir birçok biri birkaç birkez birşey birşeyi biz bize bizden bizi bizim böyle
+    böylece bu buna bunda bundan bunlar bunları bunların bunu bunun burada bütün çok çünkü da
+    daha dahi dan de defa değil değin diye diğer diğeri dolayı dolayısıyla edecek eden ederek
+    edilecek ediliyor edilmesi ediyor eğer elbette en etmesi etti ettiği ettiğini fakat gibi göre
+    halen hangi hani hatta hem henüz hep hepsi her herhangi herkes herkese herkesi herkesin hiç
+    hiçbir için ile ilgili ise işte itibaren iyi kadar karşın kendi kendine kendini kendisi
+    kendisine kendisini kez ki kim kime kimi kimse kimsenin çoğu çoğunu madem mı mi mu mü nasıl
+    ne neden nedenle nerde nerede nereye niye niçin olan olarak oldu olduğu olduğunu oldukça
+    olmadı olmadığı olmak olması olmayan olmaz olsa olsun olup olur olursa oluyor ona ondan onlar
+    onlara onlardan onları onların onu onun orada öyle oysa pek rağmen sadece sanki sen senden
+    seni senin siz sizden sizi sizin şey şeyden şeyi şeyler şimdi şöyle şu şuna şunda şundan
+    şunları şunu tarafından tüm üzere var vardı ve veya veyahut ya yani yapacak yapılan yapılması
+    yapıyor yapmak yaptı yaptığı yaptığını yaptıkları yerine yine yoksa zaten
+    açıklama açıkladı belirtti dedi ifade kaydetti söyledi vurguladı yaptığı açıklamada haber
+    haberi habere yüzde milyon milyar bin yıl yılı yılın yılında ayında günü ocak şubat mart
+    nisan mayıs haziran temmuz ağustos eylül ekim kasım aralık pazartesi salı çarşamba perşembe
+    cuma cumartesi pazar dünya ekonomist
+'''.split())
+
+
+def tokenize(text: str):
+    """Lower-cased (Turkish rules) letter tokens without stopwords"""
+    if not text:
+        return []
+    text = text.replace('I', 'ı').replace('İ', 'i').lower()
+    return [token for token in TOKEN_RE.findall(text) if token not in TURKISH_STOPWORDS]
+
+
+def setup_trending_tables(cursor):
+    """Per-day term counts and the scored top terms"""
+    cursor.execute(f'''
+        CREATE TABLE IF NOT EXISTS {TABLE_NAMES['trending_day_terms']} (
+            source VARCHAR(20) NOT NULL,
+            day DATE NOT NULL,
+            articles INT NOT NULL,
+            total_terms INT NOT NULL,
+            term_counts MEDIUMBLOB,
+            computed_datetime DATETIME,
+            PRIMARY KEY (source, day)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    ''')
+    cursor.execute(f'''
+        CREATE TABLE IF NOT EXISTS {TABLE_NAMES['trending_terms']} (
+            source VARCHAR(20) NOT NULL,
+            day DATE NOT NULL,
+            rank_no SMALLINT NOT NULL,
+            term VARCHAR(100) NOT NULL,
+            score DOUBLE,
+            tfidf DOUBLE,
+            doc_count INT,
+            doc_share DOUBLE,
+            baseline_share DOUBLE,
+            PRIMARY KEY (source, day, rank_no)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    ''')
+
+
+def pack_counts(terms, doc_counts, term_counts):
+    return zlib.compress(json.dumps({
+        'terms': list(terms),
+        'df': [int(value) for value in doc_counts],
+        'tf': [int(value) for value in term_counts]
+    }, ensure_ascii=False).encode('utf-8'), 6)
+
+
+def unpack_counts(blob):
+    data = json.loads(zlib.decompress(blob).decode('utf-8'))
+    return data['terms'], np.asarray(data['df'], dtype=np.int64), np.asarray(data['tf'], dtype=np.int64)
+
+
+def query_trending(cursor, source: str, day: date = None, limit: int = 20):
+    """Top terms of one source for a day (default: the latest scored day)"""
+    if day is None:
+        cursor.execute(f"SELECT MAX(day) FROM {TABLE_NAMES['trending_terms']} WHERE source = %s", (source,))
+        day = cursor.fetchone()[0]
+        if day is None:
+            return None
+    cursor.execute(f'''
+        SELECT term, score, tfidf, doc_count, doc_share, baseline_share
+        FROM {TABLE_NAMES['trending_terms']}
+        WHERE source = %s AND day = %s
+        ORDER BY rank_no LIMIT %s
+    ''', (source, day, limit))
+    return {
+        'day': day.isoformat(),
+        'terms': [{
+            'term': row[0],
+            'score': round(row[1], 2),
+            'tfidf': round(row[2], 5),
+            'doc_count': row[3],
+            'doc_share': round(row[4], 4),
+            'baseline_share': round(row[5], 4)
+        } for row in cursor.fetchall()]
+    }
+
+
+class TrendingKeywords:
+    """Incremental per-day term counting and burst scoring"""
+
+    def __init__(self, log=print):
+        if np is None:
+            raise RuntimeError("numpy and scipy are required: pip install numpy scipy")
+        self.log = log
+        self.config = TRENDING_CONFIG
+
+    def get_mysql_connection(self):
+        """Get MySQL database connection"""
+        try:
+            return mysql.connector.connect(**MYSQL_CONFIG)
+        except mysql.connector.Error as e:
+            self.log(f"MySQL connection error: {e}")
+            return None
+
+    def pending_days(self, cursor, source: str, backfill_days: int):
+        """Days whose rollup article count differs from the counted one"""
+        cursor.execute(f"SELECT MAX(day) FROM {TABLE_NAMES['trending_day_terms']} WHERE source = %s", (source,))
+        last_day = cursor.fetchone()[0]
+        if last_day is None:
+            start = date.today() - timedelta(days=backfill_days)
+        else:
+            start = last_day - timedelta(days=self.config['recheck_days'])
+
+        cursor.execute(f'''
+            SELECT d.day, d.articles, t.articles
+            FROM {TABLE_NAMES['daily_stats']} d
+            LEFT JOIN {TABLE_NAMES['trending_day_terms']} t ON t.source = d.source AND t.day = d.day
+            WHERE d.source = %s AND d.day >= %s AND d.day <= %s
+            ORDER BY d.day
+        ''', (source, start, date.today()))
+        return [day for day, articles, counted in cursor.fetchall() if articles != counted]
+
+    def count_days(self, conn, source: str, days: list):
+        """Tokenise the bodies of the given days into per-day document/term counts"""
+        day_index = {day: number for number, day in enumerate(days)}
+        vocabulary = {}
+        parts = []  # per batch (df, tf) as COO pieces over (day, term id)
+        articles = np.zeros(len(days), dtype=np.int64)
+
+        cursor = conn.cursor()
+        cursor.execute(f'''
+            SELECT DATE(COALESCE(news_visible_datetime, crawl_datetime)) AS day, news_visible_body
+            FROM {TABLE_NAMES[f'{source}_articles']}
+            WHERE COALESCE(news_visible_datetime, crawl_datetime) >= %s
+              AND COALESCE(news_visible_datetime, crawl_datetime) < %s
+        ''', (days[0], days[-1] + timedelta(days=1)))
+
+        while True:
+            batch = cursor.fetchmany(self.config['batch_size'])
+            if not batch:
+                break
+            rows = [row for row in batch if row[0] in day_index]
+            if not rows:
+                continue
+            doc_days = np.fromiter((day_index[row[0]] for row in rows), dtype=np.int64, count=len(rows))
+            articles += np.bincount(doc_days, minlength=len(days))
+
+            token_ids = [[vocabulary.setdefault(token, len(vocabulary)) for token in tokenize(row[1])]
+                         for row in rows]
+            lengths = np.fromiter((len(ids) for ids in token_ids), dtype=np.int64, count=len(rows))
+            if not lengths.sum():
+                continue
+
+            # documents x terms (duplicates summed) -> days x terms via a day indicator matrix
+            doc_terms = sparse.csr_matrix(
+                (np.ones(lengths.sum(), dtype=np.int64),
+                 (np.repeat(np.arange(len(rows)), lengths), np.concatenate([ids for ids in token_ids if ids]))),
+                shape=(len(rows), len(vocabulary)))
+            day_docs = sparse.csr_matrix(
+                (np.ones(len(rows), dtype=np.int64), (doc_days, np.arange(len(rows)))),
+                shape=(len(days), len(rows)))
+            parts.append(((day_docs @ (doc_terms > 0).astype(np.int64)).tocoo(),
+                          (day_docs @ doc_terms).tocoo()))
+        cursor.close()
+
+        shape = (len(days), len(vocabulary))
+        doc_counts = sparse.csr_matrix(shape, dtype=np.int64)
+        term_counts = sparse.csr_matrix(shape, dtype=np.int64)
+        for df_part, tf_part in parts:
+            df_part.resize(shape)
+            tf_part.resize(shape)
+            doc_counts = doc_counts + df_part.tocsr()
+            term_counts = term_counts + tf_part.tocsr()
+
+        return np.array(list(vocabulary), dtype=object), articles, doc_counts, term_counts
+
+    def store_counts(self, conn, source: str, days: list, result):
+        terms, articles, doc_counts, term_counts = result
+        now = datetime.now().isoformat()
+        cursor = conn.cursor()
+        for number, day in enumerate(days):
+            df_row = doc_counts.getrow(number)
+            tf_row = term_counts.getrow(number)
+            keep = df_row.indices[df_row.data >= self.config['store_min_doc_count']]
+            total_terms = int(tf_row.sum())
+            blob = pack_counts(terms[keep], df_row[0, keep].toarray().ravel(), tf_row[0, keep].toarray().ravel())
+            cursor.execute(f'''
+                REPLACE INTO {TABLE_NAMES['trending_day_terms']}
+                (source, day, articles, total_terms, term_counts, computed_datetime)
+                VALUES (%s, %s, %s, %s, %s, %s)
+            ''', (source, day, int(articles[number]), total_terms, blob, now))
+        conn.commit()
+        cursor.close()
+
+    def score_day(self, cursor, source: str, day: date):
+        """Score a day against the stored trailing baseline; returns the stored rank count"""
+        baseline_start = day - timedelta(days=self.config['baseline_days'])
+        cursor.execute(f'''
+            SELECT day, articles, total_terms, term_counts FROM {TABLE_NAMES['trending_day_terms']}
+            WHERE source = %s AND day BETWEEN %s AND %s ORDER BY day
+        ''', (source, baseline_start, day))
+        window = cursor.fetchall()
+        cursor.execute(f"DELETE FROM {TABLE_NAMES['trending_terms']} WHERE source = %s AND day = %s",
+                       (source, day))
+        if not window or window[-1][0] != day or len(window) - 1 < self.config['min_baseline_days']:
+            return 0
+        if not window[-1][1] or not window[-1][2]:
+            return 0
+
+        # Union vocabulary of the window -> days x terms document-count matrix
+        unpacked = [unpack_counts(row[3]) for row in window]
+        all_terms = np.concatenate([np.asarray(terms, dtype=object) for terms, _, _ in unpacked])
+        if not len(all_terms):
+            return 0
+        vocabulary, columns = np.unique(all_terms.astype(str), return_inverse=True)
+        lengths = [len(terms) for terms, _, _ in unpacked]
+        rows = np.repeat(np.arange(len(window)), lengths)
+        doc_matrix = sparse.csr_matrix((np.concatenate([df for _, df, _ in unpacked]), (rows, columns)),
+                                       shape=(len(window), len(vocabulary)))
+
+        articles_today = window[-1][1]
+        articles_base = sum(row[1] for row in window[:-1])
+        today_terms, today_df, today_tf = unpacked[-1]
+        today_columns = columns[-len(today_terms):] if today_terms else columns[:0]
+
+        base_df = np.asarray(doc_matrix[:-1].sum(axis=0)).ravel()[today_columns]
+        days_with_term = np.asarray((doc_matrix > 0).sum(axis=0)).ravel()[today_columns]
+
+        smoothing = self.config['smoothing']
+        baseline_share = (base_df + smoothing) / (articles_base + 2 * smoothing)
+        expected = articles_today * baseline_share
+        burst = (today_df - expected) / np.sqrt(expected)
+        idf = np.log((1 + len(window)) / (1 + days_with_term)) + 1
+        tfidf = today_tf / window[-1][2] * idf
+
+        candidates = np.flatnonzero((today_df >= self.config['min_doc_count']) & (burst > 0))
+        top = candidates[np.argsort(-burst[candidates], kind='stable')][:self.config['top_terms']]
+        cursor.executemany(f'''
+            INSERT INTO {TABLE_NAMES['trending_terms']}
+            (source, day, rank_no, term, score, tfidf, doc_count, doc_share, baseline_share)
+            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+        ''', [(source, day, rank + 1, today_terms[index], float(burst[index]), float(tfidf[index]),
+               int(today_df[index]), float(today_df[index] / articles_today), float(baseline_share[index]))
+              for rank, index in enumerate(top)])
+        return len(top)
+
+    def update(self, sources=SOURCES, backfill_days: int = None):
+        backfill_days = self.config['backfill_days'] if backfill_days is None else backfill_days
+        conn = self.get_mysql_connection()
+        if not conn:
+            return None
+
+        summary = {}
+        try:
+            cursor = conn.cursor()
+            setup_trending_tables(cursor)
+            for source in sources:
+                days = self.pending_days(cursor, source, backfill_days)
+                summary[source] = {'counted_days': len(days), 'scored_days': 0}
+                if not days:
+                    self.log(f"{source}: trending terms up to date")
+                    continue
+
+                self.log(f"{source}: counting terms for {len(days)} day(s) {days[0]} .. {days[-1]}")
+                self.store_counts(conn, source, days, self.count_days(conn, source, days))
+
+                # A changed day moves the baseline of the days after it
+                cursor.execute(f'''
+                    SELECT day FROM {TABLE_NAMES['trending_day_terms']}
+                    WHERE source = %s AND day >= %s ORDER BY day
+                ''', (source, days[0]))
+                for (day,) in cursor.fetchall():
+                    self.score_day(cursor, source, day)
+                    summary[source]['scored_days'] += 1
+                conn.commit()
+                self.log(f"{source}: scored {summary[source]['scored_days']} day(s)")
+        except mysql.connector.Error as e:
+            self.log(f"Trending update error: {e}")
+        finally:
+            conn.close()
+
+        if any(values['scored_days'] for values in summary.values()):
+            bump_data_version()
+        return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Trending keywords per source per day")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    update = sub.add_parser('update', help='count new days and rescore')
+    update.add_argument('--source', choices=SOURCES)
+    update.add_argument('--backfill-days', type=int, help='days to count on the first run')
+
+    show = sub.add_parser('show', help='print the top terms of a day')
+    show.add_argument('source', choices=SOURCES)
+    show.add_argument('day', nargs='?', help='YYYY-MM-DD (default: latest)')
+    show.add_argument('--limit', type=int, default=20)
+    args = parser.parse_args()
+
+    if args.command == 'update':
+        sources = (args.source,) if args.source else SOURCES
+        print(TrendingKeywords().update(sources, args.backfill_days))
+        return
+
+    conn = mysql.connector.connect(**MYSQL_CONFIG)
+    try:
+        day = datetime.strptime(args.day, '%Y-%m-%d').date() if args.day else None
+        result = query_trending(conn.cursor(), args.source, day, args.limit)
+        if not result:
+            print("No trending terms stored yet - run the update command first")
+            return
+        print(f"{args.source} {result['day']}")
+        for rank, term in enumerate(result['terms'], 1):
+            print(f"{rank:3}. {term['term']:25} burst {term['score']:7.2f}  "
+                  f"{term['doc_count']:4} articles ({term['doc_share']:.1%} vs {term['baseline_share']:.1%})")
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Rendered-page cache and HTTP caching helpers for the Flask web application.
+
+Pages are keyed by route and query arguments and tagged with the data
+version stamp; when a crawler bumps the stamp every cached page goes stale.
+The same stamp drives the ETag/Last-Modified validators of the JSON API.
+"""
+
+import os
+import gzip
+import pickle
+import hashlib
+import threading
+from datetime import date, datetime, timezone
+from functools import wraps
+from collections import OrderedDict
+from flask import request, make_response
+from mysql_config import CACHE_CONFIG
+from data_version import get_data_version, BASE_DIR
+
+try:
+    import brotli
+except ImportError:  # Optional - gzip is used when brotli is not installed
+    brotli = None
+
+# Payloads smaller than this are sent uncompressed
+MIN_COMPRESS_SIZE = 1024
+
+
+class MemoryPageCache:
+    """Size-bounded in-process LRU cache"""
+
+    def __init__(self, max_entries: int = 512):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key: str):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                self.entries.move_to_end(key)
+            return entry
+
+    def set(self, key: str, entry):
+        with self.lock:
+            self.entries[key] = entry
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+class FilePageCache:
+    """File-backed cache shared by all workers on one host"""
+
+    def __init__(self, cache_dir: str, max_entries: int = 512):
+        if not os.path.isabs(cache_dir):
+            cache_dir = os.path.join(BASE_DIR, cache_dir)
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self.writes = 0
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def _path(self, key: str):
+        return os.path.join(self.cache_dir, hashlib.sha1(key.encode('utf-8')).hexdigest() + '.page')
+
+    def get(self, key: str):
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                entry = pickle.load(f)
+            os.utime(path)  # Refresh mtime so eviction stays LRU
+            return entry
+        except (OSError, pickle.PickleError, EOFError):
+            return None
+
+    def set(self, key: str, entry):
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except OSError:
+            return
+
+        # Evict least recently used files now and then rather than on every write
+        self.writes += 1
+        if self.writes % 32 == 0:
+            self.evict()
+
+    def evict(self):
+        try:
+            files = [os.path.join(self.cache_dir, name) for name in os.listdir(self.cache_dir)
+                     if name.endswith('.page')]
+            if len(files) <= self.max_entries:
+                return
+            files.sort(key=lambda path: os.stat(path).st_mtime)
+            for path in files[:len(files) - self.max_entries]:
+                os.remove(path)
+        except OSError:
+            pass
+
+    def clear(self):
+        for name in os.listdir(self.cache_dir):
+            if name.endswith('.page'):
+                try:
+                    os.remove(os.path.join(self.cache_dir, name))
+                except OSError:
+                    pass
+
+
+def create_page_cache():
+    """Build the cache backend selected in CACHE_CONFIG"""
+    if CACHE_CONFIG.get('backend') == 'file':
+        return FilePageCache(CACHE_CONFIG['cache_dir'], CACHE_CONFIG['max_entries'])
+    return MemoryPageCache(CACHE_CONFIG['max_entries'])
+
+
+page_cache = create_page_cache()
+
+
+def make_cache_key(path: str, args):
+    """Cache key from route path and sorted query arguments"""
+    items = sorted((key, value) for key in args for value in args.getlist(key))
+    query = '&'.join(f"{key}={value}" for key, value in items)
+    return f"{path}?{query}"
+
+
+def cached_page(view):
+    """Serve a view from the page cache while the data version is unchanged"""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        if not CACHE_CONFIG.get('enabled', True):
+            return view(*args, **kwargs)
+
+        key = make_cache_key(request.path, request.args)
+        version = get_data_version()
+
+        entry = page_cache.get(key)
+        if entry is not None and entry['version'] == version:
+            # Cache hit - no MySQL query and no template rendering
+            response = make_response(entry['body'], entry['status'])
+            response.mimetype = entry['mimetype']
+            response.headers['X-Cache'] = 'HIT'
+            return response
+
+        response = make_response(view(*args, **kwargs))
+
+        # Only successful, fully buffered pages are worth keeping
+        if response.status_code == 200 and not response.is_streamed:
+            page_cache.set(key, {
+                'version': version,
+                'body': response.get_data(),
+                'status': response.status_code,
+                'mimetype': response.mimetype
+            })
+        response.headers['X-Cache'] = 'MISS'
+        return response
+
+    return wrapper
+
+
+def compress_response(response):
+    """Gzip/brotli-encode a buffered response according to Accept-Encoding"""
+    if (response.status_code != 200 or response.is_streamed
+            or 'Content-Encoding' in response.headers):
+        return response
+
+    response.vary.add('Accept-Encoding')
+    body = response.get_data()
+    if len(body) < MIN_COMPRESS_SIZE:
+        return response
+
+    accepted = request.accept_encodings
+    if brotli is not None and accepted['br']:
+        response.set_data(brotli.compress(body, quality=5))
+        response.headers['Content-Encoding'] = 'br'
+    elif accepted['gzip']:
+        response.set_data(gzip.compress(body, compresslevel=6))
+        response.headers['Content-Encoding'] = 'gzip'
+    return response
+
+
+def conditional_api(view):
+    """Add ETag/Last-Modified validators derived from the data version and answer 304s"""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        version = get_data_version()
+
+        # Today's date is part of the tag because "today" counters roll over at midnight
+        key = make_cache_key(request.path, request.args)
+        etag = hashlib.sha1(f"{version}|{date.today()}|{key}".encode('utf-8')).hexdigest()[:24]
+        last_modified = datetime.fromtimestamp(version / 1e9, timezone.utc) if version else None
+
+        not_modified = request.if_none_match.contains(etag) if request.if_none_match else (
+            last_modified is not None and request.if_modified_since is not None
+            and last_modified.replace(microsecond=0) <= request.if_modified_since
+        )
+
+        if not_modified:
+            response = make_response('', 304)
+        else:
+            response = make_response(view(*args, **kwargs))
+            if response.status_code != 200:
+                return response
+            compress_response(response)
+
+        response.set_etag(etag)
+        if last_modified is not None:
+            response.last_modified = last_modified
+        # Clients may keep the payload but must revalidate on every poll
+        response.headers['Cache-Control'] = 'no-cache'
+        return response
+
+    return wrapper
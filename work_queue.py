@@ -0,0 +1,378 @@
+#!/usr/bin/env python3
+"""
+Distributed crawling through a MySQL-backed work queue (crawl frontier)
+
+Any number of worker processes, on any number of hosts, share one frontier
+table. Workers claim batches of tasks with SELECT ... FOR UPDATE SKIP LOCKED,
+so two workers never receive the same task, and every claim carries a lease:
+if a worker crashes its tasks become claimable again once the lease expires.
+Article writes stay exactly-once because news_url is UNIQUE and completion is
+only recorded by the worker that still owns the lease.
+
+Usage (MySQL 8.0+ required for SKIP LOCKED):
+    python3 work_queue.py seed-pages 1 50                  # listing pages 1-50
+    python3 work_queue.py seed-dates 2025-09-01 2025-09-30 # from the sitemaps
+    python3 work_queue.py work                             # run a worker (any host)
+    python3 work_queue.py status
+"""
+
+import os
+import sys
+import time
+import socket
+import argparse
+import mysql.connector
+from datetime import datetime
+from mysql_config import MYSQL_CONFIG, TABLE_NAMES, WORK_QUEUE_CONFIG
+from data_version import bump_data_version
+
+
+class CrawlFrontier:
+    """Shared frontier of URLs with leases, stored in MySQL
+
+    Holds one connection for its worker, so use one instance per worker thread.
+    """
+
+    def __init__(self, source: str, owner: str = None, log=print):
+        self.source = source
+        self.owner = owner or f"{socket.gethostname()}:{os.getpid()}"
+        self.lease_seconds = WORK_QUEUE_CONFIG['lease_seconds']
+        self.max_attempts = WORK_QUEUE_CONFIG['max_attempts']
+        self.log = log
+        self.conn = None  # One connection per worker, reused by every claim/finish
+
+    def get_mysql_connection(self):
+        """The worker's connection, opened on first use and after an error dropped it"""
+        if self.conn is not None:
+            return self.conn
+        try:
+            self.conn = mysql.connector.connect(**MYSQL_CONFIG)
+        except mysql.connector.Error as e:
+            self.log(f"MySQL connection error: {e}")
+        return self.conn
+
+    def drop_connection(self):
+        """Forget a connection that failed; the next call reconnects"""
+        conn, self.conn = self.conn, None
+        if conn is not None:
+            try:
+                conn.close()
+            except mysql.connector.Error:
+                pass
+
+    def close(self):
+        self.drop_connection()
+
+    def setup_table(self):
+        """Create the frontier table"""
+        conn = self.get_mysql_connection()
+        if not conn:
+            return False
+
+        try:
+            cursor = conn.cursor()
+            cursor.execute(f'''
+                CREATE TABLE IF NOT EXISTS {TABLE_NAMES['frontier']} (
+                    id BIGINT AUTO_INCREMENT PRIMARY KEY,
+                    source VARCHAR(20) NOT NULL,
+                    kind VARCHAR(20) NOT NULL,
+                    url VARCHAR(500) NOT NULL,
+                    page_number INT,
+                    parent_url VARCHAR(500),
+                    range_start DATE,
+                    range_end DATE,
+                    state VARCHAR(20) NOT NULL DEFAULT 'pending',
+                    lease_owner VARCHAR(100),
+                    lease_expires DATETIME,
+                    attempts INT NOT NULL DEFAULT 0,
+                    last_error VARCHAR(500),
+                    created_datetime DATETIME,
+                    updated_datetime DATETIME,
+                    UNIQUE KEY uniq_task (source, url),
+                    KEY idx_claim (source, state, lease_expires)
+                ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+            ''')
+            return True
+        except mysql.connector.Error as e:
+            self.drop_connection()
+            self.log(f"Frontier setup error: {e}")
+            return False
+
+    def enqueue(self, tasks: list):
+        """Add tasks; URLs already in the frontier are ignored"""
+        if not tasks:
+            return 0
+
+        conn = self.get_mysql_connection()
+        if not conn:
+            return 0
+
+        now = datetime.now().isoformat()
+        try:
+            cursor = conn.cursor()
+            cursor.executemany(f'''
+                INSERT IGNORE INTO {TABLE_NAMES['frontier']}
+                (source, kind, url, page_number, parent_url, range_start, range_end,
+                 state, created_datetime, updated_datetime)
+                VALUES (%s, %s, %s, %s, %s, %s, %s, 'pending', %s, %s)
+            ''', [(
+                self.source, task['kind'], task['url'], task.get('page_number'),
+                task.get('parent_url'), task.get('range_start'), task.get('range_end'), now, now
+            ) for task in tasks])
+            conn.commit()
+            return cursor.rowcount
+        except mysql.connector.Error as e:
+            self.drop_connection()
+            self.log(f"Frontier enqueue error: {e}")
+            return 0
+
+    def claim(self, batch_size: int = None):
+        """Lease a batch of pending (or expired) tasks to this worker"""
+        batch_size = batch_size or WORK_QUEUE_CONFIG['claim_batch_size']
+        conn = self.get_mysql_connection()
+        if not conn:
+            return []
+
+        try:
+            cursor = conn.cursor(dictionary=True)
+            # A lease that expired on its last attempt (the worker died mid-task every time) is not retried
+            cursor.execute(f'''
+                UPDATE {TABLE_NAMES['frontier']}
+                SET state = 'failed', lease_owner = NULL, lease_expires = NULL,
+                    last_error = 'lease expired on the last attempt', updated_datetime = NOW()
+                WHERE source = %s AND state = 'leased' AND lease_expires < NOW() AND attempts >= %s
+            ''', (self.source, self.max_attempts))
+            if cursor.rowcount:
+                self.log(f"Frontier: {cursor.rowcount} expired tasks out of attempts, marked failed")
+
+            conn.start_transaction()
+
+            # Rows locked by other workers are skipped instead of waited on
+            cursor.execute(f'''
+                SELECT id, kind, url, page_number, parent_url, range_start, range_end, attempts
+                FROM {TABLE_NAMES['frontier']}
+                WHERE source = %s
+                  AND (state = 'pending'
+                       OR (state = 'leased' AND lease_expires < NOW() AND attempts < %s))
+                ORDER BY id
+                LIMIT %s
+                FOR UPDATE SKIP LOCKED
+            ''', (self.source, self.max_attempts, batch_size))
+            tasks = cursor.fetchall()
+
+            if tasks:
+                ids = [task['id'] for task in tasks]
+                placeholders = ', '.join(['%s'] * len(ids))
+                cursor.execute(f'''
+                    UPDATE {TABLE_NAMES['frontier']}
+                    SET state = 'leased', lease_owner = %s,
+                        lease_expires = NOW() + INTERVAL %s SECOND,
+                        attempts = attempts + 1, updated_datetime = NOW()
+                    WHERE id IN ({placeholders})
+                ''', (self.owner, self.lease_seconds, *ids))
+
+            conn.commit()
+            return tasks
+        except mysql.connector.Error as e:
+            self.drop_connection()  # Closing the session rolls the transaction back
+            self.log(f"Frontier claim error: {e}")
+            return []
+
+    def finish(self, task: dict, error: str = None):
+        """Mark a leased task done, or return it to the queue after a failure"""
+        if error is None:
+            state = 'done'
+        elif task['attempts'] + 1 >= self.max_attempts:
+            state = 'failed'
+        else:
+            state = 'pending'
+
+        conn = self.get_mysql_connection()
+        if not conn:
+            return False
+
+        try:
+            cursor = conn.cursor()
+            # Only the current lease holder may record the outcome
+            cursor.execute(f'''
+                UPDATE {TABLE_NAMES['frontier']}
+                SET state = %s, lease_owner = NULL, lease_expires = NULL,
+                    last_error = %s, updated_datetime = NOW()
+                WHERE id = %s AND lease_owner = %s AND state = 'leased'
+            ''', (state, error[:500] if error else None, task['id'], self.owner))
+            conn.commit()
+            return cursor.rowcount == 1
+        except mysql.connector.Error as e:
+            self.drop_connection()
+            self.log(f"Frontier update error: {e}")
+            return False
+
+    def status(self):
+        """Task counts per kind and state"""
+        conn = self.get_mysql_connection()
+        if not conn:
+            return {}
+
+        try:
+            cursor = conn.cursor()
+            cursor.execute(f'''
+                SELECT kind, state, COUNT(*) FROM {TABLE_NAMES['frontier']}
+                WHERE source = %s GROUP BY kind, state
+            ''', (self.source,))
+            return {f"{kind}:{state}": count for kind, state, count in cursor.fetchall()}
+        except mysql.connector.Error as e:
+            self.drop_connection()
+            self.log(f"Frontier status error: {e}")
+            return {}
+
+
+def process_listing_task(crawler, frontier, task):
+    """Expand a listing page into article tasks"""
+    response = crawler.make_request(task['url'])
+    if not response:
+        return "listing fetch failed"
+
+    links = crawler.extract_article_links(response.text)
+    frontier.enqueue([{
+        'kind': 'article',
+        'url': link,
+        'page_number': task['page_number'],
+        'parent_url': task['url'],
+        'range_start': task['range_start'],
+        'range_end': task['range_end']
+    } for link in links])
+    crawler.log(f"Listing page {task['page_number']}: {len(links)} article tasks queued")
+    return None
+
+
+def process_article_task(crawler, task):
+    """Fetch, extract and save one article; returns (error, saved)"""
+    response = crawler.make_request(task['url'])
+    if not response:
+        return "article fetch failed", False
+
+    article_data, article_html = crawler.extract_with_render_fallback(task['url'], response.text)
+    article_data['url'] = task['url']
+
+    # Date-bounded tasks skip articles outside their range
+    if task['range_start'] or task['range_end']:
+        article_date = crawler.parse_date(article_data.get('published_time'))
+        if not article_date:
+            return None, False
+        if task['range_start'] and article_date.date() < task['range_start']:
+            return None, False
+        if task['range_end'] and article_date.date() > task['range_end']:
+            return None, False
+
+    article_id = crawler.save_article(article_data, task['parent_url'], task['page_number'] or 0, article_html)
+    if article_id is None:
+        return "article save failed", False
+    return None, bool(article_id)
+
+
+def run_worker(crawler, frontier, idle_exit: bool = True):
+    """Claim and process tasks until the frontier is drained"""
+    frontier.log(f"Worker {frontier.owner} started")
+    saved_total = 0
+    idle_rounds = 0
+
+    while True:
+        tasks = frontier.claim()
+        if not tasks:
+            idle_rounds += 1
+            if idle_exit and idle_rounds >= WORK_QUEUE_CONFIG['idle_rounds_before_exit']:
+                break
+            time.sleep(WORK_QUEUE_CONFIG['idle_sleep_seconds'])
+            continue
+        idle_rounds = 0
+
+        saved_batch = 0
+        for task in tasks:
+            try:
+                if task['kind'] == 'listing':
+                    error = process_listing_task(crawler, frontier, task)
+                else:
+                    error, saved = process_article_task(crawler, task)
+                    saved_batch += int(saved)
+            except Exception as e:
+                error = f"{type(e).__name__}: {e}"
+            frontier.finish(task, error)
+
+        if saved_batch:
+            saved_total += saved_batch
+            bump_data_version()
+            frontier.log(f"Worker {frontier.owner}: {saved_total} articles saved so far")
+
+    frontier.log(f"Worker {frontier.owner} finished - {saved_total} articles saved")
+    return saved_total
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Distributed Dunya crawl through a MySQL work queue")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    seed_pages = sub.add_parser('seed-pages', help='queue /gundem listing pages')
+    seed_pages.add_argument('start_page', type=int)
+    seed_pages.add_argument('end_page', type=int)
+
+    seed_dates = sub.add_parser('seed-dates', help='queue article URLs for a date range from the sitemaps')
+    seed_dates.add_argument('start_date')
+    seed_dates.add_argument('end_date')
+
+    work = sub.add_parser('work', help='run a worker')
+    work.add_argument('--forever', action='store_true', help='keep polling when the queue is empty')
+
+    sub.add_parser('status', help='show task counts')
+    args = parser.parse_args()
+
+    from dunya_crawler_mysql import DunyaCrawlerMySQL
+
+    if args.command == 'status':
+        frontier = CrawlFrontier('dunya')
+        for key, count in sorted(frontier.status().items()):
+            print(f"{key:25} {count}")
+        frontier.close()
+        return
+
+    crawler = DunyaCrawlerMySQL()
+    frontier = CrawlFrontier('dunya', log=crawler.log)
+    if not frontier.setup_table():
+        sys.exit(1)
+
+    if args.command == 'seed-pages':
+        base_url = 'https://www.dunya.com/gundem'
+        tasks = [{
+            'kind': 'listing',
+            'url': base_url if page == 1 else f"{base_url}/{page}",
+            'page_number': page
+        } for page in range(args.start_page, args.end_page + 1)]
+        print(f"Queued {frontier.enqueue(tasks)} listing pages")
+
+    elif args.command == 'seed-dates':
+        crawler.stats['target_start_date'] = datetime.strptime(args.start_date, '%Y-%m-%d')
+        crawler.stats['target_end_date'] = datetime.strptime(args.end_date, '%Y-%m-%d')
+        queued = 0
+        batch = []
+        for url, published, sitemap_url in crawler.discover_sitemap_articles():
+            batch.append({
+                'kind': 'article',
+                'url': url,
+                'page_number': 0,
+                'parent_url': sitemap_url,
+                'range_start': args.start_date,
+                'range_end': args.end_date
+            })
+            if len(batch) >= 500:
+                queued += frontier.enqueue(batch)
+                batch = []
+        queued += frontier.enqueue(batch)
+        print(f"Queued {queued} article URLs")
+
+    elif args.command == 'work':
+        run_worker(crawler, frontier, idle_exit=not args.forever)
+
+    frontier.close()
+
+
+if __name__ == "__main__":
+    main()